@@ -18,12 +18,16 @@ Kraken, and OKX exchanges via WebSocket.
    :maxdepth: 1
    :caption: Contents:
 
+   continuous_dl.bars
    continuous_dl.binance
    continuous_dl.bitfinex
    continuous_dl.bitmex
    continuous_dl.bybit
    continuous_dl.kraken
+   continuous_dl.multiplex
    continuous_dl.okx
+   continuous_dl.orderbook
+   continuous_dl.trades
 
 """
 
@@ -32,18 +36,38 @@ Kraken, and OKX exchanges via WebSocket.
 # Third party packages
 
 # Local packages
-from . import binance, bitfinex, bitmex, bybit, exchange, kraken, okx
+from . import (
+    bars,
+    binance,
+    bitfinex,
+    bitmex,
+    bybit,
+    exchange,
+    kraken,
+    multiplex,
+    okx,
+    orderbook,
+    trades,
+)
+from .bars import *
 from .binance import *
 from .bitfinex import *
 from .bitmex import *
 from .bybit import *
 from .kraken import *
+from .multiplex import *
 from .okx import *
+from .orderbook import *
+from .trades import *
 
 __all__ = ['exchange']
+__all__ += bars.__all__
 __all__ += binance.__all__
 __all__ += bitfinex.__all__
 __all__ += bitmex.__all__
 __all__ += bybit.__all__
 __all__ += kraken.__all__
+__all__ += multiplex.__all__
 __all__ += okx.__all__
+__all__ += orderbook.__all__
+__all__ += trades.__all__
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+""" OHLCV bars aggregated trade by trade from the WebSocket streams.
+
+.. currentmodule:: dccd.continuous_dl.bars
+
+.. autoclass:: BarBuilder
+   :members: widths, add_width, update, update_many, flush
+
+"""
+
+# Built-in packages
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+# Third party packages
+import numpy as np
+import pandas as pd
+
+# Local packages
+
+__all__ = ['BarBuilder']
+
+_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'vwap', 'count',
+            'buy_volume', 'sell_volume']
+
+
+class _Bar:
+    """ Running aggregates of the bar starting at `start`. """
+
+    __slots__ = ('start', 'open', 'high', 'low', 'close', 'volume',
+                 'notional', 'count', 'buy_volume', 'sell_volume')
+
+    def __init__(self, start: int, price: float) -> None:
+        self.start = start
+        self.open = self.high = self.low = self.close = price
+        self.volume = self.notional = 0.
+        self.buy_volume = self.sell_volume = 0.
+        self.count = 0
+
+    def add(self, price: float, amount: float, side: str | None) -> None:
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+
+        self.close = price
+        self.volume += amount
+        self.notional += price * amount
+        self.count += 1
+        if side == 'buy':
+            self.buy_volume += amount
+        elif side == 'sell':
+            self.sell_volume += amount
+
+    def row(self) -> tuple[float, ...]:
+        vwap = self.notional / self.volume if self.volume else self.close
+
+        return (self.open, self.high, self.low, self.close, self.volume,
+                vwap, self.count, self.buy_volume, self.sell_volume)
+
+
+class BarBuilder:
+    """ Aggregate a stream of trades into OHLCV bars of several widths.
+
+    Each trade updates the current bar of every width in constant time, the
+    bar is closed when a trade falls in a later bar or when :meth:`flush` is
+    called after its end. Only the current bar and the bars closed since the
+    last flush are kept, whatever the rate of the trades.
+
+    Parameters
+    ----------
+    widths : iterable of int, optional
+        Widths of the bars in seconds, default is one minute.
+
+    Notes
+    -----
+    Bars start at ``timestamp // width * width``, as in
+    :func:`dccd.process_data.set_ohlc`. A trade older than the current bar
+    (late or out of order) is counted in the current bar. Bars without any
+    trade are not emitted.
+
+    Examples
+    --------
+    >>> bars = BarBuilder([60, 300])
+    >>> bars.update(0., 10., 1., 'buy')
+    >>> bars.update(30., 12., 3., 'sell')
+    >>> bars.update(70., 11., 2., 'buy')
+    >>> closed = bars.flush(now=120.)
+    >>> closed[60]
+        open  high   low  close  volume  vwap  count  buy_volume  sell_volume
+    0   10.0  12.0  10.0   12.0     4.0  11.5    2.0         1.0          3.0
+    60  11.0  11.0  11.0   11.0     2.0  11.0    1.0         2.0          0.0
+    >>> list(closed)
+    [60]
+
+    """
+
+    def __init__(self, widths: Iterable[int] = (60,)) -> None:
+        """ Initialize object. """
+        self._bars: dict[int, _Bar | None] = {}
+        self._closed: dict[int, list[tuple[float, ...]]] = {}
+        self._starts: dict[int, list[int]] = {}
+        for width in widths:
+            self.add_width(width)
+
+    @property
+    def widths(self) -> list[int]:
+        """ Widths of the bars in seconds. """
+        return list(self._bars)
+
+    def add_width(self, width: int) -> None:
+        """ Aggregate also the bars of `width` seconds, from the next trade.
+        """
+        if width < 1:
+            raise ValueError(f'bar width must be >= 1 second, not {width}')
+
+        if width not in self._bars:
+            self._bars[width] = None
+            self._closed[width] = []
+            self._starts[width] = []
+
+    def _close(self, width: int, bar: _Bar) -> None:
+        self._starts[width].append(bar.start)
+        self._closed[width].append(bar.row())
+
+    def update(self, timestamp: float, price: float, amount: float,
+               side: str | None = None) -> None:
+        """ Add a trade to the current bar of each width.
+
+        Parameters
+        ----------
+        timestamp : float
+            Time of the trade in seconds.
+        price, amount : float
+            Price and amount of the trade.
+        side : {'buy', 'sell'}, optional
+            Side of the taker, counted in 'buy_volume' or 'sell_volume'.
+
+        """
+        for width, bar in self._bars.items():
+            start = int(timestamp // width * width)
+            if bar is None or start > bar.start:
+                if bar is not None:
+                    self._close(width, bar)
+
+                bar = self._bars[width] = _Bar(start, price)
+
+            bar.add(price, amount, side)
+
+    def update_many(self, trades: Iterable[Mapping[str, Any]]) -> None:
+        """ Add trades with 'timestamp', 'price', 'amount' and 'type' keys.
+        """
+        for trade in trades:
+            self.update(trade['timestamp'], trade['price'], trade['amount'],
+                        trade.get('type'))
+
+    def flush(self, now: float) -> dict[int, pd.DataFrame]:
+        """ Close the bars ended at `now` and return the bars closed.
+
+        Parameters
+        ----------
+        now : float
+            Current time in seconds.
+
+        Returns
+        -------
+        dict of pd.DataFrame
+            Bars closed since the last flush, keyed by width, indexed by
+            their start and with the columns of
+            :func:`dccd.process_data.set_ohlc` (with 'vwap', 'count',
+            'buy_volume' and 'sell_volume'). Widths without closed bar are
+            omitted.
+
+        """
+        out = {}
+        for width, bar in self._bars.items():
+            if bar is not None and bar.start + width <= now:
+                self._close(width, bar)
+                self._bars[width] = None
+
+            if self._closed[width]:
+                out[width] = pd.DataFrame(
+                    np.array(self._closed[width], dtype=np.float64),
+                    index=self._starts[width], columns=_COLUMNS,
+                )
+                self._closed[width] = []
+                self._starts[width] = []
+
+        return out
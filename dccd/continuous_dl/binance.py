@@ -23,20 +23,28 @@ Low level API
 """
 
 # Built-in packages
+import asyncio
 import logging
 import time
 
 # Third party packages
 # Local packages
 from dccd.continuous_dl.exchange import ContinuousDownloader
+from dccd.tools.http import get_session
 from dccd.tools.io import IODataBase
+from dccd.tools.rate_limit import get_rate_limiter
 
 __all__ = [
     'DownloadBinanceData', 'get_data_binance', 'get_orderbook_binance',
     'get_trades_binance',
 ]
 
-_BINANCE_WS_URL = 'wss://stream.binance.com:9443/stream?streams={sym}@trade/{sym}@depth50@100ms'
+_BINANCE_WS_HOST = 'wss://stream.binance.com:9443/stream?streams='
+_BINANCE_STREAMS = '{sym}@trade/{sym}@depth@100ms'
+_BINANCE_WS_URL = _BINANCE_WS_HOST + _BINANCE_STREAMS
+_BINANCE_DEPTH_URL = 'https://api.binance.com/api/v3/depth'
+# Depth of the REST snapshot and its request weight
+_BINANCE_RESYNC_DEPTH, _BINANCE_RESYNC_WEIGHT = 1000, 50
 
 
 def _parser_trades(data: dict) -> list[dict]:
@@ -64,12 +72,13 @@ def _parser_trades(data: dict) -> list[dict]:
 
 
 def _parser_book(data: dict) -> dict:
-    """ Parse a depth message from Binance combined stream.
+    """ Parse a diff depth message from Binance combined stream.
 
     Parameters
     ----------
     data : dict
-        The ``data`` field of a combined-stream depth message.
+        The ``data`` field of a combined-stream diff depth message, or a
+        REST snapshot with its ``bids`` and ``asks`` as ``b`` and ``a``.
 
     Returns
     -------
@@ -115,8 +124,16 @@ class DownloadBinanceData(ContinuousDownloader):
     set_saver
     __call__
 
+    Notes
+    -----
+    The book is kept from the diff depth stream, whose updates are numbered
+    (``U`` to ``u``). It is resynchronized from a REST snapshot of 1 000
+    levels at each connection and after a gap.
+
     """
 
+    _sequenced = True
+
     def __init__(self, pair: str = 'BTCUSDT', time_step: int = 60,
                  until: int | None = 3600, checkpoint_dir: str | None = None) -> None:
         """ Initialize object. """
@@ -168,15 +185,29 @@ class DownloadBinanceData(ContinuousDownloader):
         self._push_trades(_parser_trades(data))
 
     def parser_book(self, data: dict) -> None:
-        """ Parse and update the order book from a depth message.
+        """ Parse and update the order book from a diff depth message.
 
         Parameters
         ----------
         data : dict
-            The ``data`` field from the combined-stream depth envelope.
+            The ``data`` field from the combined-stream diff depth envelope,
+            with the first and last update ids ``U`` and ``u``.
 
         """
-        self._push_book_updates(_parser_book(data))
+        self._push_sequenced(_parser_book(data), data['U'], data['u'])
+
+    async def _resync(self) -> None:
+        """ Reset the book from a REST snapshot. """
+        await get_rate_limiter('Binance', 6000, 60.).acquire_async(
+            _BINANCE_RESYNC_WEIGHT
+        )
+        params = {'symbol': self.pair.upper(), 'limit': _BINANCE_RESYNC_DEPTH}
+        r = await asyncio.to_thread(get_session('Binance').get,
+                                    _BINANCE_DEPTH_URL, params=params)
+        r.raise_for_status()
+        book = r.json()
+        self._reset_book(_parser_book({'b': book['bids'], 'a': book['asks']}),
+                         book['lastUpdateId'])
 
 
 def get_trades_binance(path: str, pair: str = 'BTCUSDT', time_step: int = 60,
@@ -36,7 +36,7 @@ import time
 from typing import Any
 
 from dccd.continuous_dl.exchange import ContinuousDownloader
-from dccd.process_data import set_marketdepth, set_ohlc, set_orders, set_trades
+from dccd.process_data import set_marketdepth, set_orders, set_trades
 
 # Third party packages
 # Local packages
@@ -172,17 +172,10 @@ class DownloadBitfinexData(ContinuousDownloader):
         """
         parsed = _parser_book(data)
 
-        if parsed['count'] > 0:
-            if parsed['price'] in self.d.keys():
-                self.d[parsed['price']]['amount'] += parsed['amount']
-            else:
-                self.d[parsed['price']] = parsed
-        else:
-            self.d.pop(parsed['price'])
-
-        self._data.setdefault(self.t, {'trades': [], 'book': {}})['book'] = {
-            v['price']: v['amount'] for v in self.d.values()
-        }
+        # A count of zero removes the level, otherwise amount is its total
+        amount = parsed['amount'] if parsed['count'] > 0 else 0.
+        self.d.set(parsed['price'], amount)
+        self._mark_book()
 
     def parser_raw_trades(self, data: list[Any]) -> None:
         """ Parse raw trade data tick-by-tick.
@@ -211,8 +204,7 @@ class DownloadBitfinexData(ContinuousDownloader):
         if data[1] == 'tu':
             return
 
-        parsed = _parser_trades(data)
-        self._raw_parser(parsed)
+        self._push_trades([_parser_trades(data)])
 
     async def on_message(self, data: dict[str, Any] | list[Any]) -> None:
         """ Route an incoming websocket message to the appropriate parser. """
@@ -364,7 +356,15 @@ def get_trades_bitfinex(symbol: str, time_step: int = 60, until: int | None = No
 def get_ohlc_bitfinex(symbol: str, time_step: int = 60, until: int | None = None,
                       path: str | None = None, save_method: str = 'dataframe',
                       io_params: dict[str, Any] = {}) -> None:
-    """ Download OHLCV data from Bitfinex exchange. """
-    get_data_bitfinex('trades', set_ohlc, time_step=time_step, until=until,
-                      path=path, save_method=save_method, io_params=io_params,
-                      process_params={'ts': time_step}, symbol=symbol)
+    """ Download OHLCV data from Bitfinex exchange.
+
+    Bars of `time_step` seconds are aggregated as the trades arrive, see
+    :class:`~dccd.continuous_dl.bars.BarBuilder`.
+
+    """
+    if path is None:
+        path = './database/bitfinex/trades'
+
+    downloader = DownloadBitfinexData(time_step=time_step, until=until)
+    downloader.set_bars_saver(IODataBase(path, method=save_method), **io_params)
+    downloader('trades', symbol=symbol)
@@ -36,6 +36,7 @@ from datetime import datetime as dt
 from typing import Any
 
 from dccd.continuous_dl.exchange import ContinuousDownloader
+from dccd.continuous_dl.orderbook import OrderBook
 from dccd.process_data import set_marketdepth, set_trades
 
 # Third party packages
@@ -75,7 +76,7 @@ def _parser_trades(tData: dict[str, Any], i: int = 0) -> dict[str, Any]:
 
     return {
         'tid': int(t * 1000 + i),
-        'timestamp': int(t * 1000),
+        'timestamp': t,
         'price': tData['price'],
         'amount': tData['size'],
         'type': tData['side'].lower(),
@@ -98,15 +99,19 @@ def _parser_book(tData: dict[str, Any]) -> dict[str, Any] | int:
         Otherwise: signed size as int (positive for Buy, negative for Sell).
 
     """
-    if tData['side'] == 'Buy':
-        s = 1
-    else:
-        s = -1
-
     if 'price' in tData.keys():
-        return {'amount': s * tData['size'], 'price': tData['price']}
+        return {'amount': _signed_size(tData), 'price': tData['price']}
+
+    return _signed_size(tData)
 
-    return s * tData['size']
+
+def _signed_size(tData: dict[str, Any]) -> int:
+    """ Size of an order-book entry, positive for Buy and negative for Sell.
+    """
+    if tData['side'] == 'Buy':
+        return tData['size']
+
+    return -tData['size']
 
 
 # =========================================================================== #
@@ -180,6 +185,8 @@ class DownloadBitmexData(ContinuousDownloader):
             'trade': self.parser_trades,
         }
         self.start = False
+        # Bitmex levels are keyed by id, the book by price
+        self._ids: dict[int, float] = {}
         self._load_checkpoint()
 
     def parser_book(self, data: dict[str, Any]) -> None:
@@ -197,25 +204,29 @@ class DownloadBitmexData(ContinuousDownloader):
         """
         action = data['action']
 
+        if action == 'partial':
+            self.d.clear()
+            self._ids.clear()
+
         for d in data['data']:
             if action == 'partial':
-                self.d[d['id']] = _parser_book(d)
                 self.start = True
             elif not self.start:
                 self.logger.info("Waiting data")
                 continue
+
+            if action in ('partial', 'insert'):
+                self._ids[d['id']] = d['price']
+                self.d.set(d['price'], _signed_size(d))
             elif action == 'delete':
-                self.d.pop(d['id'])
-            elif action == 'insert':
-                self.d[d['id']] = _parser_book(d)
+                self.d.set(self._ids.pop(d['id']), 0)
             elif action == 'update':
-                self.d[d['id']]['amount'] = _parser_book(d)
+                # Updates may repeat the price, the level is found by its id
+                self.d.set(self._ids[d['id']], _signed_size(d))
             else:
                 self.logger.error('Unknown action {}: {}'.format(action, data))
 
-        self._data.setdefault(self.t, {'trades': [], 'book': {}})['book'] = {
-            v['price']: v['amount'] for v in self.d.values()
-        }
+        self._mark_book()
 
     def parser_trades(self, data: dict[str, Any]) -> None:
         """ Parse trade data and accumulate records for the current timestep.
@@ -227,12 +238,16 @@ class DownloadBitmexData(ContinuousDownloader):
             key with a list of trade records.
 
         """
-        slot = self._data.setdefault(self.t, {'trades': [], 'book': {}})
-        for i, d in enumerate(data['data']):
-            slot['trades'].append(_parser_trades(d, i))
+        self._push_trades([_parser_trades(d, i)
+                           for i, d in enumerate(data['data'])])
+
+    def _get_book_state(self) -> dict[int, Any]:
+        return {i: {'price': p, 'amount': self.d[p]}
+                for i, p in self._ids.items()}
 
     def _restore_book_state(self, state: dict[int, Any]) -> None:  # type: ignore[override]
-        self.d = {int(k): v for k, v in state.items()}
+        self._ids = {int(k): v['price'] for k, v in state.items()}
+        self.d = OrderBook({v['price']: v['amount'] for v in state.values()})
 
     async def on_message(self, data: dict[str, Any] | list[Any]) -> None:
         """ Route an incoming websocket message to the appropriate parser. """
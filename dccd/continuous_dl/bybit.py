@@ -23,6 +23,7 @@ Low level API
 """
 
 # Built-in packages
+import json
 import logging
 import time
 
@@ -119,8 +120,16 @@ class DownloadBybitData(ContinuousDownloader):
     set_saver
     __call__
 
+    Notes
+    -----
+    Book deltas are numbered by ``u``, after a gap the book topic is
+    subscribed again to receive a new snapshot.
+
     """
 
+    _sequenced = True
+    _snapshot_on_subscribe = True
+
     def __init__(self, pair='BTCUSDT', time_step=60, until=3600, checkpoint_dir=None):
         """ Initialize object. """
         if until is None:
@@ -170,7 +179,19 @@ class DownloadBybitData(ContinuousDownloader):
             Raw WebSocket orderbook message.
 
         """
-        self._push_book_updates(_parser_book(msg))
+        updates = _parser_book(msg)
+        data = msg.get('data', {})
+        if 'u' in data:
+            self._push_sequenced(updates, data['u'], data['u'],
+                                 snapshot=msg.get('type') == 'snapshot')
+        else:
+            self._push_book_updates(updates)
+
+    async def _resync(self):
+        """ Subscribe again to the book topic to get a new snapshot. """
+        args = [a for a in self.subs_data['args'] if a.startswith('orderbook')]
+        await self.ws.send(json.dumps({'op': 'unsubscribe', 'args': args}))
+        await self.ws.send(json.dumps({'op': 'subscribe', 'args': args}))
 
 
 def get_trades_bybit(path, pair='BTCUSDT', time_step=60, until=3600, form='csv'):
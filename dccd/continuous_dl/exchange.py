@@ -12,18 +12,25 @@
 import asyncio
 import json
 import time
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Callable, Hashable, Mapping
 from pathlib import Path
 from typing import Any, AsyncIterator
 
 # Third party packages
 # Local packages
-from dccd.models import Trade
+from dccd.continuous_dl.bars import BarBuilder
+from dccd.continuous_dl.orderbook import OrderBook
+from dccd.continuous_dl.trades import TradeBuffer, _trade_values
 from dccd.process_data import set_marketdepth, set_trades
-from dccd.tools.websocket import BasisWebSocket
+from dccd.tools.io import IODataBase
+from dccd.tools.websocket import BasisWebSocket, backoff_delay
 
 __all__ = ['ContinuousDownloader']
 
+# Deltas kept while the book is resynchronized
+_MAX_PENDING = 10_000
+
 
 class ContinuousDownloader(BasisWebSocket):
     """ Basis object to download data from a stream websocket client API.
@@ -61,12 +68,32 @@ class ContinuousDownloader(BasisWebSocket):
         Current timestamp but rounded by `ts`.
     until : int
         Timestamp to stop to download data.
+    n_gaps : int
+        Number of sequence gaps detected in the book updates.
+    n_checksum_errors : int
+        Number of book checksums which did not match the exchange ones.
+    save_in_thread : bool
+        If True, the data of each time step is saved in a worker thread, so
+        that the event loop keeps reading the sockets meanwhile (e.g. a loop
+        shared by several streams). Default is False.
+    snapshot_timeout : float
+        Seconds to wait for the snapshot of a book subscribed again
+        (:attr:`_snapshot_on_subscribe`) before subscribing again. Default
+        is 10.
 
     Methods
     -------
     set_process_data
     set_saver
 
+    Notes
+    -----
+    Exchanges numbering their book updates set :attr:`_sequenced` and pass
+    the sequence of each delta to :meth:`_push_sequenced`. After a gap, or
+    a reconnection, the deltas are buffered until the book is resynchronized
+    by :meth:`_resync`, from a REST snapshot or a new WebSocket snapshot
+    (:attr:`_snapshot_on_subscribe`).
+
     """
 
     _parser_exchange: dict[str, Any] = {
@@ -85,6 +112,15 @@ class ContinuousDownloader(BasisWebSocket):
         },
     }
     _parser_data: dict[str, Callable[..., Any]] = {}
+    # Book updates are numbered, the exchange sends a snapshot on subscribe
+    _sequenced = False
+    _snapshot_on_subscribe = False
+    # The sequence may restart lower, a delta older than the book is a gap
+    _seq_resets = False
+    # Bars aggregated from the trades, see set_bars_saver
+    _bars: BarBuilder | None = None
+    save_in_thread = False
+    snapshot_timeout = 10.
 
     def __init__(self, host: str, time_step: int = 60, STOP: int = 3600,
                  checkpoint_dir: str | None = None, **kwargs: Any) -> None:
@@ -103,7 +139,16 @@ class ContinuousDownloader(BasisWebSocket):
         # Set data
         self._data: dict[int, dict[str, Any]] = {}
         self._checkpoint_dir: Path | None = Path(checkpoint_dir) if checkpoint_dir else None
-        self.d: dict = {}
+        self.d = OrderBook()
+        self._bars_savers: dict[int, tuple[Callable[..., Any], dict[str, Any]]] = {}
+
+        # Set book sequence
+        self._seq: int | None = None
+        self._synced = True
+        self._pending: deque[tuple[int, int, Mapping[Hashable, float]]] = deque(maxlen=_MAX_PENDING)
+        self._resync_task: asyncio.Future | None = None
+        self.n_gaps = 0
+        self.n_checksum_errors = 0
 
     def __aiter__(self) -> AsyncIterator[dict[str, Any] | None]:
         """ Set iterative method. """
@@ -127,12 +172,26 @@ class ContinuousDownloader(BasisWebSocket):
 
         t, self.t = self.t, self._current_timestep()
 
-        if t in self._data:
-            payload = self._data.pop(t)
-            payload['snapshot_ts'] = int(time.time() * 1000)
-            return payload
+        return self._pop_snapshot(t)
+
+    def _pop_snapshot(self, t: int) -> dict[str, Any] | None:
+        """ Remove and return the data of the time step `t`, None if empty. """
+        if t not in self._data:
+            if self._bars is None:
+
+                return None
 
-        return None
+            # Bars are flushed at each time step, even without data
+            self._data[t] = {'trades': [], 'book': {}}
+
+        payload = self._data.pop(t)
+        if isinstance(payload['book'], OrderBook):
+            # The live book is copied once per time step
+            payload['book'] = payload['book'].snapshot()
+
+        payload['snapshot_ts'] = int(time.time() * 1000)
+
+        return payload
 
     async def _loop(self) -> None:
         """ Loop to process and save data into database. """
@@ -143,41 +202,75 @@ class ContinuousDownloader(BasisWebSocket):
                 self.logger.debug('No data')
                 continue
 
-            trades = snapshot.get('trades', [])
-            book = snapshot.get('book', {})
-            ts = snapshot['snapshot_ts']
+            if self.save_in_thread:
+                # The state shared with the parsers is read on the loop
+                self._freeze_snapshot(snapshot)
+                await asyncio.to_thread(self._save_snapshot, snapshot)
+            else:
+                self._save_snapshot(snapshot)
 
-            if trades and hasattr(self, '_trades_saver'):
+            if not self.is_connect:
+                return
+
+    def _freeze_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """ Add to `snapshot` the closed bars and the book state to save, so
+        that :meth:`_save_snapshot` does not read the state of the parsers.
+        """
+        ts = snapshot['snapshot_ts']
+        snapshot['bars'] = {} if self._bars is None else self._bars.flush(ts / 1000)
+
+        if self._checkpoint_dir is not None:
+            snapshot['book_state'] = self._get_book_state()
+
+    def _save_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """ Process and save the data of one time step. """
+        trades = snapshot.get('trades', [])
+        book = snapshot.get('book', {})
+        ts = snapshot['snapshot_ts']
+        if 'bars' not in snapshot:
+            self._freeze_snapshot(snapshot)
+
+        if trades and hasattr(self, '_trades_saver'):
+            if self._trades_arrow and isinstance(trades, TradeBuffer):
+                df = self._trades_process_func(trades, output='arrow')
+            else:
                 df = self._trades_process_func(trades)
-                self._trades_saver(df, **self._trades_saver_kwargs)
 
-            if book and hasattr(self, '_book_saver'):
-                df = self._book_process_func(book, t=ts // 1000)
-                self._book_saver(df, **self._book_saver_kwargs)
+            self._trades_saver(df, **self._trades_saver_kwargs)
 
-            self._save_checkpoint()
+        if book and hasattr(self, '_book_saver'):
+            df = self._book_process_func(book, t=ts // 1000)
+            self._book_saver(df, **self._book_saver_kwargs)
 
-            # Legacy fallback for callers that still use set_process_data + set_saver
-            if not (hasattr(self, '_trades_saver') or hasattr(self, '_book_saver')):
-                if hasattr(self, 'process_data') and hasattr(self, 'saver'):
-                    legacy_data = trades if trades else book
-                    if legacy_data:
-                        df = self.process_data(legacy_data, **self.process_params)
-                        self.saver(df, **self.io_params)
+        for width, bars in snapshot['bars'].items():
+            saver, kwargs = self._bars_savers[width]
+            saver(bars, **kwargs)
 
-            self.logger.debug(
-                'snapshot_ts=%d trades=%d book_levels=%d', ts, len(trades), len(book)
-            )
+        self._save_checkpoint(snapshot.get('book_state'))
 
-            if not self.is_connect:
-                return
+        # Legacy fallback for callers that still use set_process_data + set_saver
+        if not (hasattr(self, '_trades_saver') or hasattr(self, '_book_saver')):
+            if hasattr(self, 'process_data') and hasattr(self, 'saver'):
+                legacy_data = trades if trades else book
+                if legacy_data:
+                    df = self.process_data(legacy_data, **self.process_params)
+                    self.saver(df, **self.io_params)
+
+        self.logger.debug(
+            'snapshot_ts=%d trades=%d book_levels=%d', ts, len(trades), len(book)
+        )
 
     async def on_message(self, data: dict[str, Any] | list[Any]) -> None:
         """ Parse any data received from the websocket. """
         self._raw_parser(data)
 
     def _raw_parser(self, data: Any) -> None:
-        self._data.setdefault(self.t, {'trades': [], 'book': {}})['trades'].append(data)
+        slot = self._data.setdefault(self.t, {'trades': [], 'book': {}})
+        if isinstance(slot['trades'], TradeBuffer):
+            # Other records (e.g. candles) mixed with the trades
+            slot['trades'] = slot['trades'].to_records()
+
+        slot['trades'].append(data)
 
     def _current_timestep(self) -> int:
         """ Set current time rounded by `timestep`. """
@@ -209,25 +302,206 @@ class ContinuousDownloader(BasisWebSocket):
         return self
 
     def _push_trades(self, parsed: list[dict[str, Any]]) -> None:
-        """ Validate and store a normalised list of trade dicts. """
-        for item in parsed:
-            Trade.model_validate(item)
-            self._raw_parser(item)
-
-    def _push_book_updates(self, updates: dict[str, Any]) -> None:
-        """ Apply a price→qty update dict to the local book and snapshot it. """
-        for price, qty in updates.items():
-            if qty == 0:
-                self.d.pop(price, None)
-            else:
-                self.d[price] = qty
-        self._data.setdefault(self.t, {'trades': [], 'book': {}})['book'] = dict(self.d)
+        """ Validate and store a normalised list of trade dicts.
+
+        The trades are appended in a :class:`TradeBuffer`, validated as one
+        batch, and added to the bars if a bars saver is set. With only bars
+        to save, the trades are not kept.
+
+        """
+        if self._bars is not None and not hasattr(self, '_trades_saver'):
+            # Validated as a batch, but only the bars are kept
+            _trade_values(parsed)
+            self._bars.update_many(parsed)
+
+            return
+
+        slot = self._data.setdefault(self.t, {'trades': [], 'book': {}})
+        if not slot['trades']:
+            slot['trades'] = TradeBuffer()
+
+        if isinstance(slot['trades'], TradeBuffer):
+            slot['trades'].extend(parsed)
+        else:
+            # Mixed with other records, validated then appended as dicts
+            buffer = TradeBuffer(len(parsed))
+            buffer.extend(parsed)
+            slot['trades'].extend(buffer)
+
+        if self._bars is not None:
+            self._bars.update_many(parsed)
+
+    def _push_book_updates(self, updates: Mapping[Hashable, float]) -> None:
+        """ Apply a price→qty update dict to the local book in place. """
+        self.d.apply(updates)
+        self._mark_book()
+
+    def _push_sequenced(self, updates: Mapping[Hashable, float], first: int, last: int, snapshot: bool = False) -> None:
+        """ Apply the book delta numbered from `first` to `last`.
+
+        Deltas older than the book are dropped, a delta starting after the
+        next number is a gap which starts a resynchronization. With
+        :attr:`_seq_resets`, a delta numbered before the book (the sequence
+        was restarted by the exchange) is a gap too.
+
+        Parameters
+        ----------
+        updates : dict
+            Levels ``{price: amount}`` of the delta or of the snapshot.
+        first, last : int
+            Sequence numbers of the first and last update of the delta.
+        snapshot : bool, optional
+            If True, `updates` replaces the whole book.
+
+        """
+        if snapshot:
+            # Deltas buffered so far are older than a WebSocket snapshot
+            self._pending.clear()
+            self._reset_book(updates, last)
+
+        elif not self._synced:
+            self._pending.append((first, last, updates))
+
+        elif self._seq is not None and first > self._seq + 1:
+            self.n_gaps += 1
+            self.logger.warning('Book sequence gap: expected %d, got %d',
+                                self._seq + 1, first)
+            self._pending.append((first, last, updates))
+            self._start_resync()
+
+        elif self._seq_resets and self._seq is not None and last < self._seq:
+            self.n_gaps += 1
+            self.logger.warning('Book sequence went backwards: %d after %d',
+                                last, self._seq)
+            self._start_resync()
+
+        elif self._seq is None or last > self._seq:
+            self._seq = last
+            self._push_book_updates(updates)
+
+    def _check_book(self, expected: int, checksum: int) -> bool:
+        """ Compare the checksum of the book to the one of the exchange, and
+        resynchronize the book if they differ.
+        """
+        if checksum == expected:
+
+            return True
+
+        self.n_checksum_errors += 1
+        self.logger.warning('Book checksum mismatch: expected %d, got %d',
+                            expected, checksum)
+        self._start_resync()
+
+        return False
+
+    def _reset_book(self, levels: Mapping[Hashable, float], seq: int) -> None:
+        """ Replace the book by a snapshot, then apply the deltas buffered. """
+        self.d.clear()
+        self.d.apply(levels)
+        self._seq, self._synced = seq, True
+        self._resync_task = None
+        self._mark_book()
+        pending = list(self._pending)
+        self._pending.clear()
+        for first, last, updates in pending:
+            self._push_sequenced(updates, first, last)
+
+    def _start_resync(self) -> None:
+        """ Buffer the deltas and resynchronize the book in the background.
+        """
+        self._synced = False
+        if self._resync_task is None or self._resync_task.done():
+            self._resync_task = asyncio.ensure_future(self._run_resync())
+
+    async def _run_resync(self) -> None:
+        """ Run :meth:`_resync`, retried at most :attr:`max_retries` times,
+        then close the connection to resynchronize after the reconnection.
+
+        With :attr:`_snapshot_on_subscribe`, a snapshot not received within
+        :attr:`snapshot_timeout` seconds is a failure, so the book channel is
+        subscribed again.
+
+        """
+        attempt = 0
+        while True:
+            try:
+                await self._resync()
+                if self._snapshot_on_subscribe:
+                    await self._wait_snapshot()
+
+                return
+
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    self.logger.error('Book resync failed %d times (%r), '
+                                      'reconnecting', attempt + 1, e)
+                    if self.ws:
+                        await self.ws.close()
+
+                    return
+
+                delay = backoff_delay(attempt, cap=self.retry_delay)
+                self.logger.error('Book resync failed (%r), retry in %.0f ms',
+                                  e, delay * 1000)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def _wait_snapshot(self) -> None:
+        """ Wait until the book is reset by a snapshot, at most
+        :attr:`snapshot_timeout` seconds.
+        """
+        deadline = time.monotonic() + self.snapshot_timeout
+        while not self._synced:
+            if time.monotonic() > deadline:
+                raise TimeoutError(
+                    f'no book snapshot within {self.snapshot_timeout:g} s'
+                )
+
+            await asyncio.sleep(0.1)
+
+    async def _resync(self) -> None:
+        """ Resynchronize the book (override in subclasses).
+
+        Either call :meth:`_reset_book` with a snapshot of the book, or ask
+        the exchange for a new snapshot, which is then passed to
+        :meth:`_push_sequenced`.
+
+        """
+        raise NotImplementedError(
+            f'{type(self).__name__} does not implement _resync'
+        )
+
+    async def on_connect(self) -> None:
+        """ Drop the book sequence, missed during the reconnection. """
+        if not self._sequenced:
+
+            return
+
+        self._seq = None
+        self._pending.clear()
+        if self._snapshot_on_subscribe:
+            self._synced = False
+        else:
+            self._start_resync()
+
+    def _mark_book(self) -> None:
+        """ Flag the book as updated during the current time step.
+
+        The slot references the live book, it is copied by :meth:`__anext__`
+        when the time step is over.
+
+        """
+        self._data.setdefault(self.t, {'trades': [], 'book': {}})['book'] = self.d
 
     def _get_book_state(self) -> dict:
-        return dict(self.d)
+        return self.d.snapshot()
 
     def _restore_book_state(self, state: dict) -> None:
-        self.d = state
+        # Older checkpoints stored each level as a dict
+        self.d = OrderBook({
+            k: v['amount'] if isinstance(v, dict) else v
+            for k, v in state.items()
+        })
 
     def _checkpoint_file(self) -> Path | None:
         if self._checkpoint_dir is None:
@@ -235,12 +509,12 @@ class ContinuousDownloader(BasisWebSocket):
         name = getattr(self, 'pair', 'default')
         return self._checkpoint_dir / f'{name}_book.json'
 
-    def _save_checkpoint(self) -> None:
+    def _save_checkpoint(self, state: dict | None = None) -> None:
         f = self._checkpoint_file()
         if f is None:
             return
         f.parent.mkdir(parents=True, exist_ok=True)
-        f.write_text(json.dumps(self._get_book_state()))
+        f.write_text(json.dumps(self._get_book_state() if state is None else state))
 
     def _load_checkpoint(self) -> None:
         f = self._checkpoint_file()
@@ -249,7 +523,7 @@ class ContinuousDownloader(BasisWebSocket):
 
     def set_trades_saver(self, saver: Callable[..., Any],
                          process_func: Callable[..., Any] = set_trades,
-                         **kwargs: Any) -> None:
+                         arrow: bool | None = None, **kwargs: Any) -> None:
         """ Set saver for the trades channel.
 
         Parameters
@@ -259,12 +533,23 @@ class ContinuousDownloader(BasisWebSocket):
         process_func : callable, optional
             Function to convert raw trade list to a DataFrame, default is
             :func:`dccd.process_data.set_trades`.
+        arrow : bool, optional
+            If True, `process_func` is called with ``output='arrow'`` and
+            `saver` receives a pyarrow.RecordBatch sharing the memory of the
+            trade buffer. Default is True for the default `process_func` and
+            an :class:`~dccd.tools.io.IODataBase` writing Arrow natively
+            (Parquet, Polars), False otherwise.
         **kwargs
             Extra keyword arguments forwarded to ``saver`` on each call.
 
         """
+        if arrow is None:
+            arrow = (process_func is set_trades
+                     and isinstance(saver, IODataBase) and saver.native_arrow)
+
         self._trades_saver = saver
         self._trades_process_func = process_func
+        self._trades_arrow = arrow
         self._trades_saver_kwargs = kwargs
 
     def set_book_saver(self, saver: Callable[..., Any],
@@ -278,7 +563,9 @@ class ContinuousDownloader(BasisWebSocket):
             Callable to persist the processed DataFrame (e.g. ``IODataBase``).
         process_func : callable, optional
             Function to convert the book dict to a DataFrame, default is
-            :func:`dccd.process_data.set_marketdepth`.
+            :func:`dccd.process_data.set_marketdepth`. Use e.g.
+            ``functools.partial(set_marketdepth, depth=50, wide=True)`` to
+            save one row of fixed columns per snapshot.
         **kwargs
             Extra keyword arguments forwarded to ``saver`` on each call.
 
@@ -287,6 +574,32 @@ class ContinuousDownloader(BasisWebSocket):
         self._book_process_func = process_func
         self._book_saver_kwargs = kwargs
 
+    def set_bars_saver(self, saver: Callable[..., Any],
+                       width: int | None = None, **kwargs: Any) -> None:
+        """ Set saver for the OHLCV bars aggregated from the trades.
+
+        Each trade updates the bars as it arrives, the bars closed are saved
+        at each time step. Call it once per bar width to save several widths
+        from the same trades.
+
+        Parameters
+        ----------
+        saver : callable
+            Callable to persist the bars DataFrame (e.g. ``IODataBase``),
+            see :meth:`dccd.continuous_dl.bars.BarBuilder.flush`.
+        width : int, optional
+            Width of the bars in seconds, default is the time step.
+        **kwargs
+            Extra keyword arguments forwarded to ``saver`` on each call.
+
+        """
+        width = self.ts if width is None else width
+        if self._bars is None:
+            self._bars = BarBuilder(widths=())
+
+        self._bars.add_width(width)
+        self._bars_savers[width] = (saver, kwargs)
+
     def set_process_data(self, func: Callable[..., Any], **kwargs: Any) -> None:
         """ Set processing function.
 
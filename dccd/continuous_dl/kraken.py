@@ -20,17 +20,27 @@ Low level API
    :special-members: __call__
    :show-inheritance:
 
+Notes
+-----
+Each book message carries the CRC32 checksum of the 10 best asks and bids of
+the book, it is compared to the one of the local book once the precisions of
+the pair are known (``instrument`` channel), and the book channel is
+subscribed again after a mismatch.
+
 """
 
 # Built-in packages
 import json
 import logging
 import time
+import zlib
 from datetime import datetime, timezone
+from functools import lru_cache
 
 # Third party packages
 # Local packages
 from dccd.continuous_dl.exchange import ContinuousDownloader
+from dccd.continuous_dl.orderbook import OrderBook
 from dccd.tools.io import IODataBase
 
 __all__ = [
@@ -39,6 +49,8 @@ __all__ = [
 ]
 
 _KRAKEN_WS_URL = 'wss://ws.kraken.com/v2'
+_KRAKEN_BOOK_DEPTH = 50
+_KRAKEN_CHECKSUM_DEPTH = 10
 
 
 def _iso_to_ts(iso: str) -> int:
@@ -97,6 +109,41 @@ def _parser_book(data: list[dict]) -> dict[str, float]:
     return book
 
 
+@lru_cache(maxsize=65536)
+def _checksum_digits(value: float, precision: int) -> str:
+    # e.g. 0.05 with a precision of 8 -> '5000000'
+    return f'{value:.{precision}f}'.replace('.', '').lstrip('0')
+
+
+def _kraken_checksum(book: OrderBook, price_precision: int,
+                     qty_precision: int) -> int:
+    """ Compute the CRC32 checksum of the book as Kraken WebSocket v2.
+
+    Parameters
+    ----------
+    book : OrderBook
+        Local order book.
+    price_precision, qty_precision : int
+        Number of decimals of the prices and quantities of the pair.
+
+    Returns
+    -------
+    int
+        Unsigned CRC32 of the 10 best asks (ascending) then bids
+        (descending), each level written as its price then its quantity
+        without decimal point and leading zeros.
+
+    """
+    bids, asks = book.top(_KRAKEN_CHECKSUM_DEPTH)
+    s = ''.join(
+        _checksum_digits(abs(float(k)), price_precision)
+        + _checksum_digits(abs(book[k]), qty_precision)
+        for k in asks + bids
+    )
+
+    return zlib.crc32(s.encode())
+
+
 def _parser_kline(data: list[dict]) -> list[dict]:
     """ Parse an ohlc push message from Kraken WebSocket v2.
 
@@ -136,6 +183,10 @@ class DownloadKrakenData(ContinuousDownloader):
     span : int, optional
         OHLCV interval in seconds; if given, also subscribes to the ohlc
         channel. Must be a multiple of 60. Default is None.
+    price_precision, qty_precision : int, optional
+        Number of decimals of the prices and quantities of the pair, used to
+        verify the book checksums. Default is None, they are read from the
+        ``instrument`` channel.
 
     Attributes
     ----------
@@ -147,6 +198,8 @@ class DownloadKrakenData(ContinuousDownloader):
         Snapshot interval in seconds.
     until : int
         Stop timestamp.
+    n_checksum_errors : int
+        Number of book checksums which did not match the Kraken ones.
 
     Methods
     -------
@@ -156,9 +209,13 @@ class DownloadKrakenData(ContinuousDownloader):
 
     """
 
+    _snapshot_on_subscribe = True
+
     def __init__(self, pair: str = 'BTC/USD', time_step: int = 60,
                  until: int | None = 3600, span: int | None = None,
-                 checkpoint_dir: str | None = None) -> None:
+                 checkpoint_dir: str | None = None,
+                 price_precision: int | None = None,
+                 qty_precision: int | None = None) -> None:
         """ Initialize object. """
         if until is None:
             until = 0
@@ -167,6 +224,10 @@ class DownloadKrakenData(ContinuousDownloader):
 
         self.pair = pair
         self._span = span
+        self._precision = None
+        if price_precision is not None and qty_precision is not None:
+            self._precision = (price_precision, qty_precision)
+
         ContinuousDownloader.__init__(
             self, _KRAKEN_WS_URL, time_step=time_step, STOP=until,
             checkpoint_dir=checkpoint_dir,
@@ -188,8 +249,13 @@ class DownloadKrakenData(ContinuousDownloader):
         }))
         await self.ws.send(json.dumps({
             'method': 'subscribe',
-            'params': {'channel': 'book', 'symbol': [self.pair], 'depth': 50},
+            'params': {'channel': 'book', 'symbol': [self.pair],
+                       'depth': _KRAKEN_BOOK_DEPTH},
         }))
+        if self._precision is None:
+            await self.ws.send(json.dumps({
+                'method': 'subscribe', 'params': {'channel': 'instrument'},
+            }))
         if self._span is not None:
             period = max(1, self._span // 60)
             await self.ws.send(json.dumps({
@@ -217,6 +283,8 @@ class DownloadKrakenData(ContinuousDownloader):
             self.parser_book(msg)
         elif channel == 'ohlc':
             self.parser_kline(msg.get('data', []))
+        elif channel == 'instrument':
+            self.parser_instrument(msg.get('data', {}))
 
     def parser_trades(self, data: list[dict]) -> None:
         """ Parse and store a trade push message.
@@ -238,7 +306,48 @@ class DownloadKrakenData(ContinuousDownloader):
             Full Kraken book push message (contains ``type`` and ``data``).
 
         """
-        self._push_book_updates(_parser_book(msg.get('data', [])))
+        data = msg.get('data', [])
+        updates = _parser_book(data)
+        if msg.get('type') == 'snapshot':
+            self._pending.clear()
+            self._reset_book(updates, 0)
+        elif self._synced:
+            self._push_book_updates(updates)
+        else:
+            # Waiting for the snapshot of a resubscription
+
+            return
+
+        # Levels out of the subscribed depth are not removed by Kraken
+        self.d.truncate(_KRAKEN_BOOK_DEPTH)
+        if self._precision is not None and data and 'checksum' in data[0]:
+            self._check_book(data[0]['checksum'],
+                             _kraken_checksum(self.d, *self._precision))
+
+    def parser_instrument(self, data: dict) -> None:
+        """ Set the precisions of the pair from an instrument message.
+
+        Parameters
+        ----------
+        data : dict
+            The ``data`` field from the Kraken instrument message, with the
+            ``price_precision`` and ``qty_precision`` of each pair.
+
+        """
+        for info in data.get('pairs', []):
+            if info.get('symbol') == self.pair:
+                self._precision = (info['price_precision'],
+                                   info['qty_precision'])
+
+    async def _resync(self) -> None:
+        """ Subscribe again to the book channel to get a new snapshot. """
+        params = {'channel': 'book', 'symbol': [self.pair]}
+        await self.ws.send(json.dumps({'method': 'unsubscribe',
+                                       'params': params}))
+        await self.ws.send(json.dumps({
+            'method': 'subscribe',
+            'params': {**params, 'depth': _KRAKEN_BOOK_DEPTH},
+        }))
 
     def parser_kline(self, data: list[dict]) -> None:
         """ Parse and store an ohlc push message.
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+""" Objects and functions to download data of several pairs on one WebSocket.
+
+.. currentmodule:: dccd.continuous_dl.multiplex
+
+High level API
+--------------
+
+.. autofunction:: get_data_multiplex
+
+Low level API
+-------------
+
+.. autoclass:: dccd.continuous_dl.multiplex.MultiplexDownloader
+   :members: downloaders
+   :special-members: __getitem__, __call__
+   :show-inheritance:
+
+Notes
+-----
+Binance combined streams are declared in the URL (up to 1 024 streams per
+connection, i.e. 512 pairs with the trade and depth streams). Kraken and OKX
+accept a list of symbols in one subscribe request, Bybit up to 10 topics per
+request, so the subscription is split in several requests.
+
+"""
+
+# Built-in packages
+import json
+import logging
+import time
+from collections.abc import Callable, Iterator, Sequence
+from typing import Any
+
+# Local packages
+from dccd.continuous_dl.binance import (
+    _BINANCE_STREAMS,
+    _BINANCE_WS_HOST,
+    DownloadBinanceData,
+)
+from dccd.continuous_dl.bybit import DownloadBybitData
+from dccd.continuous_dl.exchange import ContinuousDownloader
+from dccd.continuous_dl.kraken import DownloadKrakenData
+from dccd.continuous_dl.okx import DownloadOKXData
+from dccd.tools.io import IODataBase
+
+__all__ = ['MultiplexDownloader', 'get_data_multiplex']
+
+_BINANCE_MAX_STREAMS = 1024
+_BYBIT_MAX_ARGS = 10
+
+Routed = Iterator[tuple[str, dict[str, Any]]]
+
+
+# =========================================================================== #
+#                            Connection settings                              #
+# =========================================================================== #
+
+
+def _host(downloaders: Sequence[ContinuousDownloader]) -> str:
+    return downloaders[0].host
+
+
+def _binance_host(downloaders: Sequence[DownloadBinanceData]) -> str:
+    streams = [_BINANCE_STREAMS.format(sym=dl.pair.lower()) for dl in downloaders]
+    n = 2 * len(streams)
+    if n > _BINANCE_MAX_STREAMS:
+        raise ValueError(
+            f'{n} Binance streams requested, at most {_BINANCE_MAX_STREAMS} '
+            f'per connection ({_BINANCE_MAX_STREAMS // 2} pairs)'
+        )
+
+    return _BINANCE_WS_HOST + '/'.join(streams)
+
+
+def _binance_requests(downloaders: Sequence[DownloadBinanceData]) -> list[dict[str, Any]]:
+    # Streams are declared in the URL
+    return []
+
+
+def _bybit_requests(downloaders: Sequence[DownloadBybitData]) -> list[dict[str, Any]]:
+    args = [arg for dl in downloaders for arg in dl.subs_data['args']]
+
+    return [{'op': 'subscribe', 'args': args[i: i + _BYBIT_MAX_ARGS]}
+            for i in range(0, len(args), _BYBIT_MAX_ARGS)]
+
+
+def _kraken_requests(downloaders: Sequence[DownloadKrakenData]) -> list[dict[str, Any]]:
+    symbols = [dl.pair for dl in downloaders]
+    requests = [
+        {'method': 'subscribe',
+         'params': {'channel': 'trade', 'symbol': symbols}},
+        {'method': 'subscribe',
+         'params': {'channel': 'book', 'symbol': symbols, 'depth': 50}},
+    ]
+    if any(dl._precision is None for dl in downloaders):
+        # Precisions of the pairs, to verify the book checksums
+        requests.append({'method': 'subscribe',
+                         'params': {'channel': 'instrument'}})
+    span = downloaders[0]._span
+    if span is not None:
+        requests.append({
+            'method': 'subscribe',
+            'params': {'channel': 'ohlc', 'symbol': symbols,
+                       'period': max(1, span // 60)},
+        })
+
+    return requests
+
+
+def _okx_requests(downloaders: Sequence[DownloadOKXData]) -> list[dict[str, Any]]:
+    return [{'op': 'subscribe',
+             'args': [arg for dl in downloaders for arg in dl.subs_data['args']]}]
+
+
+# =========================================================================== #
+#                              Message routing                                #
+# =========================================================================== #
+
+
+def _route_binance(msg: dict[str, Any]) -> Routed:
+    # e.g. {'stream': 'btcusdt@trade', 'data': {...}}
+    stream = msg.get('stream')
+    if stream:
+        yield stream.split('@', 1)[0], msg
+
+
+def _route_bybit(msg: dict[str, Any]) -> Routed:
+    # e.g. {'topic': 'orderbook.50.BTCUSDT', 'data': {...}}
+    topic = msg.get('topic')
+    if topic:
+        yield topic.rsplit('.', 1)[-1], msg
+
+
+def _route_kraken(msg: dict[str, Any]) -> Routed:
+    if msg.get('channel') == 'instrument':
+        for info in msg.get('data', {}).get('pairs', []):
+            yield info.get('symbol'), {**msg, 'data': {'pairs': [info]}}
+
+        return
+
+    # One message may carry the items of several symbols
+    if msg.get('channel') not in ('trade', 'book', 'ohlc'):
+
+        return
+
+    items: dict[str, list[dict[str, Any]]] = {}
+    for item in msg.get('data', []):
+        items.setdefault(item.get('symbol'), []).append(item)
+
+    for symbol, data in items.items():
+        yield symbol, {**msg, 'data': data}
+
+
+def _route_okx(msg: dict[str, Any]) -> Routed:
+    # Subscription events carry an 'arg' but no 'data'
+    if 'data' in msg:
+        yield msg.get('arg', {}).get('instId'), msg
+
+
+_EXCHANGES: dict[str, tuple[type[ContinuousDownloader], Callable[..., str], Callable[..., list], Callable[..., Routed]]] = {
+    'binance': (DownloadBinanceData, _binance_host, _binance_requests, _route_binance),
+    'bybit': (DownloadBybitData, _host, _bybit_requests, _route_bybit),
+    'kraken': (DownloadKrakenData, _host, _kraken_requests, _route_kraken),
+    'okx': (DownloadOKXData, _host, _okx_requests, _route_okx),
+}
+
+
+class MultiplexDownloader(ContinuousDownloader):
+    """ Download data continuously of several pairs over one WebSocket.
+
+    All the pairs are subscribed on a single connection, each message is
+    routed by its symbol to the downloader of the pair, which parses it and
+    keeps the order book and the trades of the pair. Every ``time_step``
+    the data of each pair is saved with the savers set on its downloader.
+
+    Parameters
+    ----------
+    exchange : {'binance', 'bybit', 'kraken', 'okx'}
+        Name of the exchange.
+    pairs : list of str
+        Trading pairs in the format of the exchange (e.g. 'BTCUSDT' for
+        Binance, 'BTC/USD' for Kraken).
+    time_step : int, optional
+        Seconds between data snapshots, default is 60.
+    until : int, optional
+        Seconds to run or stop timestamp, default is 3600.
+    checkpoint_dir : str, optional
+        Directory of the order book checkpoint of each pair.
+    **kwargs
+        Keyword arguments of the downloader of each pair, e.g. ``span``
+        for Kraken and OKX.
+
+    Attributes
+    ----------
+    exchange : str
+        Name of the exchange.
+    downloaders : dict of ContinuousDownloader
+        Downloader of each pair, e.g. :class:`DownloadBinanceData`, keyed
+        by pair.
+    host : str
+        WebSocket URL.
+    ts : int
+        Snapshot interval in seconds.
+    until : int
+        Stop timestamp.
+
+    Raises
+    ------
+    ValueError
+        If `exchange` is not supported or `pairs` is empty.
+
+    Examples
+    --------
+    >>> from unittest.mock import MagicMock
+    >>> mux = MultiplexDownloader('binance', ['BTCUSDT', 'ETHUSDT'])
+    >>> mux['ETHUSDT'].set_trades_saver(MagicMock())
+    >>> mux.host
+    'wss://stream.binance.com:9443/stream?streams=btcusdt@trade/btcusdt@depth@100ms/ethusdt@trade/ethusdt@depth@100ms'
+
+    """
+
+    def __init__(self, exchange: str, pairs: list[str], time_step: int = 60,
+                 until: int | None = 3600, checkpoint_dir: str | None = None,
+                 **kwargs: Any) -> None:
+        """ Initialize object. """
+        if exchange not in _EXCHANGES:
+            raise ValueError(
+                f'exchange {exchange!r} is not supported for multiplexing, '
+                f'allowed: {list(_EXCHANGES)}'
+            )
+
+        pairs = list(dict.fromkeys(pairs))
+        if not pairs:
+            raise ValueError('at least one pair is required')
+
+        if until is None:
+            until = 0
+        elif until > time.time():
+            until -= int(time.time())
+
+        cls, host, self._requests, self._route = _EXCHANGES[exchange]
+        self.exchange = exchange
+        self.downloaders: dict[str, ContinuousDownloader] = {
+            pair: cls(pair=pair, time_step=time_step, until=until,
+                      checkpoint_dir=checkpoint_dir, **kwargs)
+            for pair in pairs
+        }
+        # Symbols are matched case-insensitively (Binance streams are lower)
+        self._routes = {pair.lower(): dl for pair, dl in self.downloaders.items()}
+
+        ContinuousDownloader.__init__(
+            self, host(list(self.downloaders.values())), time_step=time_step,
+            STOP=until,
+        )
+        self.logger = logging.getLogger(__name__)
+
+    def __getitem__(self, pair: str) -> ContinuousDownloader:
+        """ Get the downloader of `pair`, to set its savers. """
+        return self.downloaders[pair]
+
+    async def _subscribe(self, **kwargs: object) -> None:
+        """ Subscribe all the pairs on the connection. """
+        await self.wait_that('ws')
+        requests = self._requests(list(self.downloaders.values()))
+        for request in requests:
+            await self.ws.send(json.dumps(request))
+
+        self.logger.info('Subscribed %d pairs in %d request(s)',
+                         len(self.downloaders), len(requests))
+        self.is_connect = True
+
+    async def on_connect(self) -> None:
+        """ Share the connection with the downloader of each pair. """
+        for dl in self.downloaders.values():
+            # Used to subscribe again to the book of a pair
+            dl.ws = self.ws
+            await dl.on_connect()
+
+    async def on_message(self, msg: dict[str, Any] | list[Any]) -> None:
+        """ Route a message to the downloader of its symbol.
+
+        Parameters
+        ----------
+        msg : dict
+            Message of the exchange, messages without symbol (subscription
+            events, heartbeats) are ignored.
+
+        """
+        for symbol, data in self._route(msg):
+            dl = self._routes.get(str(symbol).lower())
+            if dl is None:
+                self.logger.debug('No pair for symbol %r', symbol)
+                continue
+
+            dl.t = self.t
+            await dl.on_message(data)
+
+    def _pop_snapshot(self, t: int) -> dict[str, Any] | None:
+        """ Remove and return the data of each pair at `t`, None if empty. """
+        snapshots = {}
+        for pair, dl in self.downloaders.items():
+            snapshot = dl._pop_snapshot(t)
+            if snapshot is not None:
+                snapshots[pair] = snapshot
+
+        return snapshots or None
+
+    def _freeze_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """ Freeze the data of each pair, see
+        :meth:`ContinuousDownloader._freeze_snapshot`.
+        """
+        for pair, data in snapshot.items():
+            self.downloaders[pair]._freeze_snapshot(data)
+
+    def _save_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """ Save the data of each pair with the savers of its downloader. """
+        for pair, data in snapshot.items():
+            self.downloaders[pair]._save_snapshot(data)
+
+
+def get_data_multiplex(path: str, exchange: str, pairs: list[str],
+                       time_step: int = 60, until: int = 3600,
+                       form: str = 'csv') -> None:
+    """ Download order book and trades data of several pairs on one WebSocket.
+
+    Parameters
+    ----------
+    path : str
+        Root path; trades of each pair saved under ``<path>/<pair>/trades/``,
+        book under ``<path>/<pair>/book/`` ('/' in pair replaced by '_').
+    exchange : {'binance', 'bybit', 'kraken', 'okx'}
+        Name of the exchange.
+    pairs : list of str
+        Trading pairs in the format of the exchange.
+    time_step : int, optional
+        Seconds between snapshots, default is 60.
+    until : int, optional
+        Duration in seconds or stop timestamp, default is 3600.
+    form : str, optional
+        Save format ('csv', 'parquet', etc.), default is 'csv'.
+
+    """
+    downloader = MultiplexDownloader(exchange, pairs, time_step=time_step,
+                                     until=until)
+    for pair, dl in downloader.downloaders.items():
+        name = pair.replace('/', '_')
+        dl.set_trades_saver(IODataBase(f'{path}/{name}/trades', method=form))
+        dl.set_book_saver(IODataBase(f'{path}/{name}/book', method=form))
+
+    downloader()
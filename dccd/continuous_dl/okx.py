@@ -23,12 +23,15 @@ Low level API
 """
 
 # Built-in packages
+import json
 import logging
 import time
+import zlib
 
 # Third party packages
 # Local packages
 from dccd.continuous_dl.exchange import ContinuousDownloader
+from dccd.continuous_dl.orderbook import OrderBook
 from dccd.tools.io import IODataBase
 
 __all__ = [
@@ -37,6 +40,8 @@ __all__ = [
 
 _OKX_WS_URL = 'wss://ws.okx.com:8443/ws/v5/public'
 
+_OKX_CHECKSUM_DEPTH = 25
+
 _OKX_WS_INTERVALS: dict[int, str] = {
     60: '1m', 300: '5m', 900: '15m', 1800: '30m',
     3600: '1H', 7200: '2H', 14400: '4H', 21600: '6H', 43200: '12H',
@@ -105,6 +110,36 @@ def _parser_book(data: list[dict]) -> dict[str, float]:
     return book
 
 
+def _okx_checksum(book: OrderBook, sizes: dict[str, str]) -> int:
+    """ Compute the CRC32 checksum of the book as OKX.
+
+    Parameters
+    ----------
+    book : OrderBook
+        Local order book, keyed by the price strings of OKX.
+    sizes : dict
+        Size strings of OKX, keyed as the book.
+
+    Returns
+    -------
+    int
+        Signed CRC32 of the 25 best bids and asks, interleaved as
+        ``bidPx:bidSz:askPx:askSz:...``.
+
+    """
+    bids, asks = book.top(_OKX_CHECKSUM_DEPTH)
+    parts: list[str] = []
+    for i in range(max(len(bids), len(asks))):
+        if i < len(bids):
+            parts += (bids[i], sizes.get(bids[i], ''))
+        if i < len(asks):
+            parts += (asks[i][1:], sizes.get(asks[i], ''))
+
+    crc = zlib.crc32(':'.join(parts).encode())
+
+    return crc - (1 << 32) if crc >= 1 << 31 else crc
+
+
 def _parser_kline(data: list[list]) -> list[dict]:
     """ Parse a candle message from OKX WebSocket.
 
@@ -156,6 +191,8 @@ class DownloadOKXData(ContinuousDownloader):
         Snapshot interval in seconds.
     until : int
         Stop timestamp.
+    n_checksum_errors : int
+        Number of book checksums which did not match the OKX ones.
 
     Methods
     -------
@@ -163,8 +200,20 @@ class DownloadOKXData(ContinuousDownloader):
     set_saver
     __call__
 
+    Notes
+    -----
+    Book updates are chained by ``prevSeqId`` / ``seqId``, and carry the
+    CRC32 checksum of the 25 best levels. After a gap, a ``seqId`` lower
+    than the one of the book (the sequence is reset after a maintenance) or
+    a checksum mismatch the book channel is subscribed again to receive a
+    new snapshot.
+
     """
 
+    _sequenced = True
+    _snapshot_on_subscribe = True
+    _seq_resets = True
+
     def __init__(self, pair: str = 'BTC-USDT', time_step: int = 60,
                  until: int | None = 3600, span: int | None = None,
                  checkpoint_dir: str | None = None) -> None:
@@ -175,6 +224,8 @@ class DownloadOKXData(ContinuousDownloader):
             until -= int(time.time())
 
         self.pair = pair
+        # Size strings of the levels, as written in the checksums
+        self._sizes: dict[str, str] = {}
         args: list[dict] = [
             {'channel': 'trades', 'instId': pair},
             {'channel': 'books50-l2-tbt', 'instId': pair},
@@ -232,7 +283,43 @@ class DownloadOKXData(ContinuousDownloader):
             Full OKX books push message (contains ``action`` and ``data``).
 
         """
-        self._push_book_updates(_parser_book(msg.get('data', [])))
+        data = msg.get('data', [])
+        updates = _parser_book(data)
+        if not (data and 'seqId' in data[0]):
+            self._push_book_updates(updates)
+
+            return
+
+        snapshot = msg.get('action') == 'snapshot'
+        self._push_sequenced(updates, data[0]['prevSeqId'] + 1,
+                             data[0]['seqId'], snapshot=snapshot)
+        if not (self._synced and self._seq == data[0]['seqId']):
+
+            return
+
+        if snapshot:
+            self._sizes.clear()
+
+        self._set_sizes(data)
+        if 'checksum' in data[0]:
+            self._check_book(data[0]['checksum'],
+                             _okx_checksum(self.d, self._sizes))
+
+    def _set_sizes(self, data: list[dict]) -> None:
+        for snap in data:
+            for side, prefix in (('bids', ''), ('asks', '-')):
+                for level in snap.get(side, []):
+                    if float(level[1]):
+                        self._sizes[prefix + level[0]] = level[1]
+                    else:
+                        self._sizes.pop(prefix + level[0], None)
+
+    async def _resync(self) -> None:
+        """ Subscribe again to the book channel to get a new snapshot. """
+        args = [a for a in self.subs_data['args']
+                if a['channel'].startswith('books')]
+        await self.ws.send(json.dumps({'op': 'unsubscribe', 'args': args}))
+        await self.ws.send(json.dumps({'op': 'subscribe', 'args': args}))
 
     def parser_kline(self, data: list[list]) -> None:
         """ Parse and store a candle push message.
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+""" Local order book maintained in place from the WebSocket deltas.
+
+.. currentmodule:: dccd.continuous_dl.orderbook
+
+.. autoclass:: OrderBook
+   :members: set, apply, best_bid, best_ask, mid, depth, top, truncate, snapshot, clear
+
+"""
+
+# Built-in packages
+from bisect import bisect_left, insort
+from collections.abc import Hashable, Iterator, Mapping
+
+# Third party packages
+# Local packages
+
+__all__ = ['OrderBook']
+
+
+def _price(key: Hashable) -> float:
+    # Asks may be keyed with a '-' prefix, e.g. '-30010.0'
+    return abs(float(key))  # type: ignore[arg-type]
+
+
+class OrderBook(Mapping):
+    """ Order book with sorted bid and ask sides, updated in place.
+
+    The book is a read-only mapping of price level keys to signed amounts
+    (positive for bids, negative for asks), i.e. the ``{price: amount}``
+    format of :func:`dccd.process_data.set_marketdepth`. Each delta costs a
+    dictionary update, plus a binary search in the sorted prices of its side
+    when a level is added or removed; nothing is copied before
+    :meth:`snapshot`.
+
+    Parameters
+    ----------
+    levels : mapping, optional
+        Initial levels as ``{price: amount}``.
+
+    Examples
+    --------
+    >>> book = OrderBook({'100.0': 1., '101.0': 2., '-102.0': -1.5})
+    >>> book.apply({'101.0': 0., '-103.0': -2.})
+    >>> book.best_bid(), book.best_ask(), book.mid()
+    ((100.0, 1.0), (102.0, 1.5), 101.0)
+    >>> book.depth(2)
+    ([(100.0, 1.0)], [(102.0, 1.5), (103.0, 2.0)])
+    >>> book.snapshot()
+    {'100.0': 1.0, '-102.0': -1.5, '-103.0': -2.0}
+
+    """
+
+    def __init__(self, levels: Mapping[Hashable, float] | None = None) -> None:
+        """ Initialize object. """
+        self._levels: dict[Hashable, float] = {}
+        # Sorted prices (ascending) and price -> key map of each side
+        self._bid_px: list[float] = []
+        self._ask_px: list[float] = []
+        self._bid_keys: dict[float, Hashable] = {}
+        self._ask_keys: dict[float, Hashable] = {}
+
+        if levels:
+            self.apply(levels)
+
+    def __getitem__(self, key: Hashable) -> float:
+        return self._levels[key]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._levels)
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def __repr__(self) -> str:
+        return f'OrderBook(bids={len(self._bid_px)}, asks={len(self._ask_px)})'
+
+    def _side(self, is_bid: bool) -> tuple[list[float], dict[float, Hashable]]:
+        if is_bid:
+
+            return self._bid_px, self._bid_keys
+
+        return self._ask_px, self._ask_keys
+
+    def set(self, key: Hashable, amount: float) -> None:
+        """ Set the amount of a price level.
+
+        Parameters
+        ----------
+        key : str or float
+            Price of the level, asks may be prefixed by ``'-'``.
+        amount : float
+            New amount of the level, positive for a bid and negative for an
+            ask, zero removes the level.
+
+        """
+        old = self._levels.get(key)
+        if old is not None:
+            if amount and (amount > 0) == (old > 0):
+                self._levels[key] = amount
+
+                return
+
+            del self._levels[key]
+            prices, keys = self._side(old > 0)
+            price = _price(key)
+            i = bisect_left(prices, price)
+            if i < len(prices) and prices[i] == price:
+                del prices[i]
+                keys.pop(price, None)
+
+        if amount:
+            prices, keys = self._side(amount > 0)
+            price = _price(key)
+            if price not in keys:
+                insort(prices, price)
+
+            keys[price] = key
+            self._levels[key] = amount
+
+    def apply(self, updates: Mapping[Hashable, float]) -> None:
+        """ Apply a ``{price: amount}`` delta, a zero amount removes a level.
+        """
+        for key, amount in updates.items():
+            self.set(key, amount)
+
+    def best_bid(self) -> tuple[float, float] | None:
+        """ Get the highest bid as ``(price, amount)``, None if no bid. """
+        if not self._bid_px:
+
+            return None
+
+        price = self._bid_px[-1]
+
+        return price, self._levels[self._bid_keys[price]]
+
+    def best_ask(self) -> tuple[float, float] | None:
+        """ Get the lowest ask as ``(price, amount)``, None if no ask. """
+        if not self._ask_px:
+
+            return None
+
+        price = self._ask_px[0]
+
+        return price, -self._levels[self._ask_keys[price]]
+
+    def mid(self) -> float | None:
+        """ Get the mid price, None if a side is empty. """
+        if not (self._bid_px and self._ask_px):
+
+            return None
+
+        return (self._bid_px[-1] + self._ask_px[0]) / 2
+
+    def depth(self, n: int) -> tuple[list[tuple[float, float]], list[tuple[float, float]]]:
+        """ Get the `n` best levels of each side.
+
+        Parameters
+        ----------
+        n : int
+            Number of levels per side.
+
+        Returns
+        -------
+        bids, asks : list of tuple
+            ``(price, amount)`` from the best price, amounts are positive.
+
+        """
+        bids, asks = self.top(n)
+
+        return ([(_price(k), self._levels[k]) for k in bids],
+                [(_price(k), -self._levels[k]) for k in asks])
+
+    def top(self, n: int) -> tuple[list[Hashable], list[Hashable]]:
+        """ Get the keys of the `n` best levels of each side.
+
+        Parameters
+        ----------
+        n : int
+            Number of levels per side.
+
+        Returns
+        -------
+        bids, asks : list
+            Keys of the levels from the best price.
+
+        """
+        if n <= 0:
+
+            return [], []
+
+        return ([self._bid_keys[p] for p in self._bid_px[:-n - 1:-1]],
+                [self._ask_keys[p] for p in self._ask_px[:n]])
+
+    def truncate(self, n: int) -> None:
+        """ Remove the levels beyond the `n` best of each side. """
+        keys = [self._bid_keys[p]
+                for p in self._bid_px[:max(len(self._bid_px) - n, 0)]]
+        keys += [self._ask_keys[p] for p in self._ask_px[max(n, 0):]]
+        for key in keys:
+            self.set(key, 0.)
+
+    def snapshot(self) -> dict[Hashable, float]:
+        """ Copy the book as a ``{price: amount}`` dict. """
+        return dict(self._levels)
+
+    def clear(self) -> None:
+        """ Remove all the levels. """
+        self._levels.clear()
+        self._bid_px.clear()
+        self._ask_px.clear()
+        self._bid_keys.clear()
+        self._ask_keys.clear()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+""" Columnar buffer of the trades received during a time step.
+
+.. currentmodule:: dccd.continuous_dl.trades
+
+.. autoclass:: TradeBuffer
+   :members: extend, append, columns, to_frame, to_arrow, to_records, clear
+
+"""
+
+# Built-in packages
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any
+
+# Third party packages
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Local packages
+from dccd.validation import DataValidationError
+
+__all__ = ['TradeBuffer']
+
+_SIDES = {'buy': 1, 'sell': -1}
+# Indexed by the side codes, i.e. 0 -> None, 1 -> 'buy', -1 -> 'sell'
+_TYPES = np.array([None, 'buy', 'sell'], dtype=object)
+
+
+def _resize(arr: np.ndarray, capacity: int, n: int) -> np.ndarray:
+    # New array of `capacity` items, with the first `n` items of `arr`
+    new = np.empty(capacity, dtype=arr.dtype)
+    new[:n] = arr[:n]
+
+    return new
+
+
+def _trade_values(trades: Sequence[Mapping[str, Any]]) -> dict[str, np.ndarray]:
+    """ Convert and validate the numeric fields of a batch of trades.
+
+    Parameters
+    ----------
+    trades : list of dict
+        Trades with ``timestamp``, ``price`` and ``amount``.
+
+    Returns
+    -------
+    dict of np.ndarray
+        The ``timestamp``, ``price`` and ``amount`` columns as float64.
+
+    Raises
+    ------
+    DataValidationError
+        If a value is missing or not finite.
+    ValueError
+        If a value cannot be converted to a number.
+
+    """
+    values = {
+        col: np.array([d.get(col) for d in trades], dtype=np.float64)
+        for col in ('timestamp', 'price', 'amount')
+    }
+    failed = {f'invalid {col!r}': np.flatnonzero(~np.isfinite(v))
+              for col, v in values.items()}
+    failed = {k: v for k, v in failed.items() if v.size}
+    if failed:
+        raise DataValidationError('trade', failed)
+
+    return values
+
+
+class TradeBuffer(Sequence):
+    """ Growable buffer of trades stored in typed columns.
+
+    The trades are kept in preallocated NumPy arrays (``tid`` as int64 with a
+    mask of the missing ids, ``timestamp``, ``price`` and ``amount`` as
+    float64, the side as int8), which double in size when full. Each batch
+    of trades is converted and validated at once, and the columns are handed
+    to the savers as a dataframe without any Python object per trade.
+
+    Items are still readable as trade dicts, e.g. ``buffer[0]['price']``.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Initial number of trades allocated, default is 1024.
+
+    Examples
+    --------
+    >>> buffer = TradeBuffer()
+    >>> buffer.extend([
+    ...     {'tid': 2, 'timestamp': 1., 'price': 10., 'amount': 1., 'type': 'buy'},
+    ...     {'tid': None, 'timestamp': 2., 'price': '11', 'amount': 2.},
+    ... ])
+    >>> len(buffer), buffer[1]
+    (2, {'tid': None, 'timestamp': 2.0, 'price': 11.0, 'amount': 2.0, 'type': None})
+    >>> buffer.to_frame().price.tolist()
+    [10.0, 11.0]
+
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        """ Initialize object. """
+        capacity = max(capacity, 1)
+        self._n = 0
+        self._capacity = capacity
+        self._tid: np.ndarray = np.empty(capacity, dtype=np.int64)
+        self._tid_mask: np.ndarray = np.empty(capacity, dtype=np.bool_)
+        self._timestamp: np.ndarray = np.empty(capacity, dtype=np.float64)
+        self._price: np.ndarray = np.empty(capacity, dtype=np.float64)
+        self._amount: np.ndarray = np.empty(capacity, dtype=np.float64)
+        self._side: np.ndarray = np.empty(capacity, dtype=np.int8)
+
+    def _alloc(self, capacity: int) -> None:
+        n = self._n
+        self._tid = _resize(self._tid, capacity, n)
+        self._tid_mask = _resize(self._tid_mask, capacity, n)
+        self._timestamp = _resize(self._timestamp, capacity, n)
+        self._price = _resize(self._price, capacity, n)
+        self._amount = _resize(self._amount, capacity, n)
+        self._side = _resize(self._side, capacity, n)
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, i: int) -> dict[str, Any]:  # type: ignore[override]
+        if i < 0:
+            i += self._n
+
+        if not 0 <= i < self._n:
+            raise IndexError('trade index out of range')
+
+        return {
+            'tid': None if self._tid_mask[i] else int(self._tid[i]),
+            'timestamp': float(self._timestamp[i]),
+            'price': float(self._price[i]),
+            'amount': float(self._amount[i]),
+            'type': _TYPES[self._side[i]],
+        }
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return (self[i] for i in range(self._n))
+
+    def __repr__(self) -> str:
+        return f'TradeBuffer(n={self._n}, capacity={self._capacity})'
+
+    def extend(self, trades: Iterable[Mapping[str, Any]]) -> None:
+        """ Validate and append a batch of trades.
+
+        Parameters
+        ----------
+        trades : iterable of dict
+            Trades with ``tid`` (int or None), ``timestamp``, ``price``,
+            ``amount`` and optionally ``type`` ('buy' or 'sell').
+
+        Raises
+        ------
+        DataValidationError
+            If a timestamp, price or amount is missing or not finite, no
+            trade of the batch is appended.
+        ValueError
+            If a value cannot be converted to a number.
+
+        """
+        trades = trades if isinstance(trades, list) else list(trades)
+        n = len(trades)
+        if not n:
+
+            return
+
+        tids = [d.get('tid') for d in trades]
+        tid_mask = np.fromiter((t is None for t in tids), np.bool_, n)
+        tid = np.array([0 if t is None else t for t in tids], dtype=np.int64)
+        values = _trade_values(trades)
+        side = np.fromiter((_SIDES.get(str(d.get('type')), 0) for d in trades),
+                           np.int8, n)
+
+        if self._n + n > self._capacity:
+            self._alloc(max(2 * self._capacity, self._n + n))
+
+        s = slice(self._n, self._n + n)
+        self._tid[s], self._tid_mask[s], self._side[s] = tid, tid_mask, side
+        self._timestamp[s] = values['timestamp']
+        self._price[s] = values['price']
+        self._amount[s] = values['amount']
+        self._n += n
+
+    def append(self, trade: Mapping[str, Any]) -> None:
+        """ Validate and append one trade, see :meth:`extend`. """
+        self.extend([trade])
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """ Get views of the filled part of each column.
+
+        Returns
+        -------
+        dict of np.ndarray
+            ``tid`` (int64, 0 where missing), ``tid_mask`` (True where
+            missing), ``timestamp``, ``price``, ``amount`` (float64) and
+            ``side`` (int8, 1 buy, -1 sell, 0 unknown).
+
+        """
+        n = self._n
+
+        return {
+            'tid': self._tid[:n], 'tid_mask': self._tid_mask[:n],
+            'timestamp': self._timestamp[:n], 'price': self._price[:n],
+            'amount': self._amount[:n], 'side': self._side[:n],
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        """ Set the trades as a dataframe.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns ``tid`` (nullable integer), ``timestamp``, ``price``,
+            ``amount`` and ``type``, copied from the buffer.
+
+        """
+        cols = self.columns()
+
+        return pd.DataFrame({
+            'tid': pd.arrays.IntegerArray(cols['tid'].copy(),
+                                          cols['tid_mask'].copy()),
+            'timestamp': cols['timestamp'].copy(),
+            'price': cols['price'].copy(),
+            'amount': cols['amount'].copy(),
+            'type': _TYPES[cols['side']],
+        })
+
+    def to_arrow(self) -> 'pa.RecordBatch':
+        """ Set the trades as an Arrow record batch, sorted by ``tid``.
+
+        The numeric columns are shared with the buffer without copy (unless
+        they must be sorted), the buffer must not be extended afterwards.
+        Requires pyarrow: ``pip install dccd[io]``.
+
+        Returns
+        -------
+        pyarrow.RecordBatch
+            Columns ``tid`` (int64, null where missing), ``timestamp``,
+            ``price``, ``amount`` (float64) and ``type`` (string).
+
+        """
+        if not HAS_PYARROW:
+            raise ImportError(
+                "pyarrow is required for this method: pip install dccd[io]"
+            )
+
+        cols = self.columns()
+        tid, mask = cols['tid'], cols['tid_mask']
+        if not mask.any() and (tid[1:] < tid[:-1]).any():
+            order = np.argsort(tid, kind='stable')
+            cols = {k: v[order] for k, v in cols.items()}
+
+        side = cols['side']
+        types = pa.DictionaryArray.from_arrays(
+            pa.array(np.where(side > 0, 0, 1).astype(np.int8),
+                     mask=side == 0),
+            pa.array(['buy', 'sell']),
+        ).dictionary_decode()
+
+        return pa.RecordBatch.from_arrays([
+            pa.array(cols['tid'], mask=cols['tid_mask']),
+            pa.array(cols['timestamp']),
+            pa.array(cols['price']),
+            pa.array(cols['amount']),
+            types,
+        ], names=['tid', 'timestamp', 'price', 'amount', 'type'])
+
+    def to_records(self) -> list[dict[str, Any]]:
+        """ Get the trades as a list of dicts. """
+        return list(self)
+
+    def clear(self) -> None:
+        """ Remove all the trades, keeping the allocated capacity. """
+        self._n = 0
@@ -23,14 +23,15 @@ Commands
         Pydantic validation failure).
 
     dccd run --config PATH
-        Execute every histo_job once in order, then exit.
+        Execute every histo_job once in order, push the files written to
+        the remotes, then exit.
         Metrics (success/failure counts) are printed on completion.
         Useful for cron-based one-shot collection or smoke-testing a config.
 
     dccd start --config PATH
         Start the continuous daemon in the foreground:
         - APScheduler BackgroundScheduler for all histo_jobs
-        - StreamManager (one thread per WebSocket pair)
+        - StreamManager (one thread per WebSocket pair, or shared event loops)
         - SyncService (periodic rclone push to remotes)
         Block until SIGINT (Ctrl-C) or SIGTERM; shuts down cleanly on signal.
 
@@ -104,22 +105,50 @@ def validate(
 def run(
     config: str = typer.Option(_DEFAULT_CONFIG, '--config', '-c',
                                help='Path to the YAML config file.'),
+    workers: int = typer.Option(1, '--workers', '-w', min=1,
+                                help='Number of jobs running at once.'),
 ) -> None:
-    """ Run every histo_job once sequentially, then exit.
+    """ Run every histo_job once, then exit.
 
     Downloads and saves one candle batch per ``(exchange, pair)`` in
-    ``histo_jobs``.  A :class:`~dccd.daemon.health.HealthMonitor` is
+    ``histo_jobs``, on ``--workers`` threads (sequentially by default) with
+    at most a few jobs of each exchange at once, see
+    :func:`~dccd.daemon.scheduler.run_once`.  A
+    :class:`~dccd.daemon.health.HealthMonitor` is
     instantiated so metrics are persisted even for this one-shot run.
     Failed jobs are logged and skipped; remaining jobs continue.
     Prints ``successes=N failures=M`` on completion.
 
+    If remotes are configured (and rclone is found), the files written are
+    recorded in a :class:`~dccd.tools.journal.ChangeJournal` of its own
+    (kept in ``{local_path}/.dccd/run/``, apart from the one of the daemon)
+    and pushed to the remotes once the jobs are done, see
+    :meth:`~dccd.daemon.storage.RemoteStorage.push_changes`. A failed push
+    is retried at the next run.
+
     """
     from dccd.daemon.health import HealthMonitor
     from dccd.daemon.scheduler import run_once
+    from dccd.daemon.storage import RemoteStorage
+    from dccd.tools.journal import ChangeJournal, set_journal
 
     cfg = _load(config)
-    health = HealthMonitor(cfg.storage.local_path, cfg.alerts)  # type: ignore[attr-defined]
-    run_once(cfg, health=health)  # type: ignore[arg-type]
+    local_path = cfg.storage.local_path  # type: ignore[attr-defined]
+    health = HealthMonitor(local_path, cfg.alerts)  # type: ignore[attr-defined]
+    storage = RemoteStorage(cfg.storage)  # type: ignore[attr-defined]
+    if not storage.check_rclone():
+        # Nothing to push, nor to record
+        run_once(cfg, health=health, workers=workers)  # type: ignore[arg-type]
+    else:
+        journal = ChangeJournal(local_path, path=str(Path(local_path) / '.dccd' / 'run'))
+        previous = set_journal(journal)
+        try:
+            run_once(cfg, health=health, workers=workers)  # type: ignore[arg-type]
+        finally:
+            set_journal(previous)
+
+        storage.push_changes(journal)
+        journal.close()
     metrics = health.get_metrics()
     successes = sum(1 for m in metrics.values() if m.errors_count == 0)
     failures = sum(1 for m in metrics.values() if m.errors_count > 0)
@@ -136,7 +165,8 @@ def start(
     Starts three background components:
 
     - **APScheduler** (interval jobs for every ``histo_job``),
-    - **StreamManager** (one thread per ``(exchange, pair)`` WebSocket),
+    - **StreamManager** (one thread per ``(exchange, pair)`` WebSocket, or
+      a few shared event loops, see ``streaming`` in the config),
     - **SyncService** (periodic rclone push to all configured remotes).
 
     A :class:`~dccd.daemon.health.HealthMonitor` is shared across all
@@ -165,8 +195,9 @@ def start(
     signal.signal(signal.SIGTERM, _handle_signal)
 
     typer.echo('Starting daemon. Press Ctrl-C to stop.')
-    scheduler.start()
+    # The sync service records the files written from the first histo job
     stream_mgr.start()
+    scheduler.start()
     stop_event.wait()
     scheduler.shutdown(wait=False)
     stream_mgr.stop()
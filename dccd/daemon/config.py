@@ -10,7 +10,7 @@ Loads a YAML file and validates it with Pydantic v2 models.
 from __future__ import annotations
 
 import pathlib
-from typing import Any
+from typing import Any, Literal
 
 import yaml
 from pydantic import BaseModel, Field, field_validator, model_validator
@@ -19,9 +19,12 @@ __all__ = [
     'CollectorConfig',
     'AlertConfig',
     'HistoJob',
+    'HttpConfig',
     'RemoteConfig',
+    'SchedulingConfig',
     'StorageConfig',
     'StreamJob',
+    'StreamingConfig',
     'load_config',
 ]
 
@@ -64,12 +67,16 @@ class StorageConfig(BaseModel):
     sync_interval : int
         Seconds between periodic syncs to remote destinations.  ``0`` disables
         the sync service.  Default is ``3600`` (1 hour).
+    sync_timeout : int
+        Seconds allowed to each rclone push before it is killed.  Default is
+        ``300``.
 
     """
 
     local_path: str
     remotes: list[RemoteConfig] = Field(default_factory=list)
     sync_interval: int = 3600
+    sync_timeout: int = 300
 
 
 class HistoJob(BaseModel):
@@ -199,6 +206,74 @@ class AlertConfig(BaseModel):
     max_consecutive_errors: int = 3
 
 
+class HttpConfig(BaseModel):
+    """ Connection pool settings of the REST downloaders.
+
+    Parameters
+    ----------
+    pool_size : int
+        Maximum number of keep-alive connections per exchange host, default
+        is 10.
+    timeout : float
+        Timeout in seconds of each request, default is 30.
+    keep_alive : bool
+        Reuse connections between requests, default is True.
+
+    """
+
+    pool_size: int = Field(default=10, ge=1)
+    timeout: float = Field(default=30., gt=0)
+    keep_alive: bool = True
+
+
+class SchedulingConfig(BaseModel):
+    """ Timing of the histo jobs run by the daemon scheduler.
+
+    Parameters
+    ----------
+    mode : {'interval', 'aligned'}
+        ``'interval'`` (default) runs each job every ``span`` seconds from
+        the start of the daemon. ``'aligned'`` runs it just after the close
+        of each candle, i.e. ``grace`` seconds after every multiple of
+        ``span`` since the epoch.
+    grace : int
+        Seconds waited after the candle close in the ``'aligned'`` mode, for
+        the exchange to publish the candle. Default is 5.
+    spread : float
+        Fraction of ``span`` over which the start of the jobs of a same
+        span are spread evenly, e.g. with ``0.1`` the 10 jobs of an hourly
+        span start 36 seconds apart. Default is 0 (all at once).
+    batch : bool
+        If True, register one job per ``histo_job`` downloading its pairs one
+        after the other, instead of one job per pair. Default is False.
+
+    """
+
+    mode: Literal['interval', 'aligned'] = 'interval'
+    grace: int = Field(default=5, ge=0)
+    spread: float = Field(default=0., ge=0., lt=1.)
+    batch: bool = False
+
+
+class StreamingConfig(BaseModel):
+    """ Thread and event loop layout of the WebSocket streams.
+
+    Parameters
+    ----------
+    layout : {'thread', 'shared'}
+        ``'thread'`` (default) runs each stream in its own thread and event
+        loop. ``'shared'`` runs every stream as a task of a small pool of
+        event loops, one thread each.
+    loops : int
+        Number of event loops of the ``'shared'`` layout, streams are spread
+        over them in turn. Default is 1.
+
+    """
+
+    layout: Literal['thread', 'shared'] = 'thread'
+    loops: int = Field(default=1, ge=1)
+
+
 class CollectorConfig(BaseModel):
     """ Root configuration model for the dccd daemon.
 
@@ -212,6 +287,12 @@ class CollectorConfig(BaseModel):
         WebSocket streaming jobs.
     alerts : AlertConfig
         Alerting settings.
+    http : HttpConfig
+        Connection pool settings of the REST downloaders.
+    streaming : StreamingConfig
+        Thread and event loop layout of the WebSocket streams.
+    scheduling : SchedulingConfig
+        Timing of the histo jobs run by the daemon scheduler.
 
     """
 
@@ -219,6 +300,9 @@ class CollectorConfig(BaseModel):
     histo_jobs: list[HistoJob] = Field(default_factory=list)
     stream_jobs: list[StreamJob] = Field(default_factory=list)
     alerts: AlertConfig = Field(default_factory=AlertConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
+    streaming: StreamingConfig = Field(default_factory=StreamingConfig)
+    scheduling: SchedulingConfig = Field(default_factory=SchedulingConfig)
 
     @model_validator(mode='after')
     def _at_least_one_job(self) -> 'CollectorConfig':
@@ -14,6 +14,7 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 import time
 import urllib.request
 from dataclasses import asdict, dataclass
@@ -133,6 +134,8 @@ class HealthMonitor:
         self._metrics_file = self._dir / 'metrics.json'
         self._alerts = alerts
         self._metrics: dict[str, JobMetrics] = {}
+        # Jobs may report from several worker threads
+        self._lock = threading.Lock()
         self._load_metrics()
         self._setup_logging()
 
@@ -154,13 +157,14 @@ class HealthMonitor:
 
         """
         key = self._key(exchange, pair)
-        m = self._metrics.setdefault(key, JobMetrics())
-        now = time.time()
-        m.last_run_at = now
-        m.last_success_at = now
-        m.rows_collected += rows
-        m.errors_count = 0
-        self._save_metrics()
+        with self._lock:
+            m = self._metrics.setdefault(key, JobMetrics())
+            now = time.time()
+            m.last_run_at = now
+            m.last_success_at = now
+            m.rows_collected += rows
+            m.errors_count = 0
+            self._save_metrics()
         logger.debug('health: success %s %s rows=%d', exchange, pair, rows)
 
     def record_failure(self, exchange: str, pair: str) -> None:
@@ -175,14 +179,16 @@ class HealthMonitor:
 
         """
         key = self._key(exchange, pair)
-        m = self._metrics.setdefault(key, JobMetrics())
-        m.last_run_at = time.time()
-        m.errors_count += 1
-        self._save_metrics()
-        logger.warning('health: failure %s %s errors=%d', exchange, pair, m.errors_count)
+        with self._lock:
+            m = self._metrics.setdefault(key, JobMetrics())
+            m.last_run_at = time.time()
+            m.errors_count += 1
+            errors_count = m.errors_count
+            self._save_metrics()
+        logger.warning('health: failure %s %s errors=%d', exchange, pair, errors_count)
         if (self._alerts.webhook_url
-                and m.errors_count >= self._alerts.max_consecutive_errors):
-            self._send_alert(exchange, pair, m.errors_count)
+                and errors_count >= self._alerts.max_consecutive_errors):
+            self._send_alert(exchange, pair, errors_count)
 
     def get_metrics(self) -> dict[str, JobMetrics]:
         """ Return a snapshot of the current metrics dict.
@@ -193,7 +199,8 @@ class HealthMonitor:
             Keys are ``'{exchange}/{pair}'`` strings.
 
         """
-        return dict(self._metrics)
+        with self._lock:
+            return dict(self._metrics)
 
     # ------------------------------------------------------------------
     # Internal helpers
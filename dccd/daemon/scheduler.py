@@ -10,23 +10,33 @@ collection jobs defined in a :class:`~dccd.daemon.config.CollectorConfig`.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
+from dccd.histo_dl.async_client import AsyncDownloader
 from dccd.histo_dl.binance import FromBinance
 from dccd.histo_dl.bybit import FromBybit
 from dccd.histo_dl.coinbase import FromCoinbase
 from dccd.histo_dl.exchange import ImportDataCryptoCurrencies
 from dccd.histo_dl.kraken import FromKraken
 from dccd.histo_dl.okx import FromOKX
+from dccd.tools.http import close_async_sessions, configure_http
 
 if TYPE_CHECKING:
-    from dccd.daemon.config import CollectorConfig, HistoJob
+    from dccd.daemon.config import CollectorConfig, HistoJob, SchedulingConfig
     from dccd.daemon.health import HealthMonitor
 
-__all__ = ['build_histo_scheduler', 'run_histo_job', 'run_once']
+__all__ = [
+    'build_histo_scheduler', 'run_histo_batch', 'run_histo_job',
+    'run_histo_job_async', 'run_once', 'run_once_async',
+]
 
 logger = logging.getLogger(__name__)
 
@@ -74,13 +84,100 @@ def run_histo_job(job: HistoJob, pair: str, base_path: str,
         raise
 
 
+def run_histo_batch(job: HistoJob, base_path: str,
+                    health: HealthMonitor | None = None) -> None:
+    """ Download and save the candles of every pair of `job`, in turn.
+
+    The pairs share the connection pool and the rate limiter of the
+    exchange, one request at a time. A pair failure is logged and skipped —
+    the other pairs continue regardless.
+
+    Parameters
+    ----------
+    job : HistoJob
+        Job configuration (exchange, pairs, span, format, by_period).
+    base_path : str
+        Root directory for local storage (``CollectorConfig.storage.local_path``).
+    health : HealthMonitor or None, optional
+        Health monitor to record success/failure metrics of each pair.
+
+    """
+    for pair in job.pairs:
+        try:
+            run_histo_job(job, pair, base_path, health=health)
+        except Exception:
+            logger.exception('histo job failed: %s %s', job.exchange, pair)
+
+
+async def run_histo_job_async(job: HistoJob, pair: str, base_path: str,
+                              health: HealthMonitor | None = None) -> None:
+    """ Download and save one (exchange, pair) candle job on the event loop.
+
+    Asynchronous counterpart of :func:`run_histo_job`, the download runs on
+    the running loop with :class:`~dccd.histo_dl.async_client.AsyncDownloader`
+    and the files are written in a worker thread.
+
+    Parameters
+    ----------
+    job : HistoJob
+        Job configuration (exchange, span, format, by_period).
+    pair : str
+        Trading pair in ``'CRYPTO/FIAT'`` format (e.g. ``'BTC/USDT'``).
+    base_path : str
+        Root directory for local storage (``CollectorConfig.storage.local_path``).
+    health : HealthMonitor or None, optional
+        Health monitor to record success/failure metrics.
+
+    """
+    crypto, fiat = pair.split('/', 1)
+    cls = _HISTO_CLASSES[job.exchange]
+    try:
+        obj = cls(base_path, crypto, job.span, fiat, form=job.format)
+        await AsyncDownloader(obj).import_data('last', 'now')
+        await asyncio.to_thread(obj.save, form=job.format, by_period=job.by_period)
+        _data = getattr(obj, 'data', None)
+        rows = len(_data) if _data is not None else 0
+        logger.info('histo job done: %s %s span=%s', job.exchange, pair, job.span)
+        if health:
+            health.record_success(job.exchange, pair, rows)
+    except Exception:
+        if health:
+            health.record_failure(job.exchange, pair)
+        raise
+
+
+def _start_date(scheduling: SchedulingConfig, span: int,
+                offset: float) -> datetime | None:
+    """ First run time of a job of `span` seconds delayed by `offset`.
+
+    None lets APScheduler start the job one interval from now.
+
+    """
+    if scheduling.mode == 'aligned':
+        # Past start dates are stepped by the interval up to the next run
+        return datetime.fromtimestamp(scheduling.grace + offset, tz=timezone.utc)
+
+    if not offset:
+        return None
+
+    return datetime.now(timezone.utc) + timedelta(seconds=span + offset)
+
+
 def build_histo_scheduler(config: CollectorConfig,
                           health: HealthMonitor | None = None) -> BackgroundScheduler:
     """ Build an APScheduler BackgroundScheduler from a CollectorConfig.
 
     One interval job is registered per ``(exchange, pair)`` combination in
-    ``config.histo_jobs``.  Each job runs with ``coalesce=True`` and
-    ``max_instances=1`` to prevent overlapping executions.
+    ``config.histo_jobs``, or per histo job with ``config.scheduling.batch``
+    (see :func:`run_histo_batch`).  Each job runs with ``coalesce=True`` and
+    ``max_instances=1`` to prevent overlapping executions.  The connection
+    pools shared by the jobs of each exchange are set from ``config.http``.
+
+    The first run of each job is set by ``config.scheduling``: one interval
+    after the start (default) or just after each candle close (``'aligned'``
+    mode), plus an offset spreading the jobs of a same span evenly over a
+    fraction of it (``spread``). The offsets only depend on the order of the
+    jobs in the configuration.
 
     Parameters
     ----------
@@ -103,37 +200,91 @@ def build_histo_scheduler(config: CollectorConfig,
     >>> # scheduler.start()
 
     """
+    configure_http(**config.http.model_dump())
     scheduler = BackgroundScheduler()
+    scheduling = config.scheduling
+    base_path = config.storage.local_path
 
+    # (id, name, function, kwargs, span) of each scheduled job
+    entries: list[tuple[str, str, Callable[..., None], dict[str, Any], int]] = []
+    n_batches: dict[str, int] = {}
     for job in config.histo_jobs:
+        if scheduling.batch:
+            # Histo jobs of the same exchange and span are numbered
+            job_id = f'{job.exchange}_{job.span}'
+            n = n_batches[job_id] = n_batches.get(job_id, 0) + 1
+            entries.append((
+                job_id if n == 1 else f'{job_id}_{n}',
+                f'{job.exchange} {len(job.pairs)} pairs {job.span}s',
+                run_histo_batch,
+                {'job': job, 'base_path': base_path, 'health': health},
+                job.span,
+            ))
+            continue
+
         for pair in job.pairs:
-            job_id = f'{job.exchange}_{pair.replace("/", "_")}_{job.span}'
-            scheduler.add_job(
+            entries.append((
+                f'{job.exchange}_{pair.replace("/", "_")}_{job.span}',
+                f'{job.exchange} {pair} {job.span}s',
                 run_histo_job,
-                trigger='interval',
-                seconds=job.span,
-                kwargs={
-                    'job': job,
-                    'pair': pair,
-                    'base_path': config.storage.local_path,
-                    'health': health,
-                },
-                id=job_id,
-                name=f'{job.exchange} {pair} {job.span}s',
-                coalesce=True,
-                max_instances=1,
-            )
-            logger.debug('registered job %s', job_id)
+                {'job': job, 'pair': pair, 'base_path': base_path,
+                 'health': health},
+                job.span,
+            ))
+
+    n_by_span: dict[int, int] = {}
+    for *_, span in entries:
+        n_by_span[span] = n_by_span.get(span, 0) + 1
+
+    rank: dict[int, int] = {}
+    for job_id, name, func, kwargs, span in entries:
+        k = rank[span] = rank.get(span, -1) + 1
+        offset = k * scheduling.spread * span / n_by_span[span]
+        scheduler.add_job(
+            func,
+            trigger='interval',
+            seconds=span,
+            start_date=_start_date(scheduling, span, offset),
+            kwargs=kwargs,
+            id=job_id,
+            name=name,
+            coalesce=True,
+            max_instances=1,
+        )
+        logger.debug('registered job %s (offset %.1fs)', job_id, offset)
 
     return scheduler
 
 
+def _drain(jobs: deque[tuple[HistoJob, str]],
+           run: Callable[[HistoJob, str], None]) -> None:
+    """ Run the jobs of one exchange until its queue is empty. """
+    while True:
+        try:
+            job, pair = jobs.popleft()
+        except IndexError:
+
+            return
+
+        run(job, pair)
+
+
 def run_once(config: CollectorConfig,
-             health: HealthMonitor | None = None) -> None:
+             health: HealthMonitor | None = None,
+             workers: int = 1) -> None:
     """ Execute all histo_jobs once and return.
 
-    Each ``(exchange, pair)`` combination is run sequentially.  A job
-    failure is logged and skipped — other jobs continue regardless.
+    With the default single worker, the ``(exchange, pair)`` combinations
+    run sequentially in the order of the config. Otherwise the jobs of each
+    exchange are queued, and up to ``_max_concurrency`` threads of a pool of
+    ``workers`` (see
+    :class:`~dccd.histo_dl.exchange.ImportDataCryptoCurrencies`) drain the
+    queue of one exchange, the threads of the exchanges being started in
+    turn. A worker thus never waits for the cap of an exchange while the
+    jobs of another one are pending, and the requests of the jobs of an
+    exchange share its rate limiter, so the run lasts about as long as the
+    slowest exchange takes to serve its own jobs. A job failure is logged
+    and skipped — other jobs continue regardless.
 
     Parameters
     ----------
@@ -141,13 +292,86 @@ def run_once(config: CollectorConfig,
         Daemon configuration.
     health : HealthMonitor or None, optional
         Health monitor forwarded to each job call.
+    workers : int, optional
+        Maximum number of jobs running at once, default is 1.
 
     """
+    configure_http(**config.http.model_dump())
+
+    def _run(job: HistoJob, pair: str) -> None:
+        try:
+            run_histo_job(job, pair, config.storage.local_path, health=health)
+        except Exception:
+            logger.exception(
+                'histo job failed: %s %s', job.exchange, pair
+            )
+
+    if workers <= 1:
+        for job in config.histo_jobs:
+            for pair in job.pairs:
+                _run(job, pair)
+
+        return
+
+    queues: dict[str, deque[tuple[HistoJob, str]]] = {}
     for job in config.histo_jobs:
-        for pair in job.pairs:
+        queues.setdefault(job.exchange, deque()).extend(
+            (job, pair) for pair in job.pairs
+        )
+
+    lanes = {
+        exchange: min(_HISTO_CLASSES[exchange]._max_concurrency, len(jobs))
+        for exchange, jobs in queues.items()
+    }
+    with ThreadPoolExecutor(max_workers=workers,
+                            thread_name_prefix='histo') as pool:
+        # One thread of each exchange in turn, spread over all of them
+        for i in range(max(lanes.values(), default=0)):
+            for exchange, jobs in queues.items():
+                if i < lanes[exchange]:
+                    pool.submit(_drain, jobs, _run)
+
+
+async def run_once_async(config: CollectorConfig,
+                         health: HealthMonitor | None = None,
+                         max_jobs: int = 16) -> None:
+    """ Execute all histo_jobs once from a single event loop and return.
+
+    Up to ``max_jobs`` ``(exchange, pair)`` combinations are downloaded at
+    once, each exchange staying within its own rate limit and concurrency
+    cap.  A job failure is logged and skipped — other jobs continue
+    regardless.
+
+    Parameters
+    ----------
+    config : CollectorConfig
+        Daemon configuration.
+    health : HealthMonitor or None, optional
+        Health monitor forwarded to each job call.
+    max_jobs : int, optional
+        Maximum number of jobs running at once, default is 16.
+
+    Examples
+    --------
+    >>> # asyncio.run(run_once_async(load_config('config.yml')))
+
+    """
+    configure_http(**config.http.model_dump())
+    semaphore = asyncio.Semaphore(max_jobs)
+
+    async def _run(job: HistoJob, pair: str) -> None:
+        async with semaphore:
             try:
-                run_histo_job(job, pair, config.storage.local_path, health=health)
+                await run_histo_job_async(
+                    job, pair, config.storage.local_path, health=health
+                )
             except Exception:
                 logger.exception(
                     'histo job failed: %s %s', job.exchange, pair
                 )
+
+    try:
+        await asyncio.gather(*(_run(job, pair) for job in config.histo_jobs
+                               for pair in job.pairs))
+    finally:
+        await close_async_sessions()
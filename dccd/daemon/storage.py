@@ -4,20 +4,30 @@
 """ Remote storage abstraction for the dccd daemon.
 
 Wraps rclone to push local data directories to any rclone-supported
-destination (NAS, SFTP, S3, Google Drive, …).
+destination (NAS, SFTP, S3, Google Drive, …).  The remotes are pushed in
+parallel, either a whole directory (:meth:`RemoteStorage.push`) or only the
+files recorded in a :class:`~dccd.tools.journal.ChangeJournal`
+(:meth:`RemoteStorage.push_changes`), the files removed locally being then
+removed from the remotes.
 
 """
 
 from __future__ import annotations
 
+import contextlib
 import logging
+import os
 import pathlib
 import shutil
 import subprocess
+import tempfile
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from dccd.daemon.config import StorageConfig
+    from dccd.daemon.config import RemoteConfig, StorageConfig
+    from dccd.tools.journal import ChangeJournal
 
 __all__ = ['RemoteStorage']
 
@@ -100,19 +110,134 @@ class RemoteStorage:
             )
             return
 
-        for remote_cfg in self.config.remotes:
+        def _push(remote_cfg: RemoteConfig) -> None:
             root = remote_cfg.remote.rstrip('/')
             remote_target = root if str(rel) == '.' else f'{root}/{rel}'
+            self._copy([str(local_abs), remote_target])
 
+        self._each_remote(_push)
+
+    def push_changes(self, journal: ChangeJournal) -> None:
+        """ Copy the files changed since the last push to each remote.
+
+        The files recorded in `journal` after the watermark of a remote are
+        listed in a temporary file passed to ``rclone copy --files-from``,
+        so neither the local tree nor the remote one is walked.  The files
+        recorded but no longer on disk (e.g. parquet parts merged by a
+        compaction) are removed from the remote with ``rclone delete``.  A
+        remote never synced before gets a full copy of
+        ``config.local_path``, except its ``.dccd/`` directory. The watermark of a remote is moved forward
+        only if its copy and its deletions succeeded, a failed remote gets
+        the same files (and the new ones) next time.
+
+        Parameters
+        ----------
+        journal : ChangeJournal
+            Journal of the files written under ``config.local_path``.
+
+        Notes
+        -----
+        This method never raises, failures are logged as errors.
+
+        """
+        if not self.config.remotes:
+            return
+
+        if not self.check_rclone():
+            return
+
+        base_abs = pathlib.Path(self.config.local_path).resolve()
+
+        def _push(remote_cfg: RemoteConfig) -> None:
+            name = remote_cfg.remote
+            root = name.rstrip('/')
+            if journal.watermark(name) is None:
+                seq, _ = journal.changes(name)
+                # Without the journals and the metrics of the daemon
+                ok = self._copy(['--exclude', '/.dccd/**', str(base_abs), root])
+
+            else:
+                seq, changed = journal.changes(name)
+                files: list[str] = []
+                removed: list[str] = []
+                for f in changed:
+                    (files if (base_abs / f).is_file() else removed).append(f)
+
+                ok = not files or self._copy_files(base_abs, root, files)
+                if ok and removed:
+                    # e.g. merged parquet parts
+                    ok = self._delete_files(root, removed)
+
+            if ok:
+                journal.commit(name, seq)
+
+        self._each_remote(_push)
+
+    def _each_remote(self, push: Callable[[RemoteConfig], None]) -> None:
+        """ Run `push` for every remote, in parallel. """
+        remotes = self.config.remotes
+        with ThreadPoolExecutor(max_workers=len(remotes),
+                                thread_name_prefix='rclone') as pool:
+            for future in [pool.submit(push, r) for r in remotes]:
+                try:
+                    future.result()
+                except Exception:
+                    logger.exception('rclone push failed')
+
+    def _copy_files(self, base: pathlib.Path, root: str, files: list[str]) -> bool:
+        """ Copy `files`, relative to `base`, to the remote `root`. """
+        with _file_list(files) as list_path:
+            return self._copy([
+                '--files-from-raw', list_path, '--no-traverse', str(base), root,
+            ])
+
+    def _delete_files(self, root: str, files: list[str]) -> bool:
+        """ Delete `files`, relative to the remote `root`, True if it succeeded.
+        """
+        with _file_list(files) as list_path:
+            return self._rclone('delete', ['--files-from-raw', list_path, root],
+                                root)
+
+    def _copy(self, args: list[str]) -> bool:
+        """ Run ``rclone copy`` with `args`, True if it succeeded. """
+        return self._rclone('copy', args, f'{args[-2]} → {args[-1]}')
+
+    def _rclone(self, command: str, args: list[str], target: str) -> bool:
+        """ Run ``rclone <command>`` with `args`, True if it succeeded. """
+        try:
             result = subprocess.run(
-                ['rclone', 'copy', str(local_abs), remote_target],
+                ['rclone', command, *args],
                 capture_output=True,
                 text=True,
-                timeout=300,
+                timeout=self.config.sync_timeout,
             )
 
-            if result.returncode != 0:
-                logger.error(
-                    'rclone copy failed (%s → %s): %s',
-                    local_abs, remote_target, result.stderr.strip(),
-                )
+        except subprocess.TimeoutExpired:
+            logger.error('rclone %s timed out after %ds (%s)',
+                         command, self.config.sync_timeout, target)
+
+            return False
+
+        if result.returncode != 0:
+            logger.error(
+                'rclone %s failed (%s): %s',
+                command, target, result.stderr.strip(),
+            )
+
+            return False
+
+        return True
+
+
+@contextlib.contextmanager
+def _file_list(files: list[str]) -> Iterator[str]:
+    """ Write `files` in a temporary file, for ``--files-from-raw``. """
+    fd, list_path = tempfile.mkstemp(prefix='dccd-sync-', suffix='.txt')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write('\n'.join(files) + '\n')
+
+        yield list_path
+
+    finally:
+        os.remove(list_path)
@@ -3,18 +3,21 @@
 
 """ Real-time stream manager and periodic sync service for the dccd daemon.
 
-:class:`SyncService` runs a background thread that pushes the entire local
-data directory to all configured remotes at a fixed interval.
+:class:`SyncService` runs a background thread that pushes the files written
+under the local data directory since the last sync to all configured remotes
+at a fixed interval.
 
-:class:`StreamManager` starts one background thread per ``(exchange, pair)``
-combination (or per ``(exchange, pair, channel)`` for Bitfinex/Bitmex) and
-restarts them automatically on failure.
+:class:`StreamManager` runs one stream per ``(exchange, pair)`` combination
+(or per ``(exchange, pair, channel)`` for Bitfinex/Bitmex), either each in its
+own background thread or as tasks of a few shared event loops, and restarts
+them automatically on failure.
 
 """
 
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import logging
 import threading
 import time
@@ -31,6 +34,8 @@ from dccd.continuous_dl.okx import DownloadOKXData
 from dccd.daemon.storage import RemoteStorage
 from dccd.process_data import set_marketdepth, set_orders, set_trades
 from dccd.tools.io import IODataBase
+from dccd.tools.journal import ChangeJournal, get_journal, set_journal
+from dccd.tools.websocket import backoff_delay
 
 if TYPE_CHECKING:
     from dccd.daemon.config import CollectorConfig, StorageConfig, StreamJob
@@ -61,7 +66,9 @@ _PER_CHANNEL_EXCHANGES = frozenset({'bitfinex', 'bitmex'})
 _BITFINEX_CHANNEL: dict[str, str] = {'trades': 'trades', 'book': 'book'}
 _BITMEX_CHANNEL:   dict[str, str] = {'trades': 'trade',  'book': 'orderBookL2_25'}
 
-_RESTART_DELAY = 30  # seconds between stream restarts after a crash
+# Maximum seconds between stream restarts, the delay doubles (with jitter)
+# from 100 ms at each crash in a row
+_RESTART_DELAY = 30
 
 
 # ---------------------------------------------------------------------------
@@ -161,6 +168,11 @@ def _connect_kwargs(exchange: str, pair: str, channels: list[str]) -> dict[str,
     return {}
 
 
+def _stream_key(job: StreamJob, pair: str, channels: list[str]) -> str:
+    """ Name of the stream of *pair* and *channels* in *job*. """
+    return f'{job.exchange}_{pair.replace("/", "_")}_{"_".join(channels)}'
+
+
 def _iter_tasks(job: StreamJob) -> Iterator[tuple[str, list[str]]]:
     """ Yield ``(pair, channels)`` for each thread to create.
 
@@ -193,26 +205,42 @@ def _iter_tasks(job: StreamJob) -> Iterator[tuple[str, list[str]]]:
 # ---------------------------------------------------------------------------
 
 class SyncService:
-    """ Periodically push the entire local data directory to all remotes.
+    """ Periodically push the files changed locally to all remotes.
 
     This is the single point of truth for remote synchronisation.  Neither
     histo jobs nor stream threads push data themselves — they save locally
     and rely on this service to replicate to remote destinations.
 
+    Once started, the service installs a :class:`ChangeJournal` of
+    ``local_path`` (kept in ``{local_path}/.dccd/``) in which the savers
+    record each file they write. Each sync pushes only the files recorded
+    since the last successful push to a remote, all remotes in parallel,
+    see :meth:`RemoteStorage.push_changes`.
+
     Parameters
     ----------
     config : StorageConfig
         Storage configuration (``remotes`` list + ``sync_interval``).
 
+    Attributes
+    ----------
+    journal : ChangeJournal
+        Journal of the files written under ``config.local_path``.
+
     Notes
     -----
     If ``config.remotes`` is empty or ``config.sync_interval`` is 0, the
     service is a no-op and no background thread is started.
 
+    Files written by another process are not recorded, ``dccd run`` pushes
+    its own files with a journal of its own, otherwise use
+    ``sync_now(full=True)`` to push the whole directory.
+
     """
 
     def __init__(self, config: StorageConfig) -> None:
         self.config = config
+        self.journal = ChangeJournal(config.local_path)
         self._storage = RemoteStorage(config)
         self._stop = threading.Event()
         self._thread: threading.Thread | None = None
@@ -225,6 +253,7 @@ class SyncService:
                 len(self.config.remotes), self.config.sync_interval,
             )
             return
+        set_journal(self.journal)
         self._thread = threading.Thread(
             target=self._loop, daemon=True, name='sync-service',
         )
@@ -234,10 +263,25 @@ class SyncService:
     def stop(self) -> None:
         """ Signal the sync thread to stop at the next interval boundary. """
         self._stop.set()
+        if get_journal() is self.journal:
+            set_journal(None)
+
+        self.journal.close()
+
+    def sync_now(self, full: bool = False) -> None:
+        """ Push the changes to all remotes immediately (blocking).
 
-    def sync_now(self) -> None:
-        """ Push ``local_path`` to all remotes immediately (blocking). """
-        self._storage.push(self.config.local_path)
+        Parameters
+        ----------
+        full : bool, optional
+            If True, push the whole ``local_path`` instead of the files of
+            the journal. Default is False.
+
+        """
+        if full:
+            self._storage.push(self.config.local_path)
+        else:
+            self._storage.push_changes(self.journal)
 
     def _loop(self) -> None:
         while not self._stop.wait(timeout=self.config.sync_interval):
@@ -254,15 +298,19 @@ class SyncService:
 class StreamManager:
     """ Manage real-time WebSocket collection jobs.
 
-    Starts one background thread per ``(exchange, pair)`` (or per
-    ``(exchange, pair, channel)`` for Bitfinex/Bitmex).  Each thread
-    runs indefinitely and is automatically restarted after a crash.
-    A :class:`SyncService` instance pushes data to remotes periodically.
+    With the default ``'thread'`` layout of ``config.streaming``, starts one
+    background thread, with its own event loop, per ``(exchange, pair)`` (or
+    per ``(exchange, pair, channel)`` for Bitfinex/Bitmex). With the
+    ``'shared'`` layout, every stream is a task of one of
+    ``config.streaming.loops`` event loops, each running in one thread.
+    In both layouts each stream runs indefinitely and is restarted alone
+    after a crash. A :class:`SyncService` instance pushes data to remotes
+    periodically.
 
     Parameters
     ----------
     config : CollectorConfig
-        Daemon configuration (``stream_jobs`` + ``storage``).
+        Daemon configuration (``stream_jobs`` + ``storage`` + ``streaming``).
 
     """
 
@@ -272,16 +320,21 @@ class StreamManager:
         self._health = health
         self._threads:     dict[str, threading.Thread]     = {}
         self._downloaders: dict[str, ContinuousDownloader] = {}
+        self._loops:       list[asyncio.AbstractEventLoop] = []
+        self._tasks:       dict[str, concurrent.futures.Future] = {}
         self._stop_event = threading.Event()
         self._sync = SyncService(config.storage)
 
     def start(self) -> None:
-        """ Start the sync service and all stream threads. """
+        """ Start the sync service and all streams. """
         self._sync.start()
+        if self.config.streaming.layout == 'shared':
+            self._start_shared()
+            return
+
         for job in self.config.stream_jobs:
             for pair, channels in _iter_tasks(job):
-                ch_tag = '_'.join(channels)
-                key = f'{job.exchange}_{pair.replace("/", "_")}_{ch_tag}'
+                key = _stream_key(job, pair, channels)
                 t = threading.Thread(
                     target=self._run_forever,
                     args=(job, pair, channels),
@@ -292,6 +345,30 @@ class StreamManager:
                 t.start()
                 logger.info('stream started: %s %s channels=%s', job.exchange, pair, channels)
 
+    def _start_shared(self) -> None:
+        """ Start the event loop threads and spread the streams over them. """
+        for i in range(self.config.streaming.loops):
+            loop = asyncio.new_event_loop()
+            t = threading.Thread(
+                target=self._run_loop, args=(loop,),
+                name=f'stream-loop-{i}', daemon=True,
+            )
+            self._loops.append(loop)
+            self._threads[t.name] = t
+            t.start()
+
+        n = 0
+        for job in self.config.stream_jobs:
+            for pair, channels in _iter_tasks(job):
+                i = n % len(self._loops)
+                key = _stream_key(job, pair, channels)
+                self._tasks[key] = asyncio.run_coroutine_threadsafe(
+                    self._run_forever_async(job, pair, channels), self._loops[i],
+                )
+                n += 1
+                logger.info('stream started: %s %s channels=%s loop=%d',
+                            job.exchange, pair, channels, i)
+
     def stop(self) -> None:
         """ Signal all streams and the sync service to stop. """
         self._stop_event.set()
@@ -300,14 +377,19 @@ class StreamManager:
             dl.until = time.time()
             dl.is_connect = False
 
+        for loop in self._loops:
+            loop.call_soon_threadsafe(loop.stop)
+
     # ------------------------------------------------------------------
     # Thread body
     # ------------------------------------------------------------------
 
     def _run_forever(self, job: StreamJob, pair: str, channels: list[str]) -> None:
+        attempt = 0
         while not self._stop_event.is_set():
             try:
                 self._run_once(job, pair, channels)
+                attempt = 0
                 if self._health:
                     self._health.record_success(job.exchange, pair)
             except Exception:
@@ -315,9 +397,29 @@ class StreamManager:
                 if self._health:
                     self._health.record_failure(job.exchange, pair)
             if not self._stop_event.is_set():
-                self._stop_event.wait(timeout=_RESTART_DELAY)
+                self._stop_event.wait(
+                    timeout=backoff_delay(attempt, cap=_RESTART_DELAY)
+                )
+                attempt += 1
 
     def _run_once(self, job: StreamJob, pair: str, channels: list[str]) -> None:
+        key, downloader, saver = self._setup(job, pair, channels)
+        conn_kw = _connect_kwargs(job.exchange, pair, channels)
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(asyncio.gather(
+                downloader._connect(**conn_kw),
+                downloader._loop(),
+            ))
+        finally:
+            loop.close()
+            saver.close()
+            self._downloaders.pop(key, None)
+            logger.info('stream ended: %s %s', job.exchange, pair)
+
+    def _setup(self, job: StreamJob, pair: str, channels: list[str]) -> tuple[str, ContinuousDownloader, IODataBase]:
+        """ Build the downloader and the saver of a stream. """
         cls = _STREAM_CLASSES[job.exchange]
 
         # Bitfinex/Bitmex do not take pair in __init__; they receive it
@@ -337,8 +439,7 @@ class StreamManager:
                 until=0,
             )
 
-        ch_tag = '_'.join(channels)
-        key = f'{job.exchange}_{pair.replace("/", "_")}_{ch_tag}'
+        key = _stream_key(job, pair, channels)
         self._downloaders[key] = downloader
 
         xch = job.exchange.capitalize()
@@ -347,18 +448,62 @@ class StreamManager:
             f'/{xch}/Data/WS_Data/{job.time_step}s/{pair.replace("/", "_")}'
         )
 
+        saver = IODataBase(save_path, method='csv')
         downloader.set_process_data(_process_fn(channels))
-        downloader.set_saver(IODataBase(save_path, method='csv'))
+        downloader.set_saver(saver)
 
-        conn_kw = _connect_kwargs(job.exchange, pair, channels)
-        loop = asyncio.new_event_loop()
+        return key, downloader, saver
+
+    # ------------------------------------------------------------------
+    # Shared event loops
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        """ Run `loop` until :meth:`stop`, then let its streams clean up. """
         asyncio.set_event_loop(loop)
         try:
-            loop.run_until_complete(asyncio.gather(
-                downloader._connect(**conn_kw),
-                downloader._loop(),
-            ))
+            loop.run_forever()
         finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
             loop.close()
+
+    async def _run_forever_async(self, job: StreamJob, pair: str, channels: list[str]) -> None:
+        """ Task counterpart of :meth:`_run_forever` on a shared loop. """
+        attempt = 0
+        while not self._stop_event.is_set():
+            try:
+                await self._run_once_async(job, pair, channels)
+                attempt = 0
+                if self._health:
+                    self._health.record_success(job.exchange, pair)
+            except Exception:
+                logger.exception('stream crashed: %s %s', job.exchange, pair)
+                if self._health:
+                    self._health.record_failure(job.exchange, pair)
+            if not self._stop_event.is_set():
+                await asyncio.sleep(backoff_delay(attempt, cap=_RESTART_DELAY))
+                attempt += 1
+
+    async def _run_once_async(self, job: StreamJob, pair: str, channels: list[str]) -> None:
+        key, downloader, saver = self._setup(job, pair, channels)
+        # Writes to disk would stall every stream of the loop
+        downloader.save_in_thread = True
+        conn_kw = _connect_kwargs(job.exchange, pair, channels)
+        # A crash of this stream must not leave its other coroutine running
+        # on the shared loop
+        tasks = [asyncio.ensure_future(downloader._connect(**conn_kw)),
+                 asyncio.ensure_future(downloader._loop())]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            saver.close()
             self._downloaders.pop(key, None)
             logger.info('stream ended: %s %s', job.exchange, pair)
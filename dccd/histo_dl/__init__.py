@@ -40,15 +40,22 @@ All have the same methods and almost the same parameters:
 
 Method chaining is available for these classes.
 
+- AsyncDownloader(downloader):
+    Wraps any of these objects to ``await`` import_data, import_trades and
+    import_orderbook on an asyncio event loop (requires aiohttp).
+
 .. currentmodule:: dccd.histo_dl
 
 .. toctree::
    :maxdepth: 1
    :caption: Contents
 
+   histo_dl.async_client
    histo_dl.binance
    histo_dl.coinbase
+   histo_dl.cursor
    histo_dl.kraken
+   histo_dl.watermark
 
 """
 
@@ -57,7 +64,8 @@ Method chaining is available for these classes.
 # Third party packages
 
 # Local packages
-from . import binance, bybit, coinbase, exchange, kraken, okx
+from . import async_client, binance, bybit, coinbase, exchange, kraken, okx
+from .async_client import *
 from .binance import *
 from .bybit import *
 from .coinbase import *
@@ -65,6 +73,7 @@ from .kraken import *
 from .okx import *
 
 __all__ = ['exchange']
+__all__ += async_client.__all__
 __all__ += binance.__all__
 __all__ += bybit.__all__
 __all__ += coinbase.__all__
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+""" Asynchronous client to download historical data from REST API.
+
+.. currentmodule:: dccd.histo_dl.async_client
+
+.. autoclass:: AsyncDownloader
+   :members: import_data, import_trades, import_orderbook
+
+Notes
+-----
+The client drives the ``_iter_*`` request flows of any downloader (e.g.
+:class:`~dccd.histo_dl.binance.FromBinance`) on the running event loop, so the
+requests building and the parsing are the same as the blocking methods. It
+requires `aiohttp`, installed with ``pip install dccd[async]``. Reading
+the last saved date and the trade cursor files is done in a worker thread,
+so the event loop is not blocked by the disk.
+
+"""
+
+from __future__ import annotations
+
+# Import built-in packages
+import asyncio
+import time
+import weakref
+from typing import Any
+
+# Import third-party packages
+from tenacity import retry, retry_if_exception
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+# Import local packages
+from dccd.histo_dl.exchange import (
+    _RETRY_STOP,
+    _RETRY_WAIT,
+    ImportDataCryptoCurrencies,
+    RequestFlow,
+)
+from dccd.tools.http import get_async_session
+
+__all__ = ['AsyncDownloader']
+
+# One semaphore per exchange and per event loop, shared by every client.
+_SEMAPHORES: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]
+] = weakref.WeakKeyDictionary()
+
+
+def _should_retry(exc):
+    return (HAS_AIOHTTP and isinstance(exc, aiohttp.ClientResponseError)
+            and exc.status == 429)
+
+
+def _send(flow: RequestFlow, payload: Any) -> tuple[bool, Any]:
+    """ Send `payload` to `flow`, ``(True, result)`` once it returns.
+
+    StopIteration cannot be raised through a future, see
+    :func:`asyncio.to_thread`.
+
+    """
+    try:
+        return False, flow.send(payload)
+
+    except StopIteration as stop:
+
+        return True, stop.value
+
+
+def _backfill_semaphore(platform: str, size: int) -> asyncio.Semaphore:
+    """ Return the backfill semaphore of *platform* for the running loop. """
+    semaphores = _SEMAPHORES.setdefault(asyncio.get_running_loop(), {})
+    if platform not in semaphores:
+        semaphores[platform] = asyncio.Semaphore(size)
+
+    return semaphores[platform]
+
+
+class AsyncDownloader:
+    """ Awaitable variant of a historical data downloader.
+
+    Parameters
+    ----------
+    downloader : ImportDataCryptoCurrencies
+        Downloader of the exchange and pair, e.g. ``FromBinance(...)``. Data
+        are stored in it, so its ``save`` methods can be used afterwards.
+
+    Attributes
+    ----------
+    downloader : ImportDataCryptoCurrencies
+        Wrapped downloader.
+
+    Methods
+    -------
+    import_data
+    import_trades
+    import_orderbook
+
+    Examples
+    --------
+    >>> from dccd.histo_dl import FromBinance
+    >>> from dccd.tools.http import close_async_sessions
+    >>> async def main():
+    ...     dl = AsyncDownloader(FromBinance('/data', 'BTC', 3600, 'USDT'))
+    ...     (await dl.import_data(start='2024-01-01 00:00:00')).save('csv')
+    ...     await close_async_sessions()
+    >>> # asyncio.run(main())
+
+    """
+
+    def __init__(self, downloader: ImportDataCryptoCurrencies) -> None:
+        """ Initialize object. """
+        if not HAS_AIOHTTP:
+            raise ImportError(
+                "aiohttp is required for this class: pip install dccd[async]"
+            )
+
+        self.downloader = downloader
+
+    @retry(retry=retry_if_exception(_should_retry), wait=_RETRY_WAIT,
+           stop=_RETRY_STOP)
+    async def _fetch(self, url: str, params: dict[str, Any]) -> Any:
+        """ Fetch URL with automatic retry on HTTP 429 and decode the JSON.
+
+        The weight of each attempt is taken from the same rate limiter as
+        the blocking downloaders, and the request is sent over the shared
+        asynchronous session of the exchange.
+
+        """
+        dl = self.downloader
+        await dl._rate_limiter(url).acquire_async(dl._request_weight(url, params))
+        query = {k: str(v) for k, v in params.items() if v is not None}
+        async with get_async_session(dl.platform).get(url, params=query) as r:
+            if r.status == 429:
+                r.raise_for_status()
+
+            return await r.json(content_type=None)
+
+    async def _run(self, flow: RequestFlow, in_thread: bool = False) -> list[dict[str, Any]]:
+        """ Send the requests of `flow` with :meth:`_fetch` and parse them.
+
+        If `in_thread`, the answers are parsed in a worker thread, e.g. when
+        `flow` saves its pages to disk.
+
+        """
+        done, request = _send(flow, None)
+        while not done:
+            payload = await self._fetch(*request)
+            if in_thread:
+                done, request = await asyncio.to_thread(_send, flow, payload)
+            else:
+                done, request = _send(flow, payload)
+
+        return request
+
+    async def _backfill(self, start: int, end: int) -> list[dict[str, Any]]:
+        """ Download concurrently the windows of ``[start, end]``.
+
+        Asynchronous counterpart of
+        :meth:`~dccd.histo_dl.exchange.ImportDataCryptoCurrencies._backfill`,
+        bounded by the same per-exchange :attr:`_max_concurrency`.
+
+        """
+        dl = self.downloader
+        semaphore = _backfill_semaphore(dl.platform, dl._max_concurrency)
+
+        async def _fetch_window(window: tuple[int, int]) -> list[dict[str, Any]]:
+            async with semaphore:
+                return await self._run(dl._iter_window(*window))
+
+        tasks = [asyncio.ensure_future(_fetch_window(w))
+                 for w in dl._windows(start, end)]
+        try:
+            pages = await asyncio.gather(*tasks)
+        except BaseException:
+            # Don't spend the rate limit on a backfill already failed
+            for task in tasks:
+                task.cancel()
+
+            raise
+
+        return dl._stitch(pages)
+
+    async def import_data(self, start: int | str = 'last', end: int | str = 'now') -> ImportDataCryptoCurrencies:
+        """ Download OHLCV data for specific time interval.
+
+        Parameters
+        ----------
+        start : int or str
+            Timestamp of the first observation of you want as int or date
+            format 'yyyy-mm-dd hh:mm:ss' as string, or ``'last'``.
+        end : int or str
+            Timestamp of the last observation of you want as int or date
+            format 'yyyy-mm-dd hh:mm:ss' as string, or ``'now'``.
+
+        Returns
+        -------
+        ImportDataCryptoCurrencies
+            The wrapped downloader, with data sorted and cleaned.
+
+        """
+        dl = self.downloader
+        dl.start, dl.end = await asyncio.to_thread(dl._time_range, start, end)
+        data = await self._backfill(dl.start, dl.end)
+
+        return dl._sort_data(data)
+
+    async def import_trades(self, start: int | str = 0, end: int | str = 'now', resume: bool = True) -> ImportDataCryptoCurrencies:
+        """ Fetch individual trades for a time window.
+
+        Parameters
+        ----------
+        start, end : int or str, optional
+            Bounds of the time window, see
+            :meth:`~dccd.histo_dl.exchange.ImportDataCryptoCurrencies.import_trades`.
+        resume : bool, optional
+            Resume an interrupted download of the same window, default True.
+
+        Returns
+        -------
+        ImportDataCryptoCurrencies
+            The wrapped downloader, with trades in ``trades_df``.
+
+        """
+        dl = self.downloader
+        cursor = await asyncio.to_thread(dl._open_trades, start, end, resume)
+        t0 = time.monotonic()
+        try:
+            # Each page is appended to the cursor file, see _page_trades
+            data = await self._run(
+                dl._iter_trades(cursor.start, cursor.end, cursor.cursor),
+                in_thread=True,
+            )
+        finally:
+            dl._trades_cursor = None
+
+        return await asyncio.to_thread(
+            dl._close_trades, cursor, data, time.monotonic() - t0
+        )
+
+    async def import_orderbook(self, depth: int = 50) -> ImportDataCryptoCurrencies:
+        """ Fetch the current order book snapshot at a given depth.
+
+        Parameters
+        ----------
+        depth : int, optional
+            Number of price levels to fetch per side, default 50.
+
+        Returns
+        -------
+        ImportDataCryptoCurrencies
+            The wrapped downloader, with the book in ``orderbook_df``.
+
+        """
+        dl = self.downloader
+        data = await self._run(dl._iter_orderbook(depth))
+
+        return dl._sort_orderbook(data)
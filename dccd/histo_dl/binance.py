@@ -21,9 +21,10 @@ from __future__ import annotations
 # Import built-in packages
 import logging
 from typing import Any
+from urllib.parse import urlsplit
 
 # Import third-party packages
-from dccd.histo_dl.exchange import ImportDataCryptoCurrencies
+from dccd.histo_dl.exchange import ImportDataCryptoCurrencies, RequestFlow
 
 # Import local packages
 from dccd.tools.date_time import binance_interval
@@ -32,6 +33,15 @@ __all__ = ['FromBinance']
 
 _logger = logging.getLogger(__name__)
 
+# Request weight of the endpoints used, see Binance API documentation
+_WEIGHTS = {
+    '/api/v3/klines': 2,
+    '/api/v3/aggTrades': 4,
+}
+
+# Request weight of the depth endpoint as (max limit, weight)
+_DEPTH_WEIGHTS = [(100, 5), (500, 25), (1000, 50), (5000, 250)]
+
 
 class FromBinance(ImportDataCryptoCurrencies):
     """ Class to import crypto-currencies data from the Binance exchange.
@@ -89,6 +99,13 @@ class FromBinance(ImportDataCryptoCurrencies):
 
     """
 
+    _max_bars = 1000
+    _max_concurrency = 8
+    # Request weight per minute (IP limit), see `_request_weight`
+    _rate_limits = {'': (6000, 60.)}
+    # Maximum number of aggregate trades per page
+    _trades_limit = 1000
+
     @staticmethod
     def format_pair(crypto: str, fiat: str) -> str:
         """ Return the Binance pair symbol for *crypto* and *fiat*.
@@ -125,18 +142,31 @@ class FromBinance(ImportDataCryptoCurrencies):
         self.full_path = self.path + '/Binance/Data/Clean_Data/'
         self.full_path += self.per + '/' + self.crypto + self.fiat
 
+    def _request_weight(self, url: str, params: dict[str, Any]) -> float:
+        path = urlsplit(url).path
+        if path == '/api/v3/depth':
+            limit = params.get('limit', 100)
+
+            return next((w for n, w in _DEPTH_WEIGHTS if limit <= n), 250)
+
+        return _WEIGHTS.get(path, 1)
+
     def _import_data(self, start: int | str = 'last', end: int | str = 'now') -> list[dict[str, Any]]:
         self.start, self.end = self._set_time(start, end)
 
+        return self._backfill(self.start, self.end)
+
+    def _iter_window(self, start: int, end: int) -> RequestFlow:
         param = {
             'symbol': self.pair,
-            'startTime': self.start * 1000,
-            'endTime': self.end * 1000,
+            'startTime': start * 1000,
+            'endTime': end * 1000,
             'interval': binance_interval(self.span),
+            'limit': self._max_bars,
         }
 
-        r = self._fetch('https://api.binance.com/api/v3/klines', param)
-        text = r.json()
+        payload = yield ('https://api.binance.com/api/v3/klines', param)
+        text = payload
 
         data = [{
             'date': float(e[0] / 1000),
@@ -150,28 +180,56 @@ class FromBinance(ImportDataCryptoCurrencies):
 
         return data
 
-    def _import_trades(self, start: int, end: int) -> list[dict[str, Any]]:
-        param = {
-            'symbol': self.pair,
-            'startTime': start * 1000,
-            'endTime': end * 1000,
-            'limit': 1000,
-        }
-        r = self._fetch('https://api.binance.com/api/v3/aggTrades', param)
-        return [{
-            'tid': int(e['a']),
-            'timestamp': float(e['T']) / 1000,
-            'price': float(e['p']),
-            'amount': float(e['q']),
-            'type': 'sell' if e['m'] else 'buy',
-        } for e in r.json()]
-
-    def _import_orderbook(self, depth: int = 50) -> list[dict[str, Any]]:
-        r = self._fetch(
+    def _iter_trades(self, start: int, end: int, cursor: Any = None) -> RequestFlow:
+        """ Request aggregate trades page by page with the ``fromId`` cursor.
+
+        Until a first trade is found, the window is scanned hour by hour
+        (``startTime`` and ``endTime`` must be less than one hour apart),
+        then the pages follow each other by trade id.
+
+        """
+        url = 'https://api.binance.com/api/v3/aggTrades'
+        param = {'symbol': self.pair, 'limit': self._trades_limit}
+        if cursor is None and start == 0:
+            cursor = 0
+
+        data: list[dict[str, Any]] = []
+        while True:
+            if cursor is not None:
+                payload = yield url, {**param, 'fromId': cursor}
+            elif start <= end:
+                payload = yield url, {
+                    **param,
+                    'startTime': start * 1000,
+                    'endTime': min(start + 3600, end) * 1000 - 1,
+                }
+                start += 3600
+            else:
+                break
+
+            page = [{
+                'tid': int(e['a']),
+                'timestamp': float(e['T']) / 1000,
+                'price': float(e['p']),
+                'amount': float(e['q']),
+                'type': 'sell' if e['m'] else 'buy',
+            } for e in payload if e['T'] <= end * 1000]
+            from_id = cursor is not None
+            if payload:
+                cursor = int(payload[-1]['a']) + 1
+
+            data += self._page_trades(page, cursor)
+            if len(page) < len(payload) or (from_id and len(payload) < self._trades_limit):
+                break
+
+        return data
+
+    def _iter_orderbook(self, depth: int = 50) -> RequestFlow:
+        payload = yield (
             'https://api.binance.com/api/v3/depth',
             {'symbol': self.pair, 'limit': depth},
         )
-        book = r.json()
+        book = payload
         result = []
         for bid in book['bids']:
             result.append({'side': 'bid', 'price': bid[0], 'amount': float(bid[1]), 'count': None})
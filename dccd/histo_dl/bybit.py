@@ -18,7 +18,7 @@ from typing import Any
 
 # Import third-party packages
 # Import local packages
-from dccd.histo_dl.exchange import ImportDataCryptoCurrencies
+from dccd.histo_dl.exchange import ImportDataCryptoCurrencies, RequestFlow
 
 __all__ = ['FromBybit']
 
@@ -107,6 +107,11 @@ class FromBybit(ImportDataCryptoCurrencies):
 
     """
 
+    _max_bars = 200
+    _max_concurrency = 4
+    # Requests per 5 seconds (IP limit shared by every public endpoint)
+    _rate_limits = {'': (600, 5.)}
+
     @staticmethod
     def format_pair(crypto: str, fiat: str) -> str:
         """ Return the Bybit pair symbol for *crypto* and *fiat*.
@@ -136,17 +141,20 @@ class FromBybit(ImportDataCryptoCurrencies):
     def _import_data(self, start: int | str = 'last', end: int | str = 'now') -> list[dict[str, Any]]:
         self.start, self.end = self._set_time(start, end)
 
+        return self._backfill(self.start, self.end)
+
+    def _iter_window(self, start: int, end: int) -> RequestFlow:
         param = {
             'category': 'spot',
             'symbol': self.pair,
             'interval': bybit_interval(self.span),
-            'start': self.start * 1000,
-            'end': self.end * 1000,
-            'limit': 200,
+            'start': start * 1000,
+            'end': end * 1000,
+            'limit': self._max_bars,
         }
 
-        r = self._fetch('https://api.bybit.com/v5/market/kline', param)
-        text = r.json()['result']['list']
+        payload = yield ('https://api.bybit.com/v5/market/kline', param)
+        text = payload['result']['list']
         text.reverse()
 
         data = [{
@@ -161,7 +169,7 @@ class FromBybit(ImportDataCryptoCurrencies):
 
         return data
 
-    def _import_trades(self, start: int, end: int) -> list[dict[str, Any]]:
+    def _iter_trades(self, start: int, end: int, cursor: Any = None) -> RequestFlow:
         """ Fetch the most recent trades from Bybit (recent data only).
 
         Notes
@@ -171,7 +179,7 @@ class FromBybit(ImportDataCryptoCurrencies):
         via this endpoint.
 
         """
-        r = self._fetch(
+        payload = yield (
             'https://api.bybit.com/v5/market/recent-trade',
             {'category': 'spot', 'symbol': self.pair, 'limit': 1000},
         )
@@ -181,14 +189,14 @@ class FromBybit(ImportDataCryptoCurrencies):
             'price': float(e['price']),
             'amount': float(e['size']),
             'type': 'buy' if e['side'] == 'Buy' else 'sell',
-        } for e in r.json()['result']['list']]
+        } for e in payload['result']['list']]
 
-    def _import_orderbook(self, depth: int = 50) -> list[dict[str, Any]]:
-        r = self._fetch(
+    def _iter_orderbook(self, depth: int = 50) -> RequestFlow:
+        payload = yield (
             'https://api.bybit.com/v5/market/orderbook',
             {'category': 'spot', 'symbol': self.pair, 'limit': depth},
         )
-        book = r.json()['result']
+        book = payload['result']
         result = []
         for bid in book['b']:
             result.append({'side': 'bid', 'price': bid[0], 'amount': float(bid[1]), 'count': None})
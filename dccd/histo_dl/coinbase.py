@@ -23,7 +23,7 @@ from datetime import datetime, timezone
 from typing import Any
 
 # Import third party packages
-from dccd.histo_dl.exchange import ImportDataCryptoCurrencies
+from dccd.histo_dl.exchange import ImportDataCryptoCurrencies, RequestFlow
 
 # Import local packages
 from dccd.tools.date_time import TS_to_date
@@ -88,6 +88,11 @@ class FromCoinbase(ImportDataCryptoCurrencies):
 
     """
 
+    _max_bars = 300
+    _max_concurrency = 4
+    # Requests per second (public endpoints)
+    _rate_limits = {'': (10, 1.)}
+
     @staticmethod
     def format_pair(crypto: str, fiat: str) -> str:
         """ Return the Coinbase pair symbol for *crypto* and *fiat*.
@@ -118,18 +123,22 @@ class FromCoinbase(ImportDataCryptoCurrencies):
 
     def _import_data(self, start: int | str = 'last', end: int | str = 'now') -> list[dict[str, Any]]:
         self.start, self.end = self._set_time(start, end)
+
+        return self._backfill(self.start, self.end)
+
+    def _iter_window(self, start: int, end: int) -> RequestFlow:
         param = {
-            'start': TS_to_date(self.start - self.span),
-            'end': TS_to_date(self.end),
+            'start': TS_to_date(start, local=False),
+            'end': TS_to_date(end, local=False),
             'granularity': self.span,
         }
-        r = self._fetch(
+        payload = yield (
             'https://api.exchange.coinbase.com/products/{}/candles'.format(
                 self.pair
             ),
             param,
         )
-        text = r.json()
+        text = payload
         data = [{
             'date': float(e[0]),
             'open': float(e[3]),
@@ -142,7 +151,7 @@ class FromCoinbase(ImportDataCryptoCurrencies):
 
         return data
 
-    def _import_trades(self, start: int, end: int) -> list[dict[str, Any]]:
+    def _iter_trades(self, start: int, end: int, cursor: Any = None) -> RequestFlow:
         """ Fetch recent trades from Coinbase (recent data only).
 
         Notes
@@ -152,12 +161,12 @@ class FromCoinbase(ImportDataCryptoCurrencies):
         pagination.
 
         """
-        r = self._fetch(
+        payload = yield (
             f'https://api.exchange.coinbase.com/products/{self.pair}/trades',
             {'limit': 100},
         )
         result = []
-        for e in r.json():
+        for e in payload:
             ts = datetime.fromisoformat(
                 e['time'].replace('Z', '+00:00')
             ).replace(tzinfo=timezone.utc).timestamp()
@@ -170,12 +179,12 @@ class FromCoinbase(ImportDataCryptoCurrencies):
             })
         return result
 
-    def _import_orderbook(self, depth: int = 50) -> list[dict[str, Any]]:
-        r = self._fetch(
+    def _iter_orderbook(self, depth: int = 50) -> RequestFlow:
+        payload = yield (
             f'https://api.exchange.coinbase.com/products/{self.pair}/book',
             {'level': 2},
         )
-        book = r.json()
+        book = payload
         result = []
         for bid in book['bids']:
             result.append({'side': 'bid', 'price': bid[0], 'amount': float(bid[1]), 'count': int(bid[2]) if len(bid) > 2 else None})
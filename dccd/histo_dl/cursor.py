@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+""" Resumable state of a paginated trade download.
+
+.. currentmodule:: dccd.histo_dl.cursor
+
+.. autoclass:: TradeCursor
+   :members:
+
+"""
+
+from __future__ import annotations
+
+# Import built-in packages
+import json
+import os
+import pathlib
+from typing import Any
+
+# Import third-party packages
+import pandas as pd
+
+# Import local packages
+
+__all__ = ['TradeCursor']
+
+
+class TradeCursor:
+    """ Pages already downloaded and cursor of the next one, kept on disk.
+
+    Each page of trades is appended to a spool file, then the cursor of the
+    next page is written, so that an interrupted download restarts from the
+    last page saved instead of from `start`.
+
+    Parameters
+    ----------
+    path : str
+        Directory of the files, usually the ``trades_path`` of the
+        downloader.
+    pair : str
+        Pair symbol, used to name the files.
+
+    Attributes
+    ----------
+    start, end : int
+        Time window of the download.
+    cursor : object
+        Exchange cursor of the next page (trade id, timestamp...), None
+        before the first page.
+    count : int
+        Number of trades in the spool file.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> c = TradeCursor(tempfile.mkdtemp(), 'BTCUSD')
+    >>> c.reset(0, 10)
+    >>> c.append([{'tid': 1, 'timestamp': 1., 'price': 2., 'amount': 3.,
+    ...            'type': 'buy'}], cursor=2)
+    >>> c2 = TradeCursor(c.path, 'BTCUSD')
+    >>> c2.load(), c2.cursor, c2.count
+    (True, 2, 1)
+    >>> c2.clear()
+
+    """
+
+    def __init__(self, path: str, pair: str) -> None:
+        """ Initialize object. """
+        self.path = path
+        self.state_path = os.path.join(path, f'.trades_{pair}.cursor.json')
+        self.spool_path = os.path.join(path, f'.trades_{pair}.spool.csv')
+        self.start: int = 0
+        self.end: int = 0
+        self.cursor: Any = None
+        self.count: int = 0
+        self._size: int = 0
+
+    def load(self) -> bool:
+        """ Read the state of an interrupted download.
+
+        The spool file is truncated to its size at the last cursor saved,
+        dropping a page written without its cursor.
+
+        Returns
+        -------
+        bool
+            True if a state was found.
+
+        """
+        if not os.path.exists(self.state_path):
+
+            return False
+
+        with open(self.state_path) as f:
+            state = json.load(f)
+
+        self.start, self.end = state['start'], state['end']
+        self.cursor, self.count = state['cursor'], state['count']
+        self._size = state['size']
+
+        if os.path.exists(self.spool_path):
+            with open(self.spool_path, 'r+b') as f:
+                f.truncate(self._size)
+
+        return True
+
+    def reset(self, start: int, end: int) -> None:
+        """ Start a new download of ``[start, end]``, dropping any state. """
+        self.clear()
+        pathlib.Path(self.path).mkdir(parents=True, exist_ok=True)
+        self.start, self.end = start, end
+        self.cursor, self.count, self._size = None, 0, 0
+        self._write_state()
+
+    def append(self, trades: pd.DataFrame | list[dict[str, Any]], cursor: Any) -> None:
+        """ Save one page of trades and the cursor of the next page.
+
+        Parameters
+        ----------
+        trades : pd.DataFrame or list of dict
+            Validated trades of the page.
+        cursor : object
+            JSON serializable cursor of the next page.
+
+        """
+        if len(trades):
+            pd.DataFrame(trades).to_csv(self.spool_path, mode='a', index=False,
+                                        header=self._size == 0)
+            self._size = os.path.getsize(self.spool_path)
+
+        self.cursor = cursor
+        self.count += len(trades)
+        self._write_state()
+
+    def read(self) -> pd.DataFrame:
+        """ Read the trades of the spool file.
+
+        Returns
+        -------
+        pd.DataFrame
+            Trades saved so far, empty if none.
+
+        """
+        if not self._size:
+
+            return pd.DataFrame()
+
+        return pd.read_csv(self.spool_path, dtype={'tid': 'Int64', 'type': 'str'})
+
+    def clear(self) -> None:
+        """ Remove the spool and the state files. """
+        for path in (self.spool_path, self.state_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _write_state(self) -> None:
+        tmp = self.state_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'start': self.start, 'end': self.end,
+                       'cursor': self.cursor, 'count': self.count,
+                       'size': self._size}, f)
+
+        os.replace(tmp, self.state_path)
@@ -21,9 +21,13 @@ from __future__ import annotations
 import logging
 import os
 import pathlib
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
 
 # Import extern packages
 import pandas as pd
@@ -31,20 +35,53 @@ import requests
 from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 # Import local packages
-from dccd.models import OHLCBar, OrderBookEntry, Trade
+from dccd.histo_dl.cursor import TradeCursor
+from dccd.histo_dl.watermark import (
+    last_ts,
+    read_watermark,
+    truncate_csv,
+    write_watermark,
+)
 from dccd.tools.date_time import TS_to_date, date_to_TS, span_to_str, str_to_span
+from dccd.tools.http import get_session
+from dccd.tools.io import IODataBase, get_dataset
+from dccd.tools.journal import record_change
+from dccd.tools.rate_limit import TokenBucket, get_rate_limiter
+from dccd.validation import validate_ohlc, validate_orderbook, validate_trades
 
 if TYPE_CHECKING:
     import polars as pl
 
 __all__ = ['ImportDataCryptoCurrencies']
 
+# Requests of the ``_iter_*`` methods: each step yields ``(url, params)`` and
+# receives the decoded JSON answer, the return value is the parsed data.
+RequestFlow = Generator[tuple[str, dict[str, Any]], Any, list[dict[str, Any]]]
+
+# One semaphore per exchange, shared by every downloader instance of the
+# process, so that concurrent backfills never exceed the exchange cap.
+_BACKFILL_SEMAPHORES: dict[str, threading.BoundedSemaphore] = {}
+_BACKFILL_LOCK = threading.Lock()
+
+
+# Retry policy on HTTP 429, shared with the asynchronous client
+_RETRY_WAIT = wait_exponential(multiplier=1, min=1, max=60)
+_RETRY_STOP = stop_after_attempt(5)
+
 
 def _should_retry(exc):
     return (isinstance(exc, requests.HTTPError)
             and exc.response.status_code == 429)
 
 
+def _backfill_semaphore(platform: str, size: int) -> threading.BoundedSemaphore:
+    """ Return the process-wide backfill semaphore of *platform*. """
+    with _BACKFILL_LOCK:
+        if platform not in _BACKFILL_SEMAPHORES:
+            _BACKFILL_SEMAPHORES[platform] = threading.BoundedSemaphore(size)
+        return _BACKFILL_SEMAPHORES[platform]
+
+
 class ImportDataCryptoCurrencies(ABC):
     """ Base class to import data about crypto-currencies from some exchanges.
 
@@ -88,6 +125,12 @@ class ImportDataCryptoCurrencies(ABC):
         Format to save data.
     trades_df : pd.DataFrame
         Trades data after calling :meth:`import_trades`.
+    trades_per_sec : float
+        Throughput of the last :meth:`import_trades`.
+    strict : bool
+        If True, records are validated one by one with the Pydantic models of
+        :mod:`dccd.models` instead of the vectorized checks of
+        :mod:`dccd.validation`. Default is False.
     orderbook_df : pd.DataFrame
         Order book snapshot after calling :meth:`import_orderbook`.
 
@@ -103,9 +146,20 @@ class ImportDataCryptoCurrencies(ABC):
 
     """
 
+    # Maximum number of candles returned by one OHLC request, ``None`` when
+    # the OHLC endpoint cannot be paginated (see :meth:`_backfill`).
+    _max_bars: int | None = None
+    # Maximum number of OHLC requests in flight at once for this exchange.
+    _max_concurrency: int = 4
+    # Documented rate limits as ``{endpoint path: (capacity, period)}``, the
+    # empty path is the exchange-wide limit used for every other endpoint.
+    _rate_limits: dict[str, tuple[float, float]] = {'': (10, 1.)}
+    strict: bool = False
+
     def __init__(self, path: str, crypto: str, span: int | str, platform: str, fiat: str = 'EUR', form: str = 'xlsx') -> None:
         """ Initialize object. """
         self.logger = logging.getLogger(__name__)
+        self.platform = platform
         self.path = path
         self.crypto = crypto
         self.span, self.per = self._period(span)
@@ -115,29 +169,107 @@ class ImportDataCryptoCurrencies(ABC):
         self.full_path += str(self.per) + '/' + self.pair
         self.trades_path = self.path + '/' + platform + '/Data/Trades/' + self.pair
         self.orderbook_path = self.path + '/' + platform + '/Data/OrderBook/' + self.pair
-        self.last_df = pd.DataFrame()
         self.trades_df: pd.DataFrame = pd.DataFrame()
         self.orderbook_df: pd.DataFrame = pd.DataFrame()
+        self.trades_per_sec: float = 0.
+        self._trades_cursor: TradeCursor | None = None
         self.form = form
         self.start: int = 0
         self.end: int = 0
 
-    @retry(retry=retry_if_exception(_should_retry),
-           wait=wait_exponential(multiplier=1, min=1, max=60),
-           stop=stop_after_attempt(5))
+    @retry(retry=retry_if_exception(_should_retry), wait=_RETRY_WAIT,
+           stop=_RETRY_STOP)
     def _fetch(self, url: str, params: dict[str, Any]) -> requests.Response:
-        """ Fetch URL with automatic retry on HTTP 429. """
-        r = requests.get(url, params)
+        """ Fetch URL with automatic retry on HTTP 429.
+
+        Each attempt first takes its weight from the shared rate limiter of
+        the exchange, see :meth:`_rate_limiter`, then is sent over the
+        keep-alive connection pool of the exchange, see
+        :func:`dccd.tools.http.get_session`.
+
+        """
+        self._rate_limiter(url).acquire(self._request_weight(url, params))
+        r = get_session(self.platform).get(url, params=params)
         if r.status_code == 429:
             r.raise_for_status()
         return r
 
+    def _rate_limiter(self, url: str) -> TokenBucket:
+        """ Return the process-wide token bucket that rules `url`.
+
+        Endpoints listed in :attr:`_rate_limits` get their own bucket, keyed
+        by platform and path, all the others share the exchange-wide bucket.
+
+        Parameters
+        ----------
+        url : str
+            URL of the request.
+
+        Returns
+        -------
+        TokenBucket
+            Shared rate limiter.
+
+        """
+        path = urlsplit(url).path
+        if path in self._rate_limits:
+
+            return get_rate_limiter(
+                self.platform + ':' + path, *self._rate_limits[path]
+            )
+
+        return get_rate_limiter(self.platform, *self._rate_limits[''])
+
+    def _request_weight(self, url: str, params: dict[str, Any]) -> float:
+        """ Return the cost of a request against its rate limit.
+
+        Parameters
+        ----------
+        url : str
+            URL of the request.
+        params : dict
+            Query parameters of the request.
+
+        Returns
+        -------
+        float
+            Number of tokens taken by the request, 1 by default.
+
+        """
+        return 1.
+
+    def _run(self, flow: RequestFlow) -> list[dict[str, Any]]:
+        """ Send the requests of `flow` with :meth:`_fetch` and parse them.
+
+        Parameters
+        ----------
+        flow : generator
+            Requests returned by one of the ``_iter_*`` methods.
+
+        Returns
+        -------
+        list of dict
+            Data parsed by `flow`.
+
+        """
+        try:
+            url, params = next(flow)
+            while True:
+                url, params = flow.send(self._fetch(url, params).json())
+
+        except StopIteration as stop:
+
+            return stop.value
+
     def _get_last_date(self) -> int:
         """ Find the timestamp of the last imported observation.
 
-        Scans :attr:`full_path` for saved files and reads the last row of the
-        most-recent file.  Supports ``.xlsx``, ``.csv``, and ``.parquet``
-        formats.  Falls back to ``1325376000`` (2012-01-01 00:00:00 UTC) when
+        Reads the watermark written by :meth:`save` in :attr:`full_path`.
+        Without a valid watermark, reads the last timestamp of the
+        most-recent file: the footer statistics of a ``.parquet`` file, the
+        last line of a ``.csv`` file or the last row of a ``.xlsx`` file (see
+        :func:`~dccd.histo_dl.watermark.last_ts`), the data itself is not
+        loaded. Falls back to ``1325376000`` (2012-01-01 00:00:00 UTC) when
         the directory is empty or the file extension is not recognised.
 
         Returns
@@ -149,29 +281,25 @@ class ImportDataCryptoCurrencies(ABC):
         """
         pathlib.Path(self.full_path).mkdir(parents=True, exist_ok=True)
 
-        if not os.listdir(self.full_path):
+        mark = read_watermark(self.full_path)
+        if mark is not None:
+            return int(mark['last_ts'])
+
+        files = [f for f in os.listdir(self.full_path) if not f.startswith('.')]
+        if not files:
             return 1325376000
 
-        last_file = sorted(os.listdir(self.full_path), reverse=True)[0]
+        last_file = sorted(files, reverse=True)[0]
         ext = last_file.rsplit('.', 1)[-1]
-        full = os.path.join(self.full_path, last_file)
-
-        if ext == 'xlsx':
-            self.last_df = pd.read_excel(full)
-        elif ext == 'csv':
-            self.last_df = pd.read_csv(full)
-        elif ext == 'parquet':
-            self.last_df = pd.read_parquet(full)
-        else:
+        if ext not in ('xlsx', 'csv', 'parquet'):
             self.logger.warning(
                 'Unsupported file format %s. Starting at 2012-01-01.', ext
             )
             return 1325376000
 
-        if 'TS' in self.last_df.columns:
-            return int(self.last_df['TS'].iloc[-1])
+        ts = last_ts(os.path.join(self.full_path, last_file))
 
-        return int(self.last_df.index[-1])
+        return 1325376000 if ts is None else ts
 
     def _set_time(self, start: int | str, end: int | str) -> tuple[int, int]:
         """ Set the end and start in timestamp if is not yet.
@@ -204,6 +332,14 @@ class ImportDataCryptoCurrencies(ABC):
         return int((_start // self.span) * self.span), \
             int((_end // self.span) * self.span)
 
+    def _time_range(self, start: int | str, end: int | str) -> tuple[int, int]:
+        """ Return the OHLC interval to download, see :meth:`_set_time`.
+
+        Overridden by exchanges that restrict the interval, e.g. Kraken.
+
+        """
+        return self._set_time(start, end)
+
     def _set_by_period(self, TS: int) -> str:
         """ Convert a timestamp to a period label for grouping files.
 
@@ -241,11 +377,17 @@ class ImportDataCryptoCurrencies(ABC):
         """ Save data by period (default is year) in the corresponding format
         and file.
 
-        TODO : to finish
+        Only the files of the periods of the new candles are written: the
+        new candles are appended to a CSV file, or written as a new part of
+        a Parquet dataset (see :class:`~dccd.tools.io.ParquetDataset`), and
+        replace the candles downloaded again. An Excel file cannot be
+        appended and is written again. The last timestamp saved is written
+        in a ``.watermark.json`` file, read by the next
+        ``import_data('last')``.
 
         Parameters
         ----------
-        form : {'xlsx', 'csv'}
+        form : {'xlsx', 'csv', 'parquet'}
             Format to save data.
         by_period : {'Y', 'M', 'D'}
             - If 'Y' group data by year.
@@ -253,8 +395,7 @@ class ImportDataCryptoCurrencies(ABC):
             - If 'D' group data by day.
 
         """
-        df = (pd.concat([self.last_df, self.df], sort=True)
-              .drop_duplicates(subset='TS', keep='last')
+        df = (self.df.drop_duplicates(subset='TS', keep='last')
               .reset_index(drop=True)
               .drop('Date', axis=1)
               .reindex(columns=[
@@ -264,15 +405,81 @@ class ImportDataCryptoCurrencies(ABC):
         pathlib.Path(self.full_path).mkdir(parents=True, exist_ok=True)
         self.by_period = by_period
         grouped = df.set_index('TS', drop=False).groupby(self._set_by_period)
+        last = None
         for name, group in grouped:
+            fname = self._name_file(name) + '.' + form
+            path = self.full_path + '/' + fname
             if form == 'xlsx':
                 self._excel_format(name, form, group)
             elif form == 'csv':
-                group.to_csv(
-                    self.full_path + '/' + self._name_file(name) + '.' + form
-                )
+                self._csv_format(path, group)
+            elif form == 'parquet':
+                self._parquet_format(name, group)
             else:
                 self.logger.warning('Not allowing format')
+                continue
+
+            last = fname, int(group['TS'].iloc[-1])
+
+        if last is not None:
+            write_watermark(self.full_path, last[1], last[0])
+        return self
+
+    def _csv_format(self, path: str, group: pd.DataFrame) -> ImportDataCryptoCurrencies:
+        """ Append a grouped DataFrame slice to a CSV file.
+
+        The rows of the file from the first timestamp of `group` on, i.e.
+        the candles downloaded again, are replaced without reading the rest
+        of the file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the CSV file.
+        group : pd.DataFrame
+            Slice of data for the period of the file, sorted by ``'TS'``.
+
+        Returns
+        -------
+        ImportDataCryptoCurrencies
+            Returns ``self`` to allow method chaining.
+
+        """
+        if os.path.exists(path):
+            truncate_csv(path, group['TS'].iloc[0])
+            group.to_csv(path, mode='a', header=False)
+        else:
+            group.to_csv(path)
+        record_change(path)
+        return self
+
+    def _parquet_format(self, name: str, group: pd.DataFrame) -> ImportDataCryptoCurrencies:
+        """ Upsert a grouped DataFrame slice in a Parquet dataset.
+
+        The file of the period is a :class:`~dccd.tools.io.ParquetDataset`
+        directory: the candles downloaded again are removed from its last
+        part(s), then `group` is written as a new part. Requires pyarrow:
+        ``pip install dccd[io]``.
+
+        Parameters
+        ----------
+        name : str
+            Period label used to build the file name via :meth:`_name_file`.
+        group : pd.DataFrame
+            Slice of data for the period ``name``, sorted by ``'TS'``.
+
+        Returns
+        -------
+        ImportDataCryptoCurrencies
+            Returns ``self`` to allow method chaining.
+
+        """
+        saver = IODataBase(self.full_path, method='parquet')
+        get_dataset(saver.path + self._name_file(name) + '.parquet').truncate(
+            'TS', group['TS'].iloc[0]
+        )
+        saver(group.reset_index(drop=True), name=self._name_file(name),
+              index=False, dataset=True)
         return self
 
     def _excel_format(self, name: str, form: str, group: pd.DataFrame) -> ImportDataCryptoCurrencies:
@@ -295,19 +502,151 @@ class ImportDataCryptoCurrencies(ABC):
         """
         path = self.full_path + '/' + self._name_file(name) + '.' + form
         df_group = group.reset_index(drop=True)
+        if os.path.exists(path):
+            # An Excel file cannot be appended, it is written again
+            df_group = (pd.concat([pd.read_excel(path), df_group])
+                        .drop_duplicates(subset='TS', keep='last')
+                        .reset_index(drop=True))
         with pd.ExcelWriter(path, engine='openpyxl') as writer:
             df_group.to_excel(
                 writer, header=True, index=False, sheet_name='Sheet1'
             )
+        record_change(path)
         return self
 
+    def _windows(self, start: int, end: int) -> list[tuple[int, int]]:
+        """ Split ``[start, end]`` into windows of at most :attr:`_max_bars`.
+
+        Parameters
+        ----------
+        start, end : int
+            Timestamps of the first and the last candle to download, both
+            aligned on :attr:`span`.
+
+        Returns
+        -------
+        list of tuple
+            ``(first, last)`` candle timestamps of each window, in
+            chronological order.
+
+        """
+        if self._max_bars is None:
+            return [(start, end)]
+
+        step = self._max_bars * self.span
+
+        return [(t, min(t + step - self.span, end))
+                for t in range(start, end + 1, step)]
+
+    def _backfill(self, start: int, end: int) -> list[dict[str, Any]]:
+        """ Download all candles between ``start`` and ``end``.
+
+        The interval is split by :meth:`_windows` into requests the exchange
+        can serve, each window is fetched by :meth:`_import_window` in a
+        thread pool bounded by :attr:`_max_concurrency` (the cap is shared by
+        every instance of the same exchange), and the windows are stitched
+        back in chronological order.
+
+        Parameters
+        ----------
+        start, end : int
+            Timestamps of the first and the last candle to download.
+
+        Returns
+        -------
+        list of dict
+            Raw OHLCV records sorted by date, without duplicates.
+
+        """
+        windows = self._windows(start, end)
+        semaphore = _backfill_semaphore(self.platform, self._max_concurrency)
+
+        def _fetch_window(window: tuple[int, int]) -> list[dict[str, Any]]:
+            with semaphore:
+                return self._import_window(*window)
+
+        self.logger.debug('%s %s: %d window(s) from %d to %d', self.platform,
+                          self.pair, len(windows), start, end)
+
+        if len(windows) == 1:
+            pages = [_fetch_window(windows[0])]
+        else:
+            n_workers = min(len(windows), self._max_concurrency)
+            with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                futures = [pool.submit(_fetch_window, w) for w in windows]
+                try:
+                    pages = [f.result() for f in futures]
+                except BaseException:
+                    # Don't spend the rate limit on a backfill already failed
+                    for f in futures:
+                        f.cancel()
+
+                    raise
+
+        return self._stitch(pages)
+
+    @staticmethod
+    def _stitch(pages: list[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+        """ Merge downloaded windows, sorted by date and without duplicates.
+        """
+        data = {e['date']: e for page in pages for e in page}
+
+        return [data[k] for k in sorted(data)]
+
+    def _import_window(self, start: int, end: int) -> list[dict[str, Any]]:
+        """ Fetch the candles of one window.
+
+        Parameters
+        ----------
+        start, end : int
+            Timestamps of the first and the last candle of the window.
+
+        Returns
+        -------
+        list of dict
+            Raw OHLCV records, see :meth:`_import_data`.
+
+        """
+        return self._run(self._iter_window(start, end))
+
+    def _iter_window(self, start: int, end: int) -> RequestFlow:
+        """ Request and parse the candles of one window (override in
+        subclasses).
+
+        Each request is yielded as ``(url, params)`` and receives the decoded
+        JSON answer, so the same parsing serves :meth:`_run` and the
+        asynchronous client :class:`~dccd.histo_dl.async_client.AsyncDownloader`.
+
+        Parameters
+        ----------
+        start, end : int
+            Timestamps of the first and the last candle of the window.
+
+        Returns
+        -------
+        list of dict
+            Raw OHLCV records, see :meth:`_import_data`.
+
+        Raises
+        ------
+        NotImplementedError
+            If the subclass has not implemented this method.
+
+        """
+        raise NotImplementedError(
+            f'{type(self).__name__} does not implement _iter_window'
+        )
+
     def _sort_data(self, data: list[dict[str, Any]]) -> ImportDataCryptoCurrencies:
-        """ Validate, merge, and sort raw OHLCV data against :attr:`last_df`.
+        """ Validate and sort raw OHLCV data on the time grid of the period.
 
-        Validates each record through :class:`~dccd.models.OHLCBar`, builds a
-        complete timestamp grid from ``self.start`` to ``self.end``, outer-merges
-        with new data, forward-fills gaps, and stores the result in
-        :attr:`df`.
+        Validates the records with :func:`~dccd.validation.validate_ohlc`,
+        builds a complete timestamp grid from ``self.start`` to ``self.end``,
+        outer-merges with new data, forward-fills gaps, and stores the result
+        in :attr:`df`. The data already saved is not read: the download
+        resumes after the watermark of the last save (see
+        :meth:`_get_last_date`), and :meth:`save` replaces the candles
+        downloaded again.
 
         Parameters
         ----------
@@ -316,17 +655,18 @@ class ImportDataCryptoCurrencies(ABC):
             must contain at least the keys expected by
             :class:`~dccd.models.OHLCBar`.
 
+        Raises
+        ------
+        dccd.validation.DataValidationError
+            If some records are invalid, all of them are listed.
+
         Returns
         -------
         ImportDataCryptoCurrencies
             Returns ``self`` to allow method chaining.
 
         """
-        data = [OHLCBar(**d).model_dump(exclude_none=False) for d in data]
-        df = pd.DataFrame(
-            data,
-            index=range((self.end - self.start) // self.span + 1),
-        ).rename(columns={'date': 'TS'})
+        df = validate_ohlc(data, strict=self.strict).rename(columns={'date': 'TS'})
         TS = pd.DataFrame(
             list(range(self.start, self.end, self.span)),
             columns=['TS']
@@ -356,6 +696,12 @@ class ImportDataCryptoCurrencies(ABC):
         data : pd.DataFrame
             Data sorted and cleaned in a data frame.
 
+        Notes
+        -----
+        Exchanges with a paginated OHLC endpoint (Binance, Bybit, Coinbase,
+        OKX) split long intervals into several requests downloaded
+        concurrently, see :meth:`_backfill`.
+
         """
         data = self._import_data(start=start, end=end)
 
@@ -403,13 +749,13 @@ class ImportDataCryptoCurrencies(ABC):
     # ------------------------------------------------------------------
 
     def import_trades(
-        self, start: int | str = 0, end: int | str = 'now'
+        self, start: int | str = 0, end: int | str = 'now', resume: bool = True
     ) -> ImportDataCryptoCurrencies:
         """ Fetch individual trades for a time window.
 
-        Downloads executed trades from the exchange REST API, validates each
-        record, and stores the result in :attr:`trades_df`.  Use
-        :meth:`save_trades` to persist to disk.
+        Downloads executed trades from the exchange REST API page by page,
+        validates each page, and stores the result in :attr:`trades_df`.
+        Use :meth:`save_trades` to persist to disk.
 
         Parameters
         ----------
@@ -420,6 +766,10 @@ class ImportDataCryptoCurrencies(ABC):
         end : int or str, optional
             End of the time window.  ``'now'`` (default) resolves to the
             current UTC time.  Accepts a Unix timestamp or date string.
+        resume : bool, optional
+            If True (default), a download interrupted with the same `start`
+            (and the same `end`, unless ``'now'``) restarts from its last
+            page saved, see :class:`~dccd.histo_dl.cursor.TradeCursor`.
 
         Returns
         -------
@@ -430,14 +780,31 @@ class ImportDataCryptoCurrencies(ABC):
         -----
         Exchanges vary in how much history they expose:
 
-        - **Binance** and **Kraken** provide full paginated history.
-        - **OKX** exposes several months of history via cursor pagination.
+        - **Binance** (``fromId``) and **Kraken** (``since``) provide full
+          paginated history.
+        - **OKX** exposes several months of history via cursor pagination
+          (history-trades ``after``).
         - **Bybit** returns the ~1 000 most recent trades regardless of
           ``start``/``end``.
         - **Coinbase** returns up to 100 recent trades (cursor-based,
           no deep history).
 
+        The download throughput is logged and stored in
+        :attr:`trades_per_sec`.
+
         """
+        cursor = self._open_trades(start, end, resume)
+        t0 = time.monotonic()
+        try:
+            data = self._import_trades(cursor.start, cursor.end, cursor.cursor)
+        finally:
+            self._trades_cursor = None
+
+        return self._close_trades(cursor, data, time.monotonic() - t0)
+
+    @staticmethod
+    def _trades_range(start: int | str, end: int | str) -> tuple[int, int]:
+        """ Convert the bounds of :meth:`import_trades` to timestamps. """
         _start: int | float = date_to_TS(start) if isinstance(start, str) else start
         if end == 'now':
             _end: int | float = time.time()
@@ -445,11 +812,78 @@ class ImportDataCryptoCurrencies(ABC):
             _end = date_to_TS(end)
         else:
             _end = end
-        data = self._import_trades(int(_start), int(_end))
-        return self._sort_trades(data)
+        return int(_start), int(_end)
+
+    def _open_trades(self, start: int | str, end: int | str, resume: bool) -> TradeCursor:
+        """ Set up the on-disk cursor of a trade download.
+
+        Returns
+        -------
+        TradeCursor
+            Cursor of the download, restored from disk if `resume` and the
+            same window was interrupted.
+
+        """
+        _start, _end = self._trades_range(start, end)
+        cursor = TradeCursor(self.trades_path, self.pair)
+        if (resume and cursor.load() and cursor.start == _start
+                and (end == 'now' or cursor.end == _end)):
+            self.logger.info('%s %s: resume trades from cursor %s (%d saved)',
+                             self.platform, self.pair, cursor.cursor,
+                             cursor.count)
+        else:
+            cursor.reset(_start, _end)
+
+        self._trades_cursor = cursor
 
-    def _import_trades(self, start: int, end: int) -> list[dict[str, Any]]:
-        """ Fetch raw trades from the exchange (override in subclasses).
+        return cursor
+
+    def _close_trades(self, cursor: TradeCursor, data: list[dict[str, Any]], elapsed: float) -> ImportDataCryptoCurrencies:
+        """ Merge the pages of a finished trade download into
+        :attr:`trades_df` and remove its cursor.
+        """
+        n_saved = cursor.count
+        self._sort_trades(data, cursor.read())
+        cursor.clear()
+
+        n = len(data) + n_saved
+        self.trades_per_sec = n / elapsed if elapsed > 0 else float(n)
+        self.logger.info('%s %s: %d trades downloaded in %.1fs (%.0f trades/s)',
+                         self.platform, self.pair, n, elapsed,
+                         self.trades_per_sec)
+
+        return self
+
+    def _page_trades(self, page: list[dict[str, Any]], cursor: Any) -> list[dict[str, Any]]:
+        """ Hand over one page of trades and the cursor of the next page.
+
+        Within :meth:`import_trades` the page is validated and saved with its
+        cursor, so that the download can resume after it. Otherwise the page
+        is returned to be kept by the request flow.
+
+        Parameters
+        ----------
+        page : list of dict
+            Raw trade records of the page.
+        cursor : object
+            JSON serializable cursor of the next page.
+
+        Returns
+        -------
+        list of dict
+            Trades the request flow has to keep in memory.
+
+        """
+        if self._trades_cursor is None:
+
+            return page
+
+        self._trades_cursor.append(self._validate_trades(page), cursor)
+
+        return []
+
+    def _import_trades(self, start: int, end: int, cursor: Any = None) -> list[dict[str, Any]]:
+        """ Fetch raw trades from the exchange.
 
         Parameters
         ----------
@@ -457,6 +891,33 @@ class ImportDataCryptoCurrencies(ABC):
             Start Unix timestamp (seconds).
         end : int
             End Unix timestamp (seconds).
+        cursor : object, optional
+            Cursor of the first page to request, to resume a download.
+
+        Returns
+        -------
+        list of dict
+            Raw trade records, see :meth:`_iter_trades`.
+
+        """
+        return self._run(self._iter_trades(start, end, cursor))
+
+    def _iter_trades(self, start: int, end: int, cursor: Any = None) -> RequestFlow:
+        """ Request and parse raw trades (override in subclasses).
+
+        Each request is yielded as ``(url, params)`` and receives the decoded
+        JSON answer, so the same parsing serves :meth:`_run` and the
+        asynchronous client :class:`~dccd.histo_dl.async_client.AsyncDownloader`.
+        Paginated endpoints hand each page to :meth:`_page_trades`.
+
+        Parameters
+        ----------
+        start : int
+            Start Unix timestamp (seconds).
+        end : int
+            End Unix timestamp (seconds).
+        cursor : object, optional
+            Cursor of the first page to request, None to start at `start`.
 
         Returns
         -------
@@ -471,16 +932,25 @@ class ImportDataCryptoCurrencies(ABC):
 
         """
         raise NotImplementedError(
-            f'{type(self).__name__} does not implement _import_trades'
+            f'{type(self).__name__} does not implement _iter_trades'
         )
 
-    def _sort_trades(self, data: list[dict[str, Any]]) -> ImportDataCryptoCurrencies:
+    def _validate_trades(self, data: list[dict[str, Any]]) -> pd.DataFrame:
+        """ Validate raw trade records, see
+        :func:`~dccd.validation.validate_trades`.
+        """
+        return validate_trades(data, strict=self.strict)
+
+    def _sort_trades(self, data: list[dict[str, Any]], saved: pd.DataFrame | None = None) -> ImportDataCryptoCurrencies:
         """ Validate, sort, and deduplicate raw trade records.
 
         Parameters
         ----------
         data : list of dict
             Raw trade records as returned by :meth:`_import_trades`.
+        saved : pd.DataFrame, optional
+            Trades already validated, e.g. the pages saved by
+            :class:`~dccd.histo_dl.cursor.TradeCursor`.
 
         Returns
         -------
@@ -488,9 +958,12 @@ class ImportDataCryptoCurrencies(ABC):
             Returns ``self`` to allow method chaining.
 
         """
-        validated = [Trade(**d).model_dump() for d in data]
-        df = pd.DataFrame(validated).rename(columns={'timestamp': 'TS'})
-        df = df.sort_values('TS').reset_index(drop=True)
+        df = self._validate_trades(data)
+        if saved is not None and not saved.empty:
+            df = pd.concat([saved, df]) if not df.empty else saved
+
+        df = df.rename(columns={'timestamp': 'TS'})
+        df = df.sort_values('TS', kind='stable').reset_index(drop=True)
         if not df.empty and df['tid'].notna().any():
             df = df.drop_duplicates(subset='tid', keep='last').reset_index(drop=True)
         self.trades_df = df
@@ -535,6 +1008,7 @@ class ImportDataCryptoCurrencies(ABC):
                 group.to_parquet(fname, index=False)
             else:
                 group.to_csv(fname, index=False)
+            record_change(fname)
         return self
 
     # ------------------------------------------------------------------
@@ -569,7 +1043,27 @@ class ImportDataCryptoCurrencies(ABC):
         return self._sort_orderbook(data)
 
     def _import_orderbook(self, depth: int) -> list[dict[str, Any]]:
-        """ Fetch the raw order book from the exchange (override in subclasses).
+        """ Fetch the raw order book from the exchange.
+
+        Parameters
+        ----------
+        depth : int
+            Number of price levels per side.
+
+        Returns
+        -------
+        list of dict
+            Raw order book levels, see :meth:`_iter_orderbook`.
+
+        """
+        return self._run(self._iter_orderbook(depth))
+
+    def _iter_orderbook(self, depth: int) -> RequestFlow:
+        """ Request and parse the raw order book (override in subclasses).
+
+        Each request is yielded as ``(url, params)`` and receives the decoded
+        JSON answer, so the same parsing serves :meth:`_run` and the
+        asynchronous client :class:`~dccd.histo_dl.async_client.AsyncDownloader`.
 
         Parameters
         ----------
@@ -588,7 +1082,7 @@ class ImportDataCryptoCurrencies(ABC):
 
         """
         raise NotImplementedError(
-            f'{type(self).__name__} does not implement _import_orderbook'
+            f'{type(self).__name__} does not implement _iter_orderbook'
         )
 
     def _sort_orderbook(self, data: list[dict[str, Any]]) -> ImportDataCryptoCurrencies:
@@ -607,8 +1101,7 @@ class ImportDataCryptoCurrencies(ABC):
             Returns ``self`` to allow method chaining.
 
         """
-        validated = [OrderBookEntry(**d).model_dump() for d in data]
-        df = pd.DataFrame(validated)
+        df = validate_orderbook(data, strict=self.strict)
         df['_p'] = df['price'].astype(float)
         bids = df[df['side'] == 'bid'].sort_values('_p', ascending=False)
         asks = df[df['side'] == 'ask'].sort_values('_p', ascending=True)
@@ -644,6 +1137,7 @@ class ImportDataCryptoCurrencies(ABC):
             self.orderbook_df.to_parquet(fname, index=False)
         else:
             self.orderbook_df.to_csv(fname, index=False)
+        record_change(fname)
         return self
 
     # ------------------------------------------------------------------
@@ -25,7 +25,7 @@ from typing import Any
 
 # Import third party packages
 # Import local packages
-from dccd.histo_dl.exchange import ImportDataCryptoCurrencies
+from dccd.histo_dl.exchange import ImportDataCryptoCurrencies, RequestFlow
 
 __all__ = ['FromKraken']
 
@@ -85,6 +85,11 @@ class FromKraken(ImportDataCryptoCurrencies):
 
     """
 
+    # Public endpoints stay within limits at one call per second
+    _rate_limits = {'': (1, 1.)}
+    # Maximum number of trades per page
+    _trades_limit = 1000
+
     @staticmethod
     def format_pair(crypto: str, fiat: str) -> str:
         """ Return the Kraken pair symbol for *crypto* and *fiat*.
@@ -126,26 +131,36 @@ class FromKraken(ImportDataCryptoCurrencies):
         )
         self.pair = self.format_pair(crypto, fiat)
 
-    def _import_data(
-        self, start: int | str = 'last', end: int | str | None = None
-    ) -> list[dict[str, Any]]:
-        if end is not None:
+    def _time_range(
+        self, start: int | str, end: int | str | None
+    ) -> tuple[int, int]:
+        if end not in (None, 'now'):
             warnings.warn(
                 "The Kraken OHLC API does not support an end date — the 'end' "
                 "parameter is ignored and data is always fetched up to now.",
                 UserWarning,
                 stacklevel=2,
             )
-        self.start, self.end = self._set_time(start, int(time.time()))
 
+        return self._set_time(start, int(time.time()))
+
+    def _import_data(
+        self, start: int | str = 'last', end: int | str | None = None
+    ) -> list[dict[str, Any]]:
+        self.start, self.end = self._time_range(start, end)
+
+        return self._backfill(self.start, self.end)
+
+    def _iter_window(self, start: int, end: int) -> RequestFlow:
+        # Kraken always answers up to now, whatever the end of the window
         param = {
             'pair': self.pair,
             'interval': int(self.span / 60),
-            'since': self.start - self.span
+            'since': start - self.span
         }
 
-        r = self._fetch('https://api.kraken.com/0/public/OHLC', param)
-        text = r.json()['result'][self.pair]
+        payload = yield ('https://api.kraken.com/0/public/OHLC', param)
+        text = payload['result'][self.pair]
 
         data = [{
             'date': float(e[0]),
@@ -160,26 +175,46 @@ class FromKraken(ImportDataCryptoCurrencies):
 
         return data
 
-    def _import_trades(self, start: int, end: int) -> list[dict[str, Any]]:
-        r = self._fetch(
-            'https://api.kraken.com/0/public/Trades',
-            {'pair': self.pair, 'since': start},
-        )
-        trades = r.json()['result'][self.pair]
-        return [{
-            'tid': None,
-            'timestamp': float(e[2]),
-            'price': float(e[0]),
-            'amount': float(e[1]),
-            'type': 'buy' if e[3] == 'b' else 'sell',
-        } for e in trades if float(e[2]) <= end]
-
-    def _import_orderbook(self, depth: int = 50) -> list[dict[str, Any]]:
-        r = self._fetch(
+    def _iter_trades(self, start: int, end: int, cursor: Any = None) -> RequestFlow:
+        """ Request trades page by page with the ``since`` cursor.
+
+        The ``last`` id returned with each page is the ``since`` of the next
+        one, the download stops at the first trade after `end` or when the
+        present is reached.
+
+        """
+        since = start if cursor is None else cursor
+        data: list[dict[str, Any]] = []
+        while True:
+            payload = yield (
+                'https://api.kraken.com/0/public/Trades',
+                {'pair': self.pair, 'since': since, 'count': self._trades_limit},
+            )
+            result = payload['result']
+            trades = result[self.pair]
+            page = [{
+                'tid': None,
+                'timestamp': float(e[2]),
+                'price': float(e[0]),
+                'amount': float(e[1]),
+                'type': 'buy' if e[3] == 'b' else 'sell',
+            } for e in trades if float(e[2]) <= end]
+            last = str(result['last'])
+            data += self._page_trades(page, last)
+            if (len(page) < len(trades) or len(trades) < self._trades_limit
+                    or last == str(since)):
+                break
+
+            since = last
+
+        return data
+
+    def _iter_orderbook(self, depth: int = 50) -> RequestFlow:
+        payload = yield (
             'https://api.kraken.com/0/public/Depth',
             {'pair': self.pair, 'count': depth},
         )
-        book = r.json()['result'][self.pair]
+        book = payload['result'][self.pair]
         result = []
         for bid in book['bids']:
             result.append({'side': 'bid', 'price': str(bid[0]), 'amount': float(bid[1]), 'count': None})
@@ -199,8 +234,8 @@ class FromKraken(ImportDataCryptoCurrencies):
             date string ``'yyyy-mm-dd hh:mm:ss'``.
         end : int, str or None
             Ignored. The Kraken OHLC API does not support a custom end date
-            and always returns data up to the current time. Passing a non-None
-            value raises a :class:`UserWarning`.
+            and always returns data up to the current time. Passing a value
+            other than None or ``'now'`` raises a :class:`UserWarning`.
 
         Returns
         -------
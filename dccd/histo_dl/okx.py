@@ -14,11 +14,12 @@
 from __future__ import annotations
 
 # Import built-in packages
+import time
 from typing import Any
 
 # Import third-party packages
 # Import local packages
-from dccd.histo_dl.exchange import ImportDataCryptoCurrencies
+from dccd.histo_dl.exchange import ImportDataCryptoCurrencies, RequestFlow
 
 __all__ = ['FromOKX']
 
@@ -80,7 +81,9 @@ class FromOKX(ImportDataCryptoCurrencies):
 
     Notes
     -----
-    Uses the OKX v5 REST API [1]_.
+    Uses the OKX v5 REST API [1]_. The candles endpoint only serves the
+    latest 1440 candles, older windows are requested to the history-candles
+    endpoint by pages of 100 candles.
 
     References
     ----------
@@ -107,6 +110,23 @@ class FromOKX(ImportDataCryptoCurrencies):
 
     """
 
+    _max_bars = 300
+    _max_concurrency = 4
+    # Candles served by /market/candles, older ones by /market/history-candles
+    _recent_bars = 1440
+    _history_bars = 100
+    # Requests per 2 seconds and per endpoint (IP limit)
+    _rate_limits = {
+        '': (20, 2.),
+        '/api/v5/market/candles': (40, 2.),
+        '/api/v5/market/history-candles': (20, 2.),
+        '/api/v5/market/trades': (100, 2.),
+        '/api/v5/market/history-trades': (20, 2.),
+        '/api/v5/market/books': (40, 2.),
+    }
+    # Maximum number of trades per history-trades page
+    _trades_limit = 100
+
     @staticmethod
     def format_pair(crypto: str, fiat: str) -> str:
         """ Return the OKX pair symbol for *crypto* and *fiat*.
@@ -136,16 +156,53 @@ class FromOKX(ImportDataCryptoCurrencies):
     def _import_data(self, start: int | str = 'last', end: int | str = 'now') -> list[dict[str, Any]]:
         self.start, self.end = self._set_time(start, end)
 
+        return self._backfill(self.start, self.end)
+
+    def _recent_start(self, margin: int = 0) -> int:
+        """ Timestamp of the oldest candle served by the candles endpoint,
+        `margin` candles later.
+        """
+        now = int(time.time()) // self.span * self.span
+
+        return now - (self._recent_bars - 1 - margin) * self.span
+
+    def _windows(self, start: int, end: int) -> list[tuple[int, int]]:
+        """ Split ``[start, end]`` into windows of :attr:`_history_bars`
+        candles before the reach of the candles endpoint, of
+        :attr:`_max_bars` candles after.
+
+        The split keeps a margin of :attr:`_max_bars` candles, so a recent
+        window is still in reach when it is requested.
+
+        """
+        cut = min(max(start, self._recent_start(self._max_bars)), end + self.span)
+        step = self._history_bars * self.span
+        windows = [(t, min(t + step - self.span, cut - self.span))
+                   for t in range(start, cut, step)]
+        if cut <= end:
+            windows += super()._windows(cut, end)
+
+        return windows
+
+    def _iter_window(self, start: int, end: int) -> RequestFlow:
+        if start < self._recent_start():
+            url = 'https://www.okx.com/api/v5/market/history-candles'
+            limit = self._history_bars
+        else:
+            url = 'https://www.okx.com/api/v5/market/candles'
+            limit = self._max_bars
+
+        # `before` and `after` are exclusive bounds on the candle timestamp
         param = {
             'instId': self.pair,
             'bar': okx_interval(self.span),
-            'before': self.start * 1000,
-            'after': self.end * 1000,
-            'limit': 300,
+            'before': start * 1000 - 1,
+            'after': end * 1000 + 1,
+            'limit': limit,
         }
 
-        r = self._fetch('https://www.okx.com/api/v5/market/candles', param)
-        text = r.json()['data']
+        payload = yield (url, param)
+        text = payload['data']
         text.reverse()
 
         data = [{
@@ -160,25 +217,48 @@ class FromOKX(ImportDataCryptoCurrencies):
 
         return data
 
-    def _import_trades(self, start: int, end: int) -> list[dict[str, Any]]:
-        r = self._fetch(
-            'https://www.okx.com/api/v5/market/trades',
-            {'instId': self.pair, 'limit': 500},
-        )
-        return [{
-            'tid': int(e['tradeId']),
-            'timestamp': float(e['ts']) / 1000,
-            'price': float(e['px']),
-            'amount': float(e['sz']),
-            'type': e['side'],
-        } for e in r.json()['data']]
-
-    def _import_orderbook(self, depth: int = 50) -> list[dict[str, Any]]:
-        r = self._fetch(
+    def _iter_trades(self, start: int, end: int, cursor: Any = None) -> RequestFlow:
+        """ Request trades page by page with the history-trades ``after``
+        cursor.
+
+        Pages go backward in time: the first one ends at `end` (pagination by
+        timestamp), the next ones start before the oldest trade id of the
+        previous page, until a trade older than `start` is reached.
+
+        """
+        url = 'https://www.okx.com/api/v5/market/history-trades'
+        param = {'instId': self.pair, 'limit': self._trades_limit}
+        data: list[dict[str, Any]] = []
+        while True:
+            if cursor is None:
+                payload = yield url, {**param, 'type': 2, 'after': (end + 1) * 1000}
+            else:
+                payload = yield url, {**param, 'type': 1, 'after': cursor}
+
+            rows = payload['data']
+            page = [{
+                'tid': int(e['tradeId']),
+                'timestamp': float(e['ts']) / 1000,
+                'price': float(e['px']),
+                'amount': float(e['sz']),
+                'type': e['side'],
+            } for e in rows if start <= float(e['ts']) / 1000 <= end]
+            if rows:
+                cursor = rows[-1]['tradeId']
+
+            data += self._page_trades(page, cursor)
+            if (len(rows) < self._trades_limit
+                    or float(rows[-1]['ts']) / 1000 < start):
+                break
+
+        return data
+
+    def _iter_orderbook(self, depth: int = 50) -> RequestFlow:
+        payload = yield (
             'https://www.okx.com/api/v5/market/books',
             {'instId': self.pair, 'sz': depth},
         )
-        book = r.json()['data'][0]
+        book = payload['data'][0]
         result = []
         for bid in book['bids']:
             count = int(bid[3]) if bid[3] else None
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+""" Last timestamp of a saved OHLC dataset, read without loading the data.
+
+.. currentmodule:: dccd.histo_dl.watermark
+
+.. autofunction:: read_watermark
+.. autofunction:: write_watermark
+.. autofunction:: last_ts
+.. autofunction:: truncate_csv
+
+Notes
+-----
+:meth:`ImportDataCryptoCurrencies.save` writes a ``.watermark.json``
+sidecar next to the files, with the last timestamp saved and the size and
+modification time of the file holding it. Resuming reads this sidecar, or
+if it is missing or stale, the footer statistics of a Parquet file or the
+last line of a CSV file. New candles are appended to a CSV file after
+removing its rows downloaded again, see :func:`truncate_csv`.
+
+"""
+
+from __future__ import annotations
+
+# Import built-in packages
+import csv
+import json
+import os
+from typing import Any
+
+# Import third-party packages
+from openpyxl import load_workbook
+
+try:
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Import local packages
+
+__all__ = ['last_ts', 'read_watermark', 'truncate_csv', 'write_watermark']
+
+WATERMARK = '.watermark.json'
+_BLOCK = 2 ** 16
+
+
+def read_watermark(directory: str) -> dict[str, Any] | None:
+    """ Read the watermark of the dataset saved in `directory`.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the files of the dataset.
+
+    Returns
+    -------
+    dict or None
+        ``{'last_ts': int, 'file': str, 'size': int, 'mtime_ns': int}``,
+        None if there is no watermark or if the file it refers to was
+        modified since.
+
+    """
+    try:
+        with open(os.path.join(directory, WATERMARK)) as f:
+            mark = json.load(f)
+
+        st = os.stat(os.path.join(directory, mark['file']))
+
+    except (OSError, ValueError, KeyError):
+
+        return None
+
+    if (st.st_size, st.st_mtime_ns) != (mark.get('size'), mark.get('mtime_ns')):
+
+        return None
+
+    return mark
+
+
+def write_watermark(directory: str, last_ts: int, file: str) -> None:
+    """ Save `last_ts`, the last timestamp of `file`, as watermark.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the files of the dataset.
+    last_ts : int
+        Last timestamp saved.
+    file : str
+        Name of the file holding `last_ts`, in `directory`.
+
+    """
+    st = os.stat(os.path.join(directory, file))
+    mark = {'last_ts': int(last_ts), 'file': file, 'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns}
+    tmp = os.path.join(directory, WATERMARK + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(mark, f)
+
+    os.replace(tmp, os.path.join(directory, WATERMARK))
+
+
+def _csv_column(path: str, column: str) -> int:
+    """ Position of `column` in the header of a CSV file, 0 if absent. """
+    with open(path, newline='') as f:
+        header = next(csv.reader(f), [])
+
+    return header.index(column) if column in header else 0
+
+
+def _reversed_lines(f: Any) -> Any:
+    """ Yield ``(offset, line)`` of a binary file from its end. """
+    end = f.seek(0, os.SEEK_END)
+    tail = b''
+    while end > 0:
+        start = max(0, end - _BLOCK)
+        f.seek(start)
+        block = f.read(end - start) + tail
+        lines = block.split(b'\n')
+        # The first piece may be cut, unless at the start of the file
+        tail = lines.pop(0) if start else b''
+        offset = start + len(tail) + (1 if start else 0)
+        offsets = []
+        for line in lines:
+            offsets.append(offset)
+            offset += len(line) + 1
+
+        for offset, line in zip(reversed(offsets), reversed(lines)):
+            if line.strip():
+                yield offset, line
+
+        end = start
+
+
+def _ts(line: bytes, i: int) -> float | None:
+    try:
+        return float(next(csv.reader([line.decode()]))[i])
+
+    except (ValueError, IndexError, StopIteration):
+        # e.g. the header
+
+        return None
+
+
+def last_ts(path: str, column: str = 'TS') -> int | None:
+    """ Read the last timestamp of a CSV, Parquet or Excel file.
+
+    Only the end of a CSV file and the footer of a Parquet file (or the
+    ``_metadata`` file of a Parquet dataset directory) are read, an Excel
+    file is streamed row by row.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+    column : str, optional
+        Column of the timestamps, the first column (e.g. the index) if not
+        in the file. Default is 'TS'.
+
+    Returns
+    -------
+    int or None
+        Timestamp of the last row, None if the file has no row.
+
+    Raises
+    ------
+    ValueError
+        If the extension of `path` is not supported.
+
+    """
+    ext = path.rsplit('.', 1)[-1]
+    if ext == 'csv':
+        i = _csv_column(path, column)
+        with open(path, 'rb') as f:
+            for _, line in _reversed_lines(f):
+                ts = _ts(line, i)
+                if ts is not None:
+
+                    return int(ts)
+
+        return None
+
+    if ext == 'parquet':
+        if not HAS_PYARROW:
+            raise ImportError(
+                "pyarrow is required to read Parquet files: pip install dccd[io]"
+            )
+
+        if os.path.isdir(path):
+            # Dataset of part files, see dccd.tools.io.ParquetDataset
+            path = os.path.join(path, '_metadata')
+            if not os.path.exists(path):
+
+                return None
+
+        md = pq.read_metadata(path)
+        names = md.schema.to_arrow_schema().names
+        j = names.index(column) if column in names else 0
+        stats = [md.row_group(k).column(j).statistics
+                 for k in range(md.num_row_groups)]
+        stats = [s for s in stats if s is not None and s.has_min_max]
+        if len(stats) == md.num_row_groups:
+
+            return int(max(s.max for s in stats)) if stats else None
+
+        values = pq.read_table(path, columns=[names[j]]).column(0)
+
+        return int(values[-1].as_py()) if len(values) else None
+
+    if ext == 'xlsx':
+        wb = load_workbook(path, read_only=True)
+        try:
+            ws = wb.worksheets[0]
+            rows = ws.iter_rows(values_only=True)
+            header = list(next(rows, []))
+            j = header.index(column) if column in header else 0
+            last = None
+            for row in rows:
+                if row and row[j] is not None:
+                    last = row[j]
+
+            return None if last is None else int(last)
+
+        finally:
+            wb.close()
+
+    raise ValueError(f'Unsupported file format {ext!r}')
+
+
+def truncate_csv(path: str, ts: float, column: str = 'TS') -> None:
+    """ Remove the last rows of a CSV file from the timestamp `ts`.
+
+    The file is read from its end up to the first row older than `ts`,
+    the header is kept.
+
+    Parameters
+    ----------
+    path : str
+        Path of the CSV file, sorted by timestamp.
+    ts : float
+        First timestamp to remove.
+    column : str, optional
+        Column of the timestamps, default is 'TS'.
+
+    """
+    i = _csv_column(path, column)
+    with open(path, 'rb+') as f:
+        cut = None
+        for offset, line in _reversed_lines(f):
+            row_ts = _ts(line, i)
+            if row_ts is None or row_ts < ts:
+                break
+
+            cut = offset
+
+        if cut is not None:
+            f.truncate(cut)
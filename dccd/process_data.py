@@ -15,10 +15,20 @@ import time
 import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 # Local packages
 
 __all__ = ['set_marketdepth', 'set_ohlc', 'set_orders', 'set_trades']
 
+_DEPTH_SIDES = ('bid', 'ask')
+_DEPTH_FIELDS = ('price', 'cum_amount', 'vwab')
+
 
 def set_orders(orders, t=None):
     """ Set a dataframe with list of each order.
@@ -44,123 +54,227 @@ def set_orders(orders, t=None):
     return df
 
 
-def set_marketdepth(book, t=None):
+def _depth_arrays(book, depth=None):
+    """ Compute the price, cumulative amount and VWAP of each book level.
+
+    Parameters
+    ----------
+    book : dict
+        Orderbook as dict, where keys is the price and value is the amount.
+    depth : int, optional
+        Number of levels per side, default is all the levels.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape ``(2, 3, width)``: bid then ask sides, price then
+        cumulative amount then VWAP, from the best level, padded with NaN.
+
+    """
+    prices = np.abs(np.array(list(book.keys()), dtype=np.float64))
+    amounts = np.fromiter(book.values(), dtype=np.float64, count=len(book))
+    sides = []
+    # Bids sorted by decreasing prices, asks by increasing prices
+    for mask, sign in ((amounts > 0, -1.), (amounts < 0, 1.)):
+        price, amount = prices[mask], np.abs(amounts[mask])
+        order = np.argsort(sign * price, kind='stable')[:depth]
+        price, amount = price[order], amount[order]
+        cum_amount = np.cumsum(amount)
+        sides.append((price, cum_amount, np.cumsum(price * amount) / cum_amount))
+
+    if depth is None:
+        depth = max(side[0].size for side in sides)
+
+    out = np.full((2, len(_DEPTH_FIELDS), depth), np.nan)
+    for i, side in enumerate(sides):
+        out[i, :, :side[0].size] = side
+
+    return out
+
+
+def set_marketdepth(book, t=None, depth=None, wide=False):
     """ Set a market depth dataframe with list of order books.
 
+    The cumulative amount and the volume weighted average price ('vwab') of
+    each side are computed on NumPy arrays of the levels.
+
     Parameters
     ----------
     book : dict
         Orderbook as dict, where keys is the price and value is the amount.
+    t : int, optional
+        Timestamp of the order book, default is now.
+    depth : int, optional
+        Number of levels per side, padded with NaN if the book is shallower.
+        Default is all the levels, i.e. the width of the deepest side.
+    wide : bool, optional
+        If True, return the book as a single row indexed by `t`, with one
+        column per side, field and level (e.g. 'bid_price_0'), which keeps
+        the same columns from one snapshot to the next. Requires `depth`.
 
     Returns
     -------
     pd.DataFrame
-        Order book as dataframe.
+        Order book as dataframe, indexed by `t`, the side ('bid' or 'ask')
+        and the field ('price', 'cum_amount' or 'vwab') with one column per
+        level, or as a single row if `wide` is True.
+
+    Examples
+    --------
+    >>> book = {'100': 1., '99': 3., '-101': -2.}
+    >>> set_marketdepth(book, t=0, depth=2)
+                          0      1
+    0 bid price       100.0  99.00
+          cum_amount    1.0   4.00
+          vwab        100.0  99.25
+      ask price       101.0    NaN
+          cum_amount    2.0    NaN
+          vwab        101.0    NaN
+    >>> set_marketdepth(book, t=0, depth=1, wide=True).columns.tolist()
+    ['bid_price_0', 'bid_cum_amount_0', 'bid_vwab_0', 'ask_price_0', 'ask_cum_amount_0', 'ask_vwab_0']
 
     """
+    if wide and depth is None:
+        raise ValueError('wide output requires a fixed depth')
+
     if t is None:
         t = int(time.time())
 
-    # Set dataframe
-    # df = pd.DataFrame(book, dtype=np.float64)
-    # keys = sorted(book.keys(), reverse=True)
-    keys = sorted([i for i in book.keys() if book[i] > 0], reverse=True)
-    keys += sorted([i for i in book.keys() if book[i] < 0])
-    df = pd.DataFrame([{'price': k, 'amount': book[k]} for k in keys],
-                      dtype=np.float64)
-    df = df.sort_index().reset_index(drop=True)
-    # df.loc[df.amount > 0] = df.loc[df.amount > 0].iloc[::-1]
-    bid_idx = df.amount > 0.
-    ask_idx = df.amount < 0.
-    bid = df.loc[bid_idx]
-    ask = df.loc[ask_idx]  # .iloc[::-1]
-
-    # Set bid cumulative amount
-    df.loc[bid_idx, 'cum_amount'] = np.cumsum(bid.amount.values)
-    df.loc[bid_idx, 'vwab'] = np.cumsum(bid.amount.values * bid.price.values)
-    df.loc[bid_idx, 'vwab'] /= df.loc[bid_idx, 'cum_amount'].values
-
-    # Set ask cumulative amount
-    df.loc[ask_idx, 'cum_amount'] = np.cumsum(ask.amount.values)
-    df.loc[ask_idx, 'vwab'] = np.cumsum(ask.amount.values * ask.price.values)
-    df.loc[ask_idx, 'vwab'] /= df.loc[ask_idx, 'cum_amount'].values
-
-    df = df.drop(columns=['amount'])
-
-    asks, bids = df.loc[ask_idx], df.loc[bid_idx]
-
-    # Set index
-    n = len(bids.columns)
-    bid_depth, ask_depth = bids.index.size, asks.index.size
-    bid_slice = pd.IndexSlice[t, 'bid', :]
-    ask_slice = pd.IndexSlice[t, 'ask', :]
-
-    # Create dataframe
-    df = pd.DataFrame(index=[[t] * 2 * n, ['bid'] * n + ['ask'] * n,
-                             list(bids.columns) + list(asks.columns)],
-                      columns=range(max(bid_depth, ask_depth)))
-
-    # Set data
-    df.loc[bid_slice, 0: bid_depth - 1] = bids.values.T
-    df.loc[ask_slice, 0: ask_depth - 1] = np.abs(asks.values.T)
+    out = _depth_arrays(book, depth)
+    width = out.shape[2]
+    if wide:
+        columns = [f'{side}_{field}_{i}' for side in _DEPTH_SIDES
+                   for field in _DEPTH_FIELDS for i in range(width)]
 
-    return df
+        return pd.DataFrame(out.reshape(1, -1), index=[t], columns=columns)
+
+    index = pd.MultiIndex.from_product([[t], _DEPTH_SIDES, _DEPTH_FIELDS])
 
+    return pd.DataFrame(out.reshape(-1, width), index=index,
+                        columns=range(width))
 
-def set_trades(trades):
+
+def set_trades(trades, output='pandas'):
     """ Set a dataframe with list of trades.
 
     Parameters
     ----------
-    trades : list
-        Historical trades tick by tick as list.
+    trades : list or TradeBuffer
+        Historical trades tick by tick as list, or as a
+        :class:`~dccd.continuous_dl.trades.TradeBuffer`.
+    output : {'pandas', 'arrow'}, optional
+        Return a pd.DataFrame (default) or a pyarrow.RecordBatch, built
+        from the columns of a `TradeBuffer` without copy.
 
     Returns
     -------
-    pd.DataFrame
-        Historical trades tick by tick as dataframe.
+    pd.DataFrame or pyarrow.RecordBatch
+        Historical trades tick by tick sorted by 'tid'.
 
     """
+    is_buffer = hasattr(trades, 'columns') and hasattr(trades, 'to_frame')
+    if output == 'arrow':
+        if is_buffer:
+
+            return trades.to_arrow()
+
+        if not HAS_PYARROW:
+            raise ImportError(
+                "pyarrow is required for this output: pip install dccd[io]"
+            )
+
+        batch = pa.RecordBatch.from_pylist(list(trades))
+
+        return batch.take(pc.sort_indices(batch, [('tid', 'ascending')]))
+
     # Set dataframe
-    df = pd.DataFrame(trades)
+    if is_buffer:
+        # Columnar buffer, converted without the rows as dicts
+        df = trades.to_frame()
+    else:
+        df = pd.DataFrame(trades)
 
     return df.sort_values('tid').reset_index(drop=True)
 
 
-def set_ohlc(trades, ts=60):
+def set_ohlc(trades, ts=60, vwap=False, count=False, buy_sell=False):
     """ Aggregate and set a dataframe with list of trades.
 
+    Trades are assigned to the bucket ``timestamp // ts * ts`` and all the
+    buckets are aggregated in a single grouped pass.
+
     Parameters
     ----------
-    trades : list
-        Historical trades tick by tick as list.
+    trades : list or pd.DataFrame
+        Historical trades tick by tick, with 'tid', 'timestamp' (in
+        milliseconds), 'price' and 'amount', and 'type' ('buy' or 'sell')
+        if `buy_sell` is True.
     ts : int, optional
         Timestep in seconds to aggregate data, default is 60.
+    vwap : bool, optional
+        If True, add the volume weighted average price 'vwap' column.
+    count : bool, optional
+        If True, add the number of trades 'count' column.
+    buy_sell : bool, optional
+        If True, add the 'buy_volume' and 'sell_volume' columns.
 
     Returns
     -------
     pd.DataFrame
         Aggregated trades as OHLC, dataframe is indexed by timestamp and
-        columns contains 'open', 'high', 'low', 'close', and 'volume'.
+        columns contains 'open', 'high', 'low', 'close', and 'volume' (and
+        the optional columns). Buckets without trade are set to NaN.
+
+    Examples
+    --------
+    >>> trades = [
+    ...     {'tid': 1, 'timestamp': 0, 'price': 10., 'amount': 1., 'type': 'buy'},
+    ...     {'tid': 2, 'timestamp': 30000, 'price': 12., 'amount': 3., 'type': 'sell'},
+    ...     {'tid': 3, 'timestamp': 120000, 'price': 11., 'amount': 2., 'type': 'buy'},
+    ... ]
+    >>> set_ohlc(trades, ts=60, vwap=True, buy_sell=True)
+         open  high   low  close  volume  vwap  buy_volume  sell_volume
+    0    10.0  12.0  10.0   12.0     4.0  11.5         1.0          3.0
+    60    NaN   NaN   NaN    NaN     NaN   NaN         NaN          NaN
+    120  11.0  11.0  11.0   11.0     2.0  11.0         2.0          0.0
 
     """
-    df = pd.DataFrame(trades).sort_values('tid').reset_index(drop=True)
-    df.timestamp = df.timestamp / 1000
-    t0, t1 = int(df.timestamp.iloc[0] // ts * ts), int(df.timestamp.iloc[-1])
-    db = pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'],
-                      index=range(t0, t1 + ts, ts))
+    columns = ['open', 'high', 'low', 'close', 'volume']
+    columns += ['vwap'] * vwap + ['count'] * count
+    columns += ['buy_volume', 'sell_volume'] * buy_sell
+
+    df = pd.DataFrame(trades)
+    if df.empty:
+
+        return pd.DataFrame(columns=columns, dtype=np.float64)
+
+    if not df.tid.is_monotonic_increasing:
+        df = df.sort_values('tid', kind='stable')
+
+    price = df.price.to_numpy(dtype=np.float64)
+    amount = df.amount.to_numpy(dtype=np.float64)
+    bucket = (df.timestamp.to_numpy(dtype=np.float64) // (ts * 1000)).astype(np.int64) * ts
+
+    agg = {'open': (price, 'first'), 'high': (price, 'max'),
+           'low': (price, 'min'), 'close': (price, 'last'),
+           'volume': (amount, 'sum')}
+    if vwap:
+        agg['notional'] = (price * amount, 'sum')
+
+    if count:
+        agg['count'] = (price, 'size')
 
-    for t in np.arange(t0, t1 + ts, ts):
-        data = df.set_index('timestamp').loc[t: t + ts, :]
+    if buy_sell:
+        is_buy = (df.type == 'buy').to_numpy()
+        agg['buy_volume'] = (np.where(is_buy, amount, 0.), 'sum')
+        agg['sell_volume'] = (np.where(is_buy, 0., amount), 'sum')
 
-        if data.empty:
+    grouped = pd.DataFrame({k: v for k, (v, _) in agg.items()}).groupby(bucket)
+    db = grouped.agg({k: f for k, (_, f) in agg.items()})
 
-            continue
+    if vwap:
+        db['vwap'] = db.pop('notional') / db.volume
 
-        db.loc[t, 'open'] = data.price.iloc[0]
-        db.loc[t, 'high'] = data.price.max()
-        db.loc[t, 'low'] = data.price.min()
-        db.loc[t, 'close'] = data.price.iloc[-1]
-        db.loc[t, 'volume'] = data.amount.sum()
+    index = range(db.index[0], db.index[-1] + ts, ts)
 
-    return db
+    return db.reindex(index=index, columns=columns).astype(np.float64)
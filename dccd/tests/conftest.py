@@ -28,13 +28,13 @@ def mock_binance(monkeypatch):
         _TS * 1000, "50000", "51000", "49000", "50500", "100",
         (_TS + 86399) * 1000, "5050000", 1000, "50", "2525000", "0"
     ]]
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 @pytest.fixture
 def mock_coinbase(monkeypatch):
     payload = [[_TS, 49000, 51000, 50000, 50500, 100.0]]
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 @pytest.fixture
@@ -46,7 +46,7 @@ def mock_kraken(monkeypatch):
             "last": _TS,
         },
     }
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 @pytest.fixture
@@ -58,7 +58,7 @@ def mock_bybit(monkeypatch):
             ]
         }
     }
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 @pytest.fixture
@@ -68,7 +68,7 @@ def mock_okx(monkeypatch):
             [str(_TS * 1000), "50000", "51000", "49000", "50500", "100", "100", "5050000", "1"],
         ]
     }
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 # ---------------------------------------------------------------------------
@@ -81,7 +81,7 @@ def mock_binance_trades(monkeypatch):
         {'a': 1, 'T': _TS * 1000, 'p': '50000', 'q': '0.1', 'm': False},
         {'a': 2, 'T': (_TS + 1) * 1000, 'p': '50100', 'q': '0.2', 'm': True},
     ]
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 @pytest.fixture
@@ -95,7 +95,7 @@ def mock_kraken_trades(monkeypatch):
             'last': str(_TS + 1),
         }
     }
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 @pytest.fixture
@@ -108,7 +108,7 @@ def mock_bybit_trades(monkeypatch):
             ]
         }
     }
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 @pytest.fixture
@@ -119,7 +119,7 @@ def mock_okx_trades(monkeypatch):
             {'tradeId': '1002', 'ts': str((_TS + 1) * 1000), 'px': '50100', 'sz': '0.2', 'side': 'sell'},
         ]
     }
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 @pytest.fixture
@@ -128,7 +128,7 @@ def mock_coinbase_trades(monkeypatch):
         {'trade_id': 1, 'time': '2025-05-01T00:00:00Z', 'price': '50000', 'size': '0.1', 'side': 'buy'},
         {'trade_id': 2, 'time': '2025-05-01T00:00:01Z', 'price': '50100', 'size': '0.2', 'side': 'sell'},
     ]
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 # ---------------------------------------------------------------------------
@@ -141,7 +141,7 @@ def mock_binance_depth(monkeypatch):
         'bids': [['50000', '1.0'], ['49900', '2.0']],
         'asks': [['50100', '0.5'], ['50200', '1.5']],
     }
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 @pytest.fixture
@@ -154,7 +154,7 @@ def mock_kraken_depth(monkeypatch):
             }
         }
     }
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 @pytest.fixture
@@ -165,7 +165,7 @@ def mock_bybit_orderbook(monkeypatch):
             'a': [['50100', '0.5'], ['50200', '1.5']],
         }
     }
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 @pytest.fixture
@@ -177,7 +177,7 @@ def mock_okx_books(monkeypatch):
             'ts': str(_TS * 1000),
         }]
     }
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 @pytest.fixture
@@ -186,7 +186,7 @@ def mock_coinbase_book(monkeypatch):
         'bids': [['50000', '1.0', 2], ['49900', '2.0', 1]],
         'asks': [['50100', '0.5', 1], ['50200', '1.5', 3]],
     }
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_response(payload))
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_response(payload))
 
 
 @pytest.fixture
@@ -195,7 +195,7 @@ def mock_http_500(monkeypatch):
     m = MagicMock()
     m.status_code = 500
     m.json.side_effect = ValueError("Server error — no JSON body")
-    monkeypatch.setattr("requests.get", lambda *a, **kw: m)
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: m)
 
 
 @pytest.fixture
@@ -218,5 +218,20 @@ def mock_429_then_200(monkeypatch):
             return r
         return _mock_response(payload)
 
-    monkeypatch.setattr("requests.get", _side_effect)
+    monkeypatch.setattr("requests.Session.get", _side_effect)
     return calls
+
+
+@pytest.fixture
+def mock_pages(monkeypatch):
+    """Serve the given payloads in order and record the query parameters."""
+    def _install(*payloads):
+        pages, calls = list(payloads), []
+
+        def _get(self, url, params=None, **kw):
+            calls.append(params)
+            return _mock_response(pages.pop(0) if len(pages) > 1 else pages[0])
+
+        monkeypatch.setattr("requests.Session.get", _get)
+        return calls
+    return _install
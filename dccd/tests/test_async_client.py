@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+import threading
+import time
+
+import aiohttp
+import pytest
+from tenacity import wait_none
+
+from dccd.histo_dl.async_client import AsyncDownloader
+from dccd.histo_dl.binance import FromBinance
+from dccd.histo_dl.kraken import FromKraken
+
+_TS = 1746057600  # 2025-05-01 00:00:00 UTC
+
+_KLINE = [
+    _TS * 1000, "50000", "51000", "49000", "50500", "100",
+    (_TS + 86399) * 1000, "5050000", 1000, "50", "2525000", "0"
+]
+
+
+class _FakeResponse:
+    def __init__(self, payload, status=200):
+        self.payload = payload
+        self.status = status
+
+    async def json(self, content_type=None):
+        return self.payload
+
+    def raise_for_status(self):
+        raise aiohttp.ClientResponseError(None, (), status=self.status)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class _FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None):
+        self.calls.append((url, params))
+        if len(self.responses) > 1:
+            return self.responses.pop(0)
+        return self.responses[0]
+
+
+@pytest.fixture
+def session(monkeypatch):
+    def _install(*responses):
+        fake = _FakeSession(*responses)
+        monkeypatch.setattr(
+            'dccd.histo_dl.async_client.get_async_session', lambda key: fake
+        )
+        return fake
+    return _install
+
+
+@pytest.mark.asyncio
+async def test_import_data_same_as_sync(tmp_path, session, mock_binance):
+    start = int(time.time() // 86400 * 86400 - 86400)
+    fake = session(_FakeResponse([_KLINE]))
+    dl = await AsyncDownloader(
+        FromBinance(str(tmp_path), 'BTC', 86400, 'USDT')
+    ).import_data(start=start)
+    expected = FromBinance(str(tmp_path), 'BTC', 86400, 'USDT').import_data(start=start)
+    assert fake.calls[0][0] == 'https://api.binance.com/api/v3/klines'
+    assert fake.calls[0][1]['symbol'] == 'BTCUSDT'
+    assert dl.df.equals(expected.df)
+
+
+@pytest.mark.asyncio
+async def test_import_data_paginates_windows(tmp_path, session):
+    fake = session(_FakeResponse([_KLINE]))
+    dl = FromBinance(str(tmp_path), 'BTC', 3600, 'USDT')
+    start = _TS - 2500 * 3600
+    await AsyncDownloader(dl).import_data(start=start, end=_TS)
+    assert len(fake.calls) == len(dl._windows(dl.start, dl.end)) == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_on_429(tmp_path, session, monkeypatch):
+    monkeypatch.setattr(AsyncDownloader, '_fetch',
+                        AsyncDownloader._fetch.retry_with(wait=wait_none()))
+    fake = session(_FakeResponse(None, 429), _FakeResponse(None, 429),
+                   _FakeResponse([_KLINE]))
+    dl = FromBinance(str(tmp_path), 'BTC', 86400, 'USDT')
+    await AsyncDownloader(dl).import_data(start=_TS, end=_TS + 86400)
+    assert len(fake.calls) == 3
+    assert not dl.df.empty
+
+
+@pytest.mark.asyncio
+async def test_import_trades_and_orderbook(tmp_path, session):
+    session(_FakeResponse({
+        'result': {
+            'XXBTZUSD': {
+                'bids': [['50000', '1.0', _TS]],
+                'asks': [['50100', '0.5', _TS]],
+            }
+        }
+    }))
+    client = AsyncDownloader(FromKraken(str(tmp_path), 'BTC', 86400, 'USD'))
+    dl = await client.import_orderbook(depth=1)
+    assert list(dl.orderbook_df['side']) == ['bid', 'ask']
+
+    session(_FakeResponse({
+        'result': {
+            'XXBTZUSD': [['50000', '0.1', float(_TS), 'b', 'l', '', 1]],
+            'last': str(_TS),
+        }
+    }))
+    dl = await client.import_trades(start=_TS, end=_TS + 1)
+    assert len(dl.trades_df) == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_io_off_the_event_loop(tmp_path, session, monkeypatch):
+    loop_thread = threading.get_ident()
+    threads = []
+    dl = FromKraken(str(tmp_path), 'BTC', 86400, 'USD')
+    for name in ('_get_last_date', '_open_trades', '_page_trades', '_close_trades'):
+        method = getattr(dl, name)
+
+        def _record(*args, _method=method, **kwargs):
+            threads.append(threading.get_ident())
+            return _method(*args, **kwargs)
+
+        monkeypatch.setattr(dl, name, _record)
+
+    session(_FakeResponse({
+        'result': {
+            'XXBTZUSD': [['50000', '0.1', float(_TS), 'b', 'l', '', 1]],
+            'last': str(_TS),
+        }
+    }))
+    client = AsyncDownloader(dl)
+    await client.import_trades(start=_TS, end=_TS + 1)
+    session(_FakeResponse({'result': {'XXBTZUSD': [], 'last': _TS}}))
+    await client.import_data(start='last')
+    assert len(threads) == 4
+    assert loop_thread not in threads
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from dccd.continuous_dl.bars import BarBuilder
+from dccd.continuous_dl.exchange import ContinuousDownloader
+from dccd.process_data import set_ohlc
+from dccd.validation import DataValidationError
+
+
+def _trades():
+    return [
+        {'tid': 1, 'timestamp': 0., 'price': 10., 'amount': 1., 'type': 'buy'},
+        {'tid': 2, 'timestamp': 59., 'price': 8., 'amount': 1., 'type': 'sell'},
+        {'tid': 3, 'timestamp': 61., 'price': 12., 'amount': 2., 'type': 'buy'},
+        {'tid': 4, 'timestamp': 250., 'price': 11., 'amount': 1., 'type': 'sell'},
+    ]
+
+
+def test_bars_match_set_ohlc():
+    bars = BarBuilder([60])
+    bars.update_many(_trades())
+    result = bars.flush(now=300.)[60]
+    trades = [dict(t, timestamp=t['timestamp'] * 1000) for t in _trades()]
+    expected = set_ohlc(trades, ts=60, vwap=True, count=True,
+                        buy_sell=True).dropna()
+    assert list(result.index) == [0, 60, 240]
+    assert (result.values == expected.values).all()
+
+
+def test_several_widths_and_open_bar():
+    bars = BarBuilder([60, 300])
+    bars.update_many(_trades())
+    closed = bars.flush(now=250.)
+    assert list(closed) == [60]
+    assert list(closed[60].index) == [0, 60]
+
+    closed = bars.flush(now=300.)
+    assert closed[60].close.tolist() == [11.]
+    assert closed[300].loc[0, 'volume'] == 5.
+    assert closed[300].loc[0, 'high'] == 12.
+    assert bars.flush(now=1000.) == {}
+
+
+def test_late_trade_counted_in_current_bar():
+    bars = BarBuilder([60])
+    bars.update(61., 12., 1.)
+    bars.update(59., 9., 1.)
+    result = bars.flush(now=120.)[60]
+    assert list(result.index) == [60]
+    assert result.loc[60, 'low'] == 9. and result.loc[60, 'count'] == 2
+
+
+def test_invalid_width():
+    with pytest.raises(ValueError, match='>= 1 second'):
+        BarBuilder([0])
+
+
+def test_downloader_saves_bars_without_trades():
+    dl = ContinuousDownloader('wss://example.com', time_step=60)
+    saver = MagicMock()
+    dl.set_bars_saver(saver, name='bars_1m')
+    dl.set_bars_saver(saver, width=300, name='bars_5m')
+    dl._push_trades(_trades()[:2])
+    # Only the bars are saved, the trades are not kept
+    assert dl._data == {}
+
+    snapshot = dl._pop_snapshot(dl.t)
+    snapshot['snapshot_ts'] = 400_000
+    dl._save_snapshot(snapshot)
+    names = [c.kwargs['name'] for c in saver.call_args_list]
+    assert names == ['bars_1m', 'bars_5m']
+    assert saver.call_args_list[0].args[0].loc[0, 'low'] == 8.
+
+
+def test_invalid_trades_not_added_to_bars():
+    dl = ContinuousDownloader('wss://example.com', time_step=60)
+    dl.set_bars_saver(MagicMock())
+    trades = _trades()[:2]
+    trades[1]['price'] = float('nan')
+    with pytest.raises(DataValidationError):
+        dl._push_trades(trades)
+
+    assert dl._bars.flush(1e9) == {}
+
+
+@pytest.mark.asyncio
+async def test_loop_saves_in_a_thread():
+    dl = ContinuousDownloader('wss://example.com', time_step=60)
+    saved = []
+    dl.set_bars_saver(lambda bars, **kw: saved.append((threading.get_ident(), bars)))
+    dl.save_in_thread = dl.is_connect = True
+    dl._push_trades(_trades()[:2])
+    snapshots = iter([dl._pop_snapshot(dl.t)])
+    flush, flushed_in = dl._bars.flush, []
+
+    def _flush(now):
+        flushed_in.append(threading.get_ident())
+        return flush(now)
+
+    async def _anext(self):
+        try:
+            return next(snapshots)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    dl._bars.flush = _flush
+    with patch.object(ContinuousDownloader, '__anext__', _anext):
+        await dl._loop()
+
+    # Bars closed on the loop, saved by a worker thread
+    assert flushed_in == [threading.get_ident()]
+    assert saved[0][0] != threading.get_ident()
+    assert saved[0][1].loc[0, 'low'] == 8.
@@ -3,6 +3,7 @@
 
 import time
 
+import pandas as pd
 import pytest
 
 from dccd import FromBinance as fb
@@ -49,7 +50,7 @@ def test_http_500_raises(loader, mock_http_500):
 
 
 def test_malformed_response_raises(loader, monkeypatch):
-    monkeypatch.setattr("requests.get", lambda *a, **kw: _mock_bad())
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: _mock_bad())
     with pytest.raises((KeyError, TypeError, ValueError)):
         loader._import_data(start=0)
 
@@ -76,9 +77,52 @@ def test_import_trades_http_500_raises(loader, mock_http_500):
         loader._import_trades(start=0, end=1)
 
 
+def _agg(a, t):
+    return {'a': a, 'T': t * 1000, 'p': '50000', 'q': '0.1', 'm': False}
+
+
+def test_import_trades_paginates_by_from_id(loader, mock_pages):
+    loader._trades_limit = 2
+    t = 1746057600
+    calls = mock_pages([], [_agg(1, t + 3600), _agg(2, t + 3601)],
+                       [_agg(3, t + 3602), _agg(4, t + 9000)])
+    loader.import_trades(start=t, end=t + 7200)
+    # Empty first hour, first trades found in the second hour
+    assert calls[0]['startTime'] == t * 1000
+    assert calls[1]['startTime'] == (t + 3600) * 1000
+    assert calls[2] == {'symbol': 'BTCUSDT', 'limit': 2, 'fromId': 3}
+    assert len(calls) == 3
+    assert list(loader.trades_df['tid']) == [1, 2, 3]
+    assert loader.trades_per_sec > 0
+
+
 def _mock_bad():
     from unittest.mock import MagicMock
     m = MagicMock()
     m.status_code = 200
     m.json.return_value = {"error": "bad"}
     return m
+
+
+@pytest.mark.parametrize('url,params,weight', [
+    ('https://api.binance.com/api/v3/klines', {}, 2),
+    ('https://api.binance.com/api/v3/aggTrades', {}, 4),
+    ('https://api.binance.com/api/v3/depth', {'limit': 50}, 5),
+    ('https://api.binance.com/api/v3/depth', {'limit': 1000}, 50),
+])
+def test_request_weight(loader, url, params, weight):
+    assert loader._request_weight(url, params) == weight
+
+
+def test_rate_limiter_shared_between_instances(loader, tmp_data_path):
+    other = fb(tmp_data_path, 'ETH', 3600, 'USDT')
+    url = 'https://api.binance.com/api/v3/klines'
+    assert loader._rate_limiter(url) is other._rate_limiter(url)
+
+
+def test_sort_data_strict_mode(loader, mock_binance):
+    start = int(time.time() // 86400 * 86400 - 86400)
+    default = loader.import_data(start=start).df
+    loader.strict = True
+    strict = loader.import_data(start=start).df
+    pd.testing.assert_frame_equal(default, strict)
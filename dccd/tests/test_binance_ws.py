@@ -2,12 +2,14 @@
 # coding: utf-8
 
 import time
+from collections import deque
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from dccd.continuous_dl.binance import DownloadBinanceData, _parser_book, _parser_trades
+from dccd.continuous_dl.orderbook import OrderBook
 
 # =========================================================================== #
 #                           Module-level parsers                              #
@@ -30,6 +32,11 @@ _TRADE_DATA_SELL = {
 }
 
 _BOOK_DATA = {
+    'e': 'depthUpdate',
+    'E': 1700000000000,
+    's': 'BTCUSDT',
+    'U': 157,
+    'u': 160,
     'b': [['29990.0', '2.0'], ['29980.0', '0']],
     'a': [['30010.0', '1.5']],
 }
@@ -73,7 +80,8 @@ def _make_downloader() -> DownloadBinanceData:
         obj = DownloadBinanceData.__new__(DownloadBinanceData)
         obj._data = {}
         obj.t = 2000
-        obj.d = {}
+        obj.d = OrderBook()
+        obj._seq, obj._synced, obj._pending = None, True, deque()
         obj.logger = MagicMock()
         return obj
 
@@ -116,7 +124,7 @@ async def test_on_message_trade():
 async def test_on_message_book():
     dl = _make_downloader()
     dl.parser_book = MagicMock()
-    msg = {'stream': 'btcusdt@depth50@100ms', 'data': _BOOK_DATA}
+    msg = {'stream': 'btcusdt@depth@100ms', 'data': _BOOK_DATA}
     await dl.on_message(msg)
     dl.parser_book.assert_called_once_with(_BOOK_DATA)
 
@@ -153,7 +161,7 @@ def test_checkpoint_save_and_load(tmp_path: Path):
     dl = _make_downloader()
     dl._checkpoint_dir = tmp_path
     dl.pair = 'BTCUSDT'
-    dl.d = {'30000.0': 1.5, '-30010.0': -0.5}
+    dl.d = OrderBook({'30000.0': 1.5, '-30010.0': -0.5})
 
     dl._save_checkpoint()
 
@@ -168,7 +176,7 @@ def test_checkpoint_save_and_load(tmp_path: Path):
 def test_checkpoint_no_dir_does_nothing(tmp_path: Path):
     dl = _make_downloader()
     dl._checkpoint_dir = None
-    dl.d = {'30000.0': 1.0}
+    dl.d = OrderBook({'30000.0': 1.0})
     dl._save_checkpoint()
     assert list(tmp_path.iterdir()) == []
 
@@ -185,3 +193,84 @@ def test_set_book_saver_stored():
     saver = MagicMock()
     dl.set_book_saver(saver)
     assert dl._book_saver is saver
+
+
+@pytest.mark.asyncio
+async def test_anext_snapshots_live_book_once():
+    dl = _make_downloader()
+    dl.ts = 60
+    dl.until = time.time() + 3600
+    dl.t = int(time.time()) - 60
+    dl.parser_book(_BOOK_DATA)
+    assert dl._data[dl.t]['book'] is dl.d
+    payload = await dl.__anext__()
+    assert type(payload['book']) is dict
+    assert payload['book'] == dl.d.snapshot()
+    dl.d.set('29990.0', 0)
+    assert '29990.0' in payload['book']
+
+
+# =========================================================================== #
+#                          Sequence and book resync                           #
+# =========================================================================== #
+
+
+def _depth(first: int, last: int, bids: list) -> dict:
+    return {'e': 'depthUpdate', 'E': 1700000000000, 's': 'BTCUSDT',
+            'U': first, 'u': last, 'b': bids, 'a': []}
+
+
+@pytest.mark.asyncio
+async def test_gap_resyncs_book_from_rest_snapshot():
+    dl = DownloadBinanceData('BTCUSDT')
+    response = MagicMock()
+    response.json.return_value = {
+        'lastUpdateId': 12, 'bids': [['100.0', '1.0']], 'asks': [['101.0', '2.0']],
+    }
+    dl.parser_book(_depth(1, 10, [['99.0', '1.0']]))
+    dl.parser_book(_depth(11, 11, [['98.0', '1.0']]))
+    assert dl._seq == 11
+
+    with patch('dccd.continuous_dl.binance.get_session') as session:
+        session.return_value.get.return_value = response
+        dl.parser_book(_depth(13, 14, [['97.0', '1.0']]))  # 12 is missing
+        dl.parser_book(_depth(15, 15, [['96.0', '1.0']]))
+        assert dl.n_gaps == 1
+        assert '96.0' not in dl.d
+        await dl._resync_task
+
+    session.return_value.get.assert_called_once()
+    assert dl._synced and dl._seq == 15
+    assert dict(dl.d) == {'100.0': 1.0, '-101.0': -2.0, '97.0': 1.0, '96.0': 1.0}
+
+
+def test_stale_depth_dropped():
+    dl = DownloadBinanceData('BTCUSDT')
+    dl.parser_book(_depth(1, 10, [['99.0', '1.0']]))
+    dl.parser_book(_depth(5, 10, [['99.0', '5.0']]))
+    assert dl.d['99.0'] == 1.0
+    assert dl.n_gaps == 0
+
+
+@pytest.mark.asyncio
+async def test_on_connect_starts_resync():
+    dl = DownloadBinanceData('BTCUSDT')
+    dl._resync = AsyncMock()
+    dl._seq = 10
+    await dl.on_connect()
+    assert dl._seq is None and not dl._synced
+    await dl._resync_task
+    dl._resync.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_resync_gives_up_and_reconnects():
+    dl = DownloadBinanceData('BTCUSDT')
+    dl.max_retries, dl.retry_delay = 2, 0
+    dl._resync = AsyncMock(side_effect=OSError('down'))
+    dl.ws = AsyncMock()
+    dl._start_resync()
+    await dl._resync_task
+    assert dl._resync.await_count == 3
+    dl.ws.close.assert_awaited_once()
+    assert not dl._synced
@@ -4,6 +4,7 @@
 from unittest.mock import MagicMock, patch
 
 from dccd.continuous_dl.bitfinex import DownloadBitfinexData
+from dccd.continuous_dl.orderbook import OrderBook
 
 
 def _make_downloader() -> DownloadBitfinexData:
@@ -13,7 +14,7 @@ def _make_downloader() -> DownloadBitfinexData:
         obj = DownloadBitfinexData.__new__(DownloadBitfinexData)
         obj._data = {}
         obj.t = 1000
-        obj.d = {}
+        obj.d = OrderBook()
         obj.logger = MagicMock()
         obj._raw_parser = MagicMock()
         obj._parser_data = {
@@ -44,7 +45,7 @@ def test_parser_book_add_order():
 
 def test_parser_book_remove_order():
     dl = _make_downloader()
-    dl.d = {'100.0': {'price': '100.0', 'amount': 0.5}}
+    dl.d = OrderBook({'100.0': 0.5})
     data = [0, [100.0, 0, 0.0]]
     dl.parser_book(data)
     assert '100.0' not in dl._data[1000]['book']
@@ -78,6 +79,13 @@ def test_parser_trades_processes_te():
     dl = _make_downloader()
     data = [0, 'te', [42, 1700000000000, -0.1, 30000.0]]
     dl.parser_trades(data)
-    dl._raw_parser.assert_called_once()
-    parsed = dl._raw_parser.call_args[0][0]
+    parsed = dl._data[1000]['trades'][0]
     assert parsed['type'] == 'sell'
+    assert parsed['amount'] == 0.1
+
+
+def test_parser_book_update_sets_total_amount():
+    dl = _make_downloader()
+    dl.parser_book([0, [100.0, 1, 0.5]])
+    dl.parser_book([0, [100.0, 2, 0.8]])
+    assert dl.d['100.0'] == 0.8
@@ -6,6 +6,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from dccd.continuous_dl.bitmex import DownloadBitmexData
+from dccd.continuous_dl.orderbook import OrderBook
 
 
 def _make_downloader() -> DownloadBitmexData:
@@ -15,8 +16,9 @@ def _make_downloader() -> DownloadBitmexData:
         obj = DownloadBitmexData.__new__(DownloadBitmexData)
         obj._data = {}
         obj.t = 1000
-        obj.d = {}
+        obj.d = OrderBook()
         obj.start = False
+        obj._ids = {}
         obj.logger = MagicMock()
         obj.parser = MagicMock()
         return obj
@@ -59,7 +61,7 @@ def test_parser_book_partial_populates():
     dl = _make_downloader()
     dl.parser_book(_PARTIAL_MSG)
     assert dl.start is True
-    assert 1 in dl.d
+    assert dl._ids == {1: 30000.0}
     assert dl._data[1000]['book'][30000.0] == 10
 
 
@@ -67,7 +69,7 @@ def test_parser_book_delete_removes_entry():
     dl = _make_downloader()
     dl.parser_book(_PARTIAL_MSG)
     dl.parser_book(_DELETE_MSG)
-    assert 1 not in dl.d
+    assert 1 not in dl._ids
     assert 30000.0 not in dl._data[1000]['book']
 
 
@@ -78,6 +80,15 @@ def test_parser_book_update_changes_amount():
     assert dl._data[1000]['book'][30000.0] == 20
 
 
+def test_parser_book_update_with_price():
+    dl = _make_downloader()
+    dl.parser_book(_PARTIAL_MSG)
+    dl.parser_book({'action': 'update', 'data': [
+        {'id': 1, 'side': 'Buy', 'size': 5, 'price': 30000.0},
+    ]})
+    assert dl._data[1000]['book'] == {30000.0: 5}
+
+
 def test_parser_trades_aggregates_in_same_timestep():
     dl = _make_downloader()
     dl.parser_trades(_TRADE_MSG)
@@ -86,6 +97,27 @@ def test_parser_trades_aggregates_in_same_timestep():
     assert len(dl._data[1000]['trades']) == 4
 
 
+def test_parser_trades_timestamp_in_seconds():
+    dl = _make_downloader()
+    dl.parser_trades(_TRADE_MSG)
+    assert dl._data[1000]['trades'][1]['timestamp'] == 1698796800.001
+    assert dl._data[1000]['trades'][1]['tid'] == 1698796800002
+
+
+def test_parser_trades_feed_bars():
+    dl = _make_downloader()
+    dl.ts, dl._bars_savers = 60, {}
+    dl.set_bars_saver(MagicMock())
+    dl.parser_trades(_TRADE_MSG)
+    # Only the bars are saved, the trades are not kept
+    assert dl._data == {}
+
+    bars = dl._bars.flush(1698796860)[60]
+    assert bars.loc[1698796800, ['open', 'low', 'volume']].tolist() == [
+        30000., 29999., 3.,
+    ]
+
+
 @pytest.mark.asyncio
 async def test_on_message_no_action_logs_info():
     dl = _make_downloader()
@@ -50,7 +50,7 @@ def test_malformed_response_raises(loader, monkeypatch):
     m = MagicMock()
     m.status_code = 200
     m.json.return_value = {}
-    monkeypatch.setattr("requests.get", lambda *a, **kw: m)
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: m)
     with pytest.raises(KeyError):
         loader._import_data(start=0)
 
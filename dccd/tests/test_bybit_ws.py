@@ -6,6 +6,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from dccd.continuous_dl.bybit import DownloadBybitData, _parser_book, _parser_trades
+from dccd.continuous_dl.orderbook import OrderBook
 
 # =========================================================================== #
 #                           Module-level parsers                              #
@@ -62,7 +63,7 @@ def _make_downloader() -> DownloadBybitData:
         obj = DownloadBybitData.__new__(DownloadBybitData)
         obj._data = {}
         obj.t = 2000
-        obj.d = {}
+        obj.d = OrderBook()
         obj.logger = MagicMock()
         return obj
 
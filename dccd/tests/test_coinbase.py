@@ -46,7 +46,7 @@ def test_malformed_response_raises(loader, monkeypatch):
     m = MagicMock()
     m.status_code = 200
     m.json.return_value = {"error": "bad"}
-    monkeypatch.setattr("requests.get", lambda *a, **kw: m)
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: m)
     with pytest.raises((TypeError, ValueError)):
         loader._import_data(start=0)
 
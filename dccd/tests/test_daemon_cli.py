@@ -14,6 +14,7 @@ import yaml
 from typer.testing import CliRunner
 
 from dccd.daemon.cli import app
+from dccd.tools.journal import get_journal, record_change
 
 runner = CliRunner()
 
@@ -58,6 +59,65 @@ def test_run_calls_run_once(config_file: Path) -> None:
         result = runner.invoke(app, ['run', '--config', str(config_file)])
     assert result.exit_code == 0
     mock_run_once.assert_called_once()
+    assert mock_run_once.call_args.kwargs['workers'] == 1
+
+
+def _run_config(tmp_path: Path, remotes: list) -> Path:
+    cfg = {**_MINIMAL_CONFIG,
+           'storage': {'local_path': str(tmp_path), 'remotes': remotes}}
+    config_file = tmp_path / 'config.yml'
+    config_file.write_text(yaml.dump(cfg))
+    return config_file
+
+
+def _write_file(tmp_path: Path):
+    def _run_once(*args, **kwargs):
+        record_change(str(tmp_path / 'Binance' / 'a.csv'))
+    return _run_once
+
+
+def test_run_pushes_the_files_written(tmp_path: Path) -> None:
+    config_file = _run_config(
+        tmp_path, [{'provider': 'rclone', 'remote': 'mynas:crypto'}],
+    )
+
+    with patch('dccd.daemon.health.HealthMonitor') as MockHealth, \
+         patch('dccd.daemon.scheduler.run_once', side_effect=_write_file(tmp_path)), \
+         patch('shutil.which', return_value='/usr/bin/rclone'), \
+         patch('dccd.daemon.storage.RemoteStorage.push_changes') as mock_push:
+        MockHealth.return_value.get_metrics.return_value = {}
+        result = runner.invoke(app, ['run', '--config', str(config_file)])
+
+    assert result.exit_code == 0
+    journal = mock_push.call_args.args[0]
+    assert journal.path == str(tmp_path / '.dccd' / 'run')
+    assert journal.changes('nas') == (1, ['Binance/a.csv'])
+    assert get_journal() is None
+
+
+def test_run_without_remotes_records_nothing(tmp_path: Path) -> None:
+    config_file = _run_config(tmp_path, [])
+
+    with patch('dccd.daemon.health.HealthMonitor') as MockHealth, \
+         patch('dccd.daemon.scheduler.run_once', side_effect=_write_file(tmp_path)) as mock_run_once, \
+         patch('dccd.daemon.storage.RemoteStorage.push_changes') as mock_push:
+        MockHealth.return_value.get_metrics.return_value = {}
+        result = runner.invoke(app, ['run', '--config', str(config_file)])
+
+    assert result.exit_code == 0
+    mock_run_once.assert_called_once()
+    mock_push.assert_not_called()
+    assert not (tmp_path / '.dccd' / 'run').exists()
+
+
+def test_run_workers_option(config_file: Path) -> None:
+    with patch('dccd.daemon.health.HealthMonitor') as MockHealth, \
+         patch('dccd.daemon.scheduler.run_once') as mock_run_once:
+        MockHealth.return_value.get_metrics.return_value = {}
+        result = runner.invoke(app, ['run', '--config', str(config_file),
+                                     '--workers', '8'])
+    assert result.exit_code == 0
+    assert mock_run_once.call_args.kwargs['workers'] == 8
 
 
 def test_status_no_metrics(config_file: Path) -> None:
@@ -156,6 +156,15 @@ def test_load_config_valid(tmp_path):
     assert cfg.histo_jobs[0].exchange == 'binance'
 
 
+def test_http_config_defaults_and_override():
+    cfg = CollectorConfig.model_validate(_VALID_CONFIG)
+    assert cfg.http.pool_size == 10 and cfg.http.keep_alive
+    cfg = CollectorConfig.model_validate({**_VALID_CONFIG, 'http': {'pool_size': 2}})
+    assert cfg.http.pool_size == 2
+    with pytest.raises(ValidationError):
+        CollectorConfig.model_validate({**_VALID_CONFIG, 'http': {'pool_size': 0}})
+
+
 def test_load_config_missing_file(tmp_path):
     with pytest.raises(FileNotFoundError):
         load_config(tmp_path / 'nonexistent.yml')
@@ -173,3 +182,31 @@ def test_load_config_validation_error(tmp_path):
     p = _make_config_file(tmp_path, bad)
     with pytest.raises(ValidationError):
         load_config(p)
+
+
+def test_streaming_config_layout():
+    cfg = CollectorConfig.model_validate(_VALID_CONFIG)
+    assert (cfg.streaming.layout, cfg.streaming.loops) == ('thread', 1)
+    cfg = CollectorConfig.model_validate(
+        {**_VALID_CONFIG, 'streaming': {'layout': 'shared', 'loops': 4}}
+    )
+    assert (cfg.streaming.layout, cfg.streaming.loops) == ('shared', 4)
+    with pytest.raises(ValidationError):
+        CollectorConfig.model_validate(
+            {**_VALID_CONFIG, 'streaming': {'layout': 'process'}}
+        )
+
+
+def test_scheduling_config():
+    cfg = CollectorConfig.model_validate(_VALID_CONFIG)
+    assert cfg.scheduling.mode == 'interval'
+    assert (cfg.scheduling.spread, cfg.scheduling.batch) == (0., False)
+    cfg = CollectorConfig.model_validate(
+        {**_VALID_CONFIG, 'scheduling': {'mode': 'aligned', 'grace': 10,
+                                         'spread': 0.2, 'batch': True}}
+    )
+    assert (cfg.scheduling.mode, cfg.scheduling.grace) == ('aligned', 10)
+    with pytest.raises(ValidationError):
+        CollectorConfig.model_validate(
+            {**_VALID_CONFIG, 'scheduling': {'spread': 1.}}
+        )
@@ -49,6 +49,16 @@ def test_record_failure_increments(monitor: HealthMonitor) -> None:
     assert m.last_success_at is None
 
 
+def test_concurrent_records_are_aggregated(monitor: HealthMonitor, tmp_path: Path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for _ in range(200):
+            pool.submit(monitor.record_success, 'binance', 'BTC/USDT', 1)
+    assert monitor.get_metrics()['binance/BTC/USDT'].rows_collected == 200
+    reloaded = HealthMonitor(tmp_path, AlertConfig())
+    assert reloaded.get_metrics()['binance/BTC/USDT'].rows_collected == 200
+
+
 def test_record_failure_triggers_webhook(tmp_path: Path) -> None:
     cfg = AlertConfig(webhook_url='http://example.com/hook', max_consecutive_errors=2)
     mon = HealthMonitor(tmp_path, cfg)
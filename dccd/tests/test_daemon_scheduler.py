@@ -1,18 +1,31 @@
 #!/usr/bin/env python3
 # coding: utf-8
 
+import asyncio
 from unittest.mock import MagicMock, patch
 
+import pytest
 from apscheduler.schedulers.background import BackgroundScheduler
 
-from dccd.daemon.config import CollectorConfig, HistoJob, StorageConfig
-from dccd.daemon.scheduler import build_histo_scheduler, run_histo_job, run_once
+from dccd.daemon.config import (
+    CollectorConfig,
+    HistoJob,
+    SchedulingConfig,
+    StorageConfig,
+)
+from dccd.daemon.scheduler import (
+    build_histo_scheduler,
+    run_histo_batch,
+    run_histo_job,
+    run_once,
+    run_once_async,
+)
 
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
-def _make_config(histo_jobs=None, tmp_path=None):
+def _make_config(histo_jobs=None, tmp_path=None, **scheduling):
     path = str(tmp_path) if tmp_path else '/data/crypto/'
     return CollectorConfig(
         storage=StorageConfig(local_path=path),
@@ -20,6 +33,7 @@ def _make_config(histo_jobs=None, tmp_path=None):
             HistoJob(exchange='binance', pairs=['BTC/USDT', 'ETH/USDT'], span=3600),
             HistoJob(exchange='kraken', pairs=['BTC/USD'], span=86400),
         ],
+        scheduling=SchedulingConfig(**scheduling),
     )
 
 
@@ -60,6 +74,67 @@ def test_scheduler_interval_seconds(tmp_path):
     assert job.trigger.interval.total_seconds() == 900
 
 
+def _first_runs(scheduler):
+    # Next run times of a scheduler not started yet
+    from datetime import datetime, timezone
+    now = datetime.now(timezone.utc)
+    return {j.id: j.trigger.get_next_fire_time(None, now).timestamp()
+            for j in scheduler.get_jobs()}
+
+
+def test_scheduler_spread_offsets(tmp_path):
+    import time
+    cfg = _make_config(
+        histo_jobs=[HistoJob(exchange='okx', pairs=['A/USDT', 'B/USDT',
+                                                    'C/USDT', 'D/USDT'],
+                             span=3600)],
+        tmp_path=tmp_path, spread=0.5,
+    )
+    t0 = time.time()
+    runs = _first_runs(build_histo_scheduler(cfg))
+    offsets = [runs[f'okx_{p}_USDT_3600'] - t0 - 3600 for p in 'ABCD']
+    assert offsets == pytest.approx([0, 450, 900, 1350], abs=5)
+
+
+def test_scheduler_aligned_after_candle_close(tmp_path):
+    cfg = _make_config(tmp_path=tmp_path, mode='aligned', grace=7, spread=0.5)
+    runs = _first_runs(build_histo_scheduler(cfg))
+    assert runs['binance_BTC_USDT_3600'] % 3600 == 7
+    assert runs['binance_ETH_USDT_3600'] % 3600 == 7 + 900
+    assert runs['kraken_BTC_USD_86400'] % 86400 == 7
+
+
+def test_scheduler_batch_one_job_per_histo_job(tmp_path):
+    cfg = _make_config(
+        histo_jobs=[
+            HistoJob(exchange='binance', pairs=['BTC/USDT', 'ETH/USDT'], span=3600),
+            HistoJob(exchange='binance', pairs=['SOL/USDT'], span=3600,
+                     format='csv'),
+            HistoJob(exchange='kraken', pairs=['BTC/USD'], span=86400),
+        ],
+        tmp_path=tmp_path, batch=True,
+    )
+    jobs = {j.id: j for j in build_histo_scheduler(cfg).get_jobs()}
+    assert set(jobs) == {'binance_3600', 'binance_3600_2', 'kraken_86400'}
+    assert jobs['binance_3600'].func is run_histo_batch
+    assert jobs['binance_3600'].kwargs['job'].pairs == ['BTC/USDT', 'ETH/USDT']
+
+
+def test_run_histo_batch_isolates_pairs(tmp_path):
+    job = HistoJob(exchange='binance', pairs=['BTC/USDT', 'ETH/USDT'], span=3600)
+    calls = []
+
+    def _job(job, pair, *args, **kwargs):
+        calls.append(pair)
+        if pair == 'BTC/USDT':
+            raise RuntimeError('network error')
+
+    with patch('dccd.daemon.scheduler.run_histo_job', side_effect=_job):
+        run_histo_batch(job, str(tmp_path))  # must not raise
+
+    assert calls == ['BTC/USDT', 'ETH/USDT']
+
+
 # ---------------------------------------------------------------------------
 # run_histo_job
 # ---------------------------------------------------------------------------
@@ -150,3 +225,94 @@ def test_run_once_logs_exception_on_failure(tmp_path, caplog):
             run_once(cfg)
 
     assert 'histo job failed' in caplog.text
+
+
+def test_run_once_workers_bounded_per_exchange(tmp_path):
+    import threading
+    import time
+    cfg = _make_config(
+        histo_jobs=[
+            HistoJob(exchange='okx', pairs=[f'C{i}/USDT' for i in range(8)],
+                     span=3600),
+            HistoJob(exchange='kraken', pairs=['BTC/USD', 'ETH/USD'],
+                     span=3600),
+        ],
+        tmp_path=tmp_path,
+    )
+    lock = threading.Lock()
+    running, peak, call_log = {}, {}, []
+
+    def _job(job, pair, *args, **kwargs):
+        with lock:
+            running[job.exchange] = running.get(job.exchange, 0) + 1
+            peak[job.exchange] = max(peak.get(job.exchange, 0),
+                                     running[job.exchange])
+        time.sleep(0.02)
+        with lock:
+            running[job.exchange] -= 1
+            call_log.append(pair)
+        if pair == 'C0/USDT':
+            raise RuntimeError('network error')
+
+    with patch('dccd.daemon.scheduler.run_histo_job', side_effect=_job):
+        run_once(cfg, workers=8)  # must not raise
+
+    assert len(call_log) == 10
+    assert peak['okx'] == 4  # FromOKX._max_concurrency
+    assert peak['kraken'] == 2
+
+
+def test_run_once_sequential_keeps_config_order(tmp_path):
+    cfg = _make_config(tmp_path=tmp_path)
+
+    with patch('dccd.daemon.scheduler.run_histo_job') as mock_job:
+        run_once(cfg)
+
+    order = [(c.args[0].exchange, c.args[1]) for c in mock_job.call_args_list]
+    assert order == [('binance', 'BTC/USDT'), ('binance', 'ETH/USDT'),
+                     ('kraken', 'BTC/USD')]
+
+
+def test_run_once_workers_not_held_by_exchange_cap(tmp_path):
+    import threading
+    cfg = _make_config(
+        histo_jobs=[HistoJob(exchange='okx', pairs=[f'C{i}/USDT' for i in range(10)],
+                             span=3600)],
+        tmp_path=tmp_path,
+    )
+    threads = set()
+
+    def _job(*args, **kwargs):
+        threads.add(threading.current_thread().name)
+
+    with patch('dccd.daemon.scheduler.run_histo_job', side_effect=_job) as mock_job:
+        run_once(cfg, workers=8)
+
+    assert mock_job.call_count == 10
+    # Only FromOKX._max_concurrency threads take the jobs of OKX
+    assert len(threads) <= 4
+
+
+# ---------------------------------------------------------------------------
+# run_once_async
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_run_once_async_bounded_and_isolated(tmp_path):
+    cfg = _make_config(tmp_path=tmp_path)
+    running, peak, call_log = [0], [0], []
+
+    async def _job(job, pair, *args, **kwargs):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0)
+        running[0] -= 1
+        call_log.append(pair)
+        if pair == 'BTC/USDT':
+            raise RuntimeError('network error')
+
+    with patch('dccd.daemon.scheduler.run_histo_job_async', side_effect=_job):
+        await run_once_async(cfg, max_jobs=2)  # must not raise
+
+    assert sorted(call_log) == ['BTC/USD', 'BTC/USDT', 'ETH/USDT']
+    assert peak[0] == 2
@@ -202,3 +202,128 @@ def test_push_path_outside_base_logs_error(tmp_path, caplog):
 
     mock_run.assert_not_called()
     assert 'not under base' in caplog.text
+
+
+# ---------------------------------------------------------------------------
+# push_changes() with a change journal
+# ---------------------------------------------------------------------------
+
+def _journal(tmp_path, *names):
+    from dccd.tools.journal import ChangeJournal
+    journal = ChangeJournal(str(tmp_path))
+    for name in names:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('x')
+        journal.record(str(path))
+    return journal
+
+
+def test_push_changes_first_sync_copies_root(tmp_path):
+    s = _storage(tmp_path, [_remote()])
+    journal = _journal(tmp_path, 'Binance/a.csv')
+
+    mock_result = MagicMock()
+    mock_result.returncode = 0
+
+    with patch('shutil.which', return_value='/usr/bin/rclone'):
+        with patch('subprocess.run', return_value=mock_result) as mock_run:
+            s.push_changes(journal)
+
+    assert mock_run.call_args[0][0] == [
+        'rclone', 'copy', '--exclude', '/.dccd/**', str(tmp_path.resolve()),
+        'mynas:crypto',
+    ]
+    assert journal.watermark('mynas:crypto/') == 1
+    assert journal.changes('mynas:crypto/') == (1, [])
+
+
+def test_push_changes_sends_files_from_list(tmp_path):
+    s = _storage(tmp_path, [_remote()])
+    journal = _journal(tmp_path, 'Binance/a.csv')
+    journal.commit('mynas:crypto/', 1)
+    for name in ('Kraken/b.csv', 'Binance/a.csv'):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text('y')
+        journal.record(str(tmp_path / name))
+    journal.record(str(tmp_path / 'removed.parquet'))
+
+    listed = []
+
+    def _run(args, **kwargs):
+        listed.append(open(args[args.index('--files-from-raw') + 1]).read())
+        return MagicMock(returncode=0)
+
+    with patch('shutil.which', return_value='/usr/bin/rclone'):
+        with patch('subprocess.run', side_effect=_run) as mock_run:
+            s.push_changes(journal)
+
+    copy, delete = [c[0][0] for c in mock_run.call_args_list]
+    assert copy[1] == 'copy' and '--no-traverse' in copy
+    assert copy[-2:] == [str(tmp_path.resolve()), 'mynas:crypto']
+    # Recorded but removed since, e.g. a merged parquet part
+    assert delete[1] == 'delete' and delete[-1] == 'mynas:crypto'
+    assert listed == ['Binance/a.csv\nKraken/b.csv\n', 'removed.parquet\n']
+    assert journal.watermark('mynas:crypto/') == 4
+
+
+def test_push_changes_failed_delete_keeps_watermark(tmp_path):
+    s = _storage(tmp_path, [_remote()])
+    journal = _journal(tmp_path, 'Binance/a.csv')
+    journal.commit('mynas:crypto/', 1)
+    (tmp_path / 'Binance' / 'a.csv').unlink()
+    journal.record(str(tmp_path / 'Binance' / 'a.csv'))
+
+    with patch('shutil.which', return_value='/usr/bin/rclone'):
+        with patch('subprocess.run',
+                   return_value=MagicMock(returncode=1, stderr='err')) as mock_run:
+            s.push_changes(journal)
+
+    assert mock_run.call_args[0][0][1] == 'delete'
+    assert journal.watermark('mynas:crypto/') == 1
+    assert journal.changes('mynas:crypto/') == (2, ['Binance/a.csv'])
+
+
+def test_push_changes_nothing_to_push(tmp_path):
+    s = _storage(tmp_path, [_remote()])
+    journal = _journal(tmp_path, 'Binance/a.csv')
+    journal.commit('mynas:crypto/', 1)
+
+    with patch('shutil.which', return_value='/usr/bin/rclone'):
+        with patch('subprocess.run') as mock_run:
+            s.push_changes(journal)
+
+    mock_run.assert_not_called()
+
+
+def test_push_changes_failed_remote_keeps_watermark(tmp_path):
+    s = _storage(tmp_path, _remotes('mynas:crypto/', 's3:bucket/crypto/'))
+    journal = _journal(tmp_path, 'Binance/a.csv')
+    journal.commit('mynas:crypto/', 0)
+    journal.commit('s3:bucket/crypto/', 0)
+
+    def _run(args, **kwargs):
+        return MagicMock(returncode=int(args[-1].startswith('s3')), stderr='err')
+
+    with patch('shutil.which', return_value='/usr/bin/rclone'):
+        with patch('subprocess.run', side_effect=_run) as mock_run:
+            s.push_changes(journal)
+
+    assert mock_run.call_count == 2
+    assert journal.watermark('mynas:crypto/') == 1
+    assert journal.watermark('s3:bucket/crypto/') == 0
+    assert journal.changes('s3:bucket/crypto/') == (1, ['Binance/a.csv'])
+
+
+def test_push_timeout_logs_error(tmp_path, caplog):
+    import logging
+    import subprocess
+    s = _storage(tmp_path, [_remote()])
+
+    with patch('shutil.which', return_value='/usr/bin/rclone'):
+        with patch('subprocess.run',
+                   side_effect=subprocess.TimeoutExpired('rclone', 300)):
+            with caplog.at_level(logging.ERROR, logger='dccd.daemon.storage'):
+                s.push(tmp_path)
+
+    assert 'timed out' in caplog.text
@@ -197,10 +197,37 @@ def test_sync_service_sync_now_calls_push(tmp_path):
         remotes=[RemoteConfig(provider='rclone', remote='mynas:crypto/')],
     ))
     with patch.object(svc._storage, 'push') as mock_push:
-        svc.sync_now()
+        svc.sync_now(full=True)
     mock_push.assert_called_once_with(str(tmp_path))
 
 
+def test_sync_service_sync_now_pushes_journal(tmp_path):
+    from dccd.daemon.config import RemoteConfig
+    svc = SyncService(_storage_cfg(
+        tmp_path,
+        remotes=[RemoteConfig(provider='rclone', remote='mynas:crypto/')],
+    ))
+    with patch.object(svc._storage, 'push_changes') as mock_push:
+        svc.sync_now()
+    mock_push.assert_called_once_with(svc.journal)
+
+
+def test_sync_service_installs_journal(tmp_path):
+    from dccd.daemon.config import RemoteConfig
+    from dccd.tools.journal import get_journal
+    svc = SyncService(_storage_cfg(
+        tmp_path,
+        remotes=[RemoteConfig(provider='rclone', remote='mynas:crypto/')],
+        sync_interval=3600,
+    ))
+    svc.start()
+    try:
+        assert get_journal() is svc.journal
+    finally:
+        svc.stop()
+    assert get_journal() is None
+
+
 # ---------------------------------------------------------------------------
 # StreamManager.start / stop
 # ---------------------------------------------------------------------------
@@ -366,3 +393,94 @@ def test_run_once_bitfinex_sets_parser(tmp_path):
 
     mock_obj.get_parser.assert_called_once_with('trades')
     assert mock_obj.parser is mock_obj.get_parser.return_value
+
+
+# ---------------------------------------------------------------------------
+# StreamManager, shared event loops
+# ---------------------------------------------------------------------------
+
+def test_stream_manager_shared_layout_spreads_streams(tmp_path):
+    import threading
+
+    cfg = _make_config(tmp_path, jobs=[
+        _stream_job(exchange='binance', pairs=['BTC/USDT', 'ETH/USDT', 'SOL/USDT']),
+    ])
+    cfg.streaming.layout, cfg.streaming.loops = 'shared', 2
+    mgr = StreamManager(cfg)
+    threads = {}
+
+    async def _fake_forever(job, pair, channels):
+        threads[pair] = threading.current_thread().name
+
+    with patch.object(mgr, '_run_forever_async', side_effect=_fake_forever):
+        with patch.object(mgr._sync, 'start'):
+            mgr.start()
+
+        for future in mgr._tasks.values():
+            future.result(timeout=5)
+
+    with patch.object(mgr._sync, 'stop'):
+        mgr.stop()
+
+    for t in mgr._threads.values():
+        t.join(timeout=5)
+
+    assert sorted(mgr._threads) == ['stream-loop-0', 'stream-loop-1']
+    assert len(mgr._tasks) == 3
+    assert threads == {'BTC/USDT': 'stream-loop-0', 'ETH/USDT': 'stream-loop-1',
+                       'SOL/USDT': 'stream-loop-0'}
+    assert all(loop.is_closed() for loop in mgr._loops)
+
+
+@pytest.mark.asyncio
+async def test_run_once_async_crash_cancels_stream(tmp_path):
+    import asyncio
+
+    cfg = _make_config(tmp_path)
+    mgr = StreamManager(cfg)
+    cancelled = asyncio.Event()
+    saver = MagicMock()
+
+    class _FakeDownloader:
+        async def _connect(self, **kwargs):
+            await asyncio.sleep(0)
+            raise RuntimeError('crash')
+
+        async def _loop(self):
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+    mgr._downloaders['key'] = dl = _FakeDownloader()
+    with patch.object(mgr, '_setup', return_value=('key', dl, saver)):
+        with pytest.raises(RuntimeError):
+            await mgr._run_once_async(_stream_job(), 'BTC/USDT', ['trades'])
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    assert dl.save_in_thread is True
+    saver.close.assert_called_once()
+    assert 'key' not in mgr._downloaders
+
+
+@pytest.mark.asyncio
+async def test_run_forever_async_restarts_on_exception(tmp_path):
+    cfg = _make_config(tmp_path)
+    health = MagicMock()
+    mgr = StreamManager(cfg, health=health)
+    calls = []
+
+    async def _side_effect(job, pair, channels):
+        calls.append(pair)
+        if len(calls) == 1:
+            raise RuntimeError('crash')
+        mgr._stop_event.set()
+
+    with patch.object(mgr, '_run_once_async', side_effect=_side_effect), \
+         patch('dccd.daemon.stream_manager._RESTART_DELAY', 0):
+        await mgr._run_forever_async(_stream_job(), 'BTC/USDT', ['trades'])
+
+    assert calls == ['BTC/USDT', 'BTC/USDT']
+    health.record_failure.assert_called_once_with('binance', 'BTC/USDT')
+    health.record_success.assert_called_once_with('binance', 'BTC/USDT')
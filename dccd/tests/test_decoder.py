@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from dccd.tools import decoder
+from dccd.tools.decoder import get_decoder
+from dccd.tools.websocket import BasisWebSocket
+
+_MSG = '{"stream": "btcusdt@depth@100ms", "data": {"b": [["1.5", "2"]], "a": []}}'
+
+
+@pytest.mark.parametrize('backend', ['auto', 'json', 'orjson', 'msgspec'])
+def test_backends_decode_the_same(backend):
+    if backend == 'orjson' and not decoder.HAS_ORJSON:
+        pytest.skip('orjson not installed')
+    if backend == 'msgspec' and not decoder.HAS_MSGSPEC:
+        pytest.skip('msgspec not installed')
+
+    decode = get_decoder(backend)
+    assert decode(_MSG) == json.loads(_MSG)
+    assert decode(_MSG.encode()) == json.loads(_MSG)
+
+
+def test_auto_falls_back_to_stdlib():
+    with patch.object(decoder, 'HAS_MSGSPEC', False), \
+         patch.object(decoder, 'HAS_ORJSON', False):
+        assert get_decoder() is json.loads
+
+
+def test_missing_backend_raises():
+    with patch.object(decoder, 'HAS_ORJSON', False):
+        with pytest.raises(ImportError, match='orjson'):
+            get_decoder('orjson')
+
+
+def test_invalid_arguments_raise():
+    with pytest.raises(ValueError, match='Unknown JSON backend'):
+        get_decoder('ujson')
+    with pytest.raises(ValueError, match='requires msgspec'):
+        get_decoder('orjson', type=dict)
+
+
+@pytest.mark.skipif(not decoder.HAS_MSGSPEC, reason='msgspec not installed')
+def test_typed_decoding():
+    decode = get_decoder(type=dict[str, list[tuple[str, str]]])
+    assert decode('{"b": [["1.5", "2"]]}') == {'b': [('1.5', '2')]}
+
+
+def test_websocket_decoder():
+    ws = BasisWebSocket('wss://example.com', decoder='json')
+    assert ws.decode is json.loads
+    ws = BasisWebSocket('wss://example.com', decoder=len)
+    assert ws.decode is len
@@ -3,8 +3,10 @@
 
 
 import logging
+from unittest.mock import MagicMock
 
 import pandas as pd
+import pytest
 
 from dccd.histo_dl.exchange import ImportDataCryptoCurrencies
 
@@ -19,7 +21,6 @@ class _ConcreteDownloader(ImportDataCryptoCurrencies):
 def _make_obj(full_path: str) -> ImportDataCryptoCurrencies:
     obj = _ConcreteDownloader.__new__(_ConcreteDownloader)
     obj.logger = logging.getLogger(__name__)
-    obj.last_df = pd.DataFrame()
     obj.full_path = full_path
     return obj
 
@@ -58,3 +59,178 @@ def test_get_last_date_unsupported_format(tmp_path):
     (tmp_path / 'data.json').write_text('{}')
     obj = _make_obj(str(tmp_path))
     assert obj._get_last_date() == _FALLBACK_TS
+
+
+def test_get_last_date_csv_tail_of_large_file(tmp_path):
+    ts = list(range(1700000000, 1700000000 + 60 * 20000, 60))
+    pd.DataFrame({'open': 1., 'TS': ts}).to_csv(tmp_path / 'a.csv', index=False)
+    obj = _make_obj(str(tmp_path))
+    assert obj._get_last_date() == ts[-1]
+
+
+def test_get_last_date_parquet_footer(tmp_path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    table = pa.table({'TS': list(range(1700000000, 1700001000, 10))})
+    pq.write_table(table, tmp_path / 'a.parquet', row_group_size=7)
+    obj = _make_obj(str(tmp_path))
+    assert obj._get_last_date() == 1700000990
+
+
+def test_get_last_date_reads_watermark(tmp_path):
+    from dccd.histo_dl.watermark import write_watermark
+    _sample_df().to_csv(tmp_path / 'data_2023.csv', index=False)
+    write_watermark(str(tmp_path), 1700099999, 'data_2023.csv')
+    obj = _make_obj(str(tmp_path))
+    assert obj._get_last_date() == 1700099999
+
+    # Stale once the file is modified by another writer
+    with open(tmp_path / 'data_2023.csv', 'a') as f:
+        f.write('1700010800\n')
+    assert obj._get_last_date() == 1700010800
+
+
+def _ohlc(ts, close):
+    df = pd.DataFrame({'TS': ts, 'close': close, 'high': close, 'low': close,
+                       'open': close, 'quoteVolume': 1., 'volume': 1.,
+                       'weightedAverage': close})
+    df = df.assign(Date=pd.to_datetime(df.TS, unit='s'))
+    return df.assign(date=df.Date.dt.date, time=df.Date.dt.time)
+
+
+def test_save_csv_appends_and_replaces_overlap(tmp_path):
+    obj = _ConcreteDownloader(str(tmp_path), 'BTC', 3600, 'Test', 'USD')
+    obj.df = _ohlc([1700000000, 1700003600, 1700007200], [1., 2., 3.])
+    obj.save(form='csv')
+    assert obj._get_last_date() == 1700007200
+
+    obj = _ConcreteDownloader(str(tmp_path), 'BTC', 3600, 'Test', 'USD')
+    obj.df = _ohlc([1700007200, 1700010800], [30., 4.])
+    obj.save(form='csv')
+    assert obj._get_last_date() == 1700010800
+
+    saved = pd.read_csv(tmp_path / 'Test/Data/Clean_Data/Hourly/BTCUSD'
+                        / 'Hourly_of_BTCUSD_in_2023.csv')
+    assert saved['close'].tolist() == [1., 2., 30., 4.]
+
+
+def test_save_parquet_upserts_touched_period(tmp_path):
+    pytest.importorskip('pyarrow')
+    obj = _ConcreteDownloader(str(tmp_path), 'BTC', 86400, 'Test', 'USD')
+    obj.df = _ohlc([1703894400, 1703980800], [1., 2.])  # 2023-12-30, 31
+    obj.save(form='parquet')
+
+    obj = _ConcreteDownloader(str(tmp_path), 'BTC', 86400, 'Test', 'USD')
+    assert obj._get_last_date() == 1703980800
+    obj.df = _ohlc([1703980800, 1704067200], [20., 3.])  # 2023-12-31, 2024-01-01
+    obj.save(form='parquet')
+
+    root = tmp_path / 'Test/Data/Clean_Data/Daily/BTCUSD'
+    saved = pd.read_parquet(root / 'Daily_of_BTCUSD_in_2023.parquet')
+    assert saved['close'].tolist() == [1., 20.]
+    saved = pd.read_parquet(root / 'Daily_of_BTCUSD_in_2024.parquet')
+    assert saved['TS'].tolist() == [1704067200]
+    (root / '.watermark.json').unlink()
+    assert obj._get_last_date() == 1704067200
+
+
+def test_truncate_csv_keeps_header(tmp_path):
+    from dccd.histo_dl.watermark import truncate_csv
+    path = tmp_path / 'a.csv'
+    path.write_text('TS,close\n1,1.0\n2,2.0\n3,3.0\n')
+    truncate_csv(str(path), 2)
+    assert path.read_text() == 'TS,close\n1,1.0\n'
+    truncate_csv(str(path), 0)
+    assert path.read_text() == 'TS,close\n'
+
+
+# ---------------------------------------------------------------------------
+# Backfill engine
+# ---------------------------------------------------------------------------
+
+class _PagedDownloader(_ConcreteDownloader):
+    _max_bars = 3
+    _max_concurrency = 2
+
+    def _import_window(self, start, end):
+        return [{'date': float(t)} for t in range(start, end + 1, self.span)]
+
+
+def _make_paged() -> _PagedDownloader:
+    obj = _PagedDownloader.__new__(_PagedDownloader)
+    obj.logger = logging.getLogger(__name__)
+    obj.platform = 'Paged'
+    obj.pair = 'BTCUSD'
+    obj.span = 60
+    return obj
+
+
+def test_windows_split_by_max_bars():
+    obj = _make_paged()
+    assert obj._windows(0, 420) == [(0, 120), (180, 300), (360, 420)]
+
+
+def test_windows_single_when_not_paginated():
+    obj = _make_obj('/tmp')
+    obj.span = 60
+    assert obj._windows(0, 6000) == [(0, 6000)]
+
+
+def test_backfill_stitches_windows_in_order():
+    obj = _make_paged()
+    data = obj._backfill(0, 1200)
+    assert [d['date'] for d in data] == [float(t) for t in range(0, 1260, 60)]
+
+
+# ---------------------------------------------------------------------------
+# Paginated trades
+# ---------------------------------------------------------------------------
+
+class _TradesDownloader(_ConcreteDownloader):
+    fail_at = None
+
+    def __init__(self, path):
+        super().__init__(path, 'BTC', 60, 'Test', 'USD')
+        self.requests = []
+
+    def _fetch(self, url, params):
+        self.requests.append(params['fromId'])
+        if params['fromId'] == self.fail_at:
+            raise ConnectionError('interrupted')
+        return MagicMock()
+
+    def _iter_trades(self, start, end, cursor=None):
+        tid, data = cursor or 0, []
+        while tid < 6:
+            yield 'url', {'fromId': tid}
+            page = [{'tid': i, 'timestamp': float(start + i), 'price': 1.,
+                     'amount': 1., 'type': 'buy'} for i in (tid, tid + 1)]
+            tid += 2
+            data += self._page_trades(page, tid)
+        return data
+
+
+def test_import_trades_resumes_from_saved_cursor(tmp_path):
+    obj = _TradesDownloader(str(tmp_path))
+    obj.fail_at = 4
+    with pytest.raises(ConnectionError):
+        obj.import_trades(start=100, end=200)
+
+    obj.fail_at, obj.requests = None, []
+    obj.import_trades(start=100, end=200)
+    assert obj.requests == [4]
+    assert list(obj.trades_df['tid']) == list(range(6))
+    assert list(obj.trades_df['TS']) == [float(100 + i) for i in range(6)]
+    assert not list(tmp_path.rglob('.trades_*'))
+
+
+def test_import_trades_restarts_other_window(tmp_path):
+    obj = _TradesDownloader(str(tmp_path))
+    obj.fail_at = 4
+    with pytest.raises(ConnectionError):
+        obj.import_trades(start=100, end=200)
+
+    obj.fail_at, obj.requests = None, []
+    obj.import_trades(start=150, end=200)
+    assert obj.requests == [0, 2, 4]
+    assert list(obj.trades_df['TS'])[0] == 150.
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from dccd.tools import http
+from dccd.tools.http import PooledSession, configure_http, connection_stats, get_session
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'[]'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = HTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:{}/'.format(srv.server_port)
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_keep_alive_reuses_connection(server):
+    session = PooledSession(pool_size=2)
+    for _ in range(5):
+        assert session.get(server).status_code == 200
+    assert session.stats() == {'requests': 5, 'connections': 1, 'reused': 4}
+    session.close()
+
+
+def test_no_keep_alive_opens_connection_per_request(server):
+    session = PooledSession(keep_alive=False)
+    for _ in range(3):
+        session.get(server)
+    assert session.stats()['connections'] == 3
+    session.close()
+
+
+def test_default_timeout_applied(monkeypatch):
+    seen = {}
+
+    def _send(self, request, **kwargs):
+        seen.update(kwargs)
+        raise RuntimeError
+
+    monkeypatch.setattr('requests.Session.send', _send)
+    with pytest.raises(RuntimeError):
+        PooledSession(timeout=3.).get('http://example.invalid/')
+    assert seen['timeout'] == 3.
+
+
+def test_get_session_shared_and_reset_by_configure():
+    a = get_session('test-http')
+    assert a is get_session('test-http')
+    assert 'test-http' in connection_stats()
+    configure_http(timeout=5.)
+    try:
+        b = get_session('test-http')
+        assert b is not a
+        assert b.timeout == 5.
+    finally:
+        configure_http(timeout=30.)
+    assert http._SETTINGS['timeout'] == 30.
@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 # coding: utf-8
 
+import os
 import sqlite3
 
 import pandas as pd
 import pytest
 
-from dccd.tools.io import IODataBase, get_df, save_df
+from dccd.tools.io import IODataBase, ParquetDataset, get_df, save_df
 
 _DF = pd.DataFrame({'a': [1, 2], 'b': [3.0, 4.0]})
 
@@ -81,6 +82,39 @@ def test_save_as_sqlite(tmp_data_path):
     assert len(result) == 2
 
 
+def test_save_as_sqlite_keeps_connection(tmp_data_path):
+    db = IODataBase(tmp_data_path, 'sqlite')
+    db.save_as_sqlite(_DF, name='test', table='data')
+    conn = db._sqlite_conns[tmp_data_path + '/test.db']
+    db.save_as_sqlite(_DF, name='test', table='data')
+    assert list(db._sqlite_conns.values()) == [conn]
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert len(db.get_from_sqlite('test', table='data')) == 4
+
+
+def test_close_connections(tmp_data_path):
+    with IODataBase(tmp_data_path, 'sqlite') as db:
+        db.save_as_sqlite(_DF, name='test', table='data')
+        conn = db._sqlite_conns[tmp_data_path + '/test.db']
+
+    assert db._sqlite_conns == {}
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute('SELECT 1')
+
+
+def test_save_as_sql_reuses_engine(tmp_data_path):
+    db = IODataBase(tmp_data_path, 'sqlite')
+    db.save_as_sql(_DF, name='test', ext='.sql.db', table='data')
+    db.save_as_sql(_DF, name='test', ext='.sql.db', table='data')
+    assert len(db._engines) == 1
+    engine, = db._engines.values()
+    with engine.connect() as conn:
+        assert len(pd.read_sql('SELECT * FROM data', con=conn)) == 4
+
+    db.close()
+    assert db._engines == {}
+
+
 # --- Excel ---
 
 def test_save_as_excel(tmp_data_path):
@@ -131,6 +165,81 @@ def test_save_as_parquet_append(tmp_data_path):
     assert len(result) == 4
 
 
+def test_save_as_parquet_dataset(tmp_data_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    db = IODataBase(tmp_data_path, 'parquet')
+    path = tmp_data_path + '/test.parquet'
+    db.save_as_parquet(_DF, name='test', dataset=True)
+    first = ParquetDataset(path).parts()[0]
+    mtime = os.stat(first).st_mtime_ns
+    db.save_as_parquet(_DF + 10, name='test', dataset=True)
+    # The first part is not rewritten
+    assert os.stat(first).st_mtime_ns == mtime
+    assert len(os.listdir(path)) == 4  # two parts, _metadata, _common_metadata
+    assert pq.read_metadata(path + '/_metadata').num_rows == 4
+    result = db.get_from_parquet('test')
+    assert result.a.tolist() == [1, 2, 11, 12]
+    pd.testing.assert_frame_equal(pd.read_parquet(path), result)
+
+
+def test_parquet_dataset_from_file(tmp_data_path):
+    pytest.importorskip('pyarrow')
+    db = IODataBase(tmp_data_path, 'parquet')
+    db.save_as_parquet(_DF, name='test')
+    db.save_as_parquet(_DF, name='test', dataset=True)
+    assert os.path.isdir(tmp_data_path + '/test.parquet')
+    assert len(db.get_from_parquet('test')) == 4
+
+
+def test_parquet_dataset_compaction(tmp_data_path):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    ds = ParquetDataset(tmp_data_path + '/ds', compact_every=3)
+    for i in range(3):
+        ds.append(pa.table({'a': [i, i]}))
+
+    ds._compactor.join()
+    assert len(ds.parts()) == 1
+    assert ds.read().a.tolist() == [0, 0, 1, 1, 2, 2]
+    metadata = pq.read_metadata(tmp_data_path + '/ds/_metadata')
+    assert (metadata.num_rows, metadata.num_row_groups) == (6, 1)
+    ds.append(pa.table({'a': [3]}))
+    assert ds.read().a.tolist()[-1] == 3
+
+
+def test_parquet_dataset_schema_mismatch(tmp_data_path):
+    pa = pytest.importorskip('pyarrow')
+    ds = ParquetDataset(tmp_data_path + '/ds')
+    ds.append(pa.table({'a': [1.], 'b': [2.]}))
+    ds.append(pa.table({'b': [4], 'a': [3]}))
+    assert ds.read().to_dict('list') == {'a': [1., 3.], 'b': [2., 4.]}
+    with pytest.raises(ValueError):
+        ds.append(pa.table({'c': [1.]}))
+
+
+def test_parquet_dataset_truncate(tmp_data_path):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    ds = ParquetDataset(tmp_data_path + '/ds')
+    first = ds.append(pa.table({'TS': [1, 2, 3]}))
+    mtime = os.stat(first).st_mtime_ns
+    ds.append(pa.table({'TS': [4, 5]}))
+    ds.append(pa.table({'TS': [6]}))
+
+    ds.truncate('TS', 5)
+    assert ds.read().TS.tolist() == [1, 2, 3, 4]
+    assert len(ds.parts()) == 2
+    assert os.stat(first).st_mtime_ns == mtime  # not rewritten
+    assert pq.read_metadata(tmp_data_path + '/ds/_metadata').num_rows == 4
+
+    ds.truncate('TS', 0)
+    assert ds.parts() == [] and ds.read().empty
+    ds.append(pa.table({'TS': [7]}))
+    assert ds.read().TS.tolist() == [7]
+    with pytest.raises(ValueError):
+        ds.truncate('price', 0)
+
+
 # --- Polars ---
 
 def test_save_as_polars(tmp_data_path):
@@ -140,3 +249,36 @@ def test_save_as_polars(tmp_data_path):
     result = pl.read_parquet(tmp_data_path + '/test.parquet')
     assert 'a' in result.columns
     assert len(result) == 2
+
+
+def test_save_as_polars_dataset(tmp_data_path):
+    pl = pytest.importorskip('polars')
+    db = IODataBase(tmp_data_path, 'polars')
+    db.save_as_polars(_DF, name='test', dataset=True)
+    db.save_as_polars(_DF, name='test', dataset=True)
+    result = pl.read_parquet(tmp_data_path + '/test.parquet/part-*.parquet')
+    assert len(result) == 4
+
+
+def test_arrow_written_without_pandas(tmp_data_path):
+    pa = pytest.importorskip('pyarrow')
+    db = IODataBase(tmp_data_path, 'parquet')
+    assert db.native_arrow
+    batch = pa.RecordBatch.from_pydict({'a': [1, 2], 'b': [3.0, 4.0]})
+    db(batch, name='test')
+    db(batch, name='test')
+    result = pd.read_parquet(tmp_data_path + '/test.parquet')
+    assert result.a.tolist() == [1, 2, 1, 2]
+
+    # Appended to a file written from pandas, with its index
+    db.save_as_parquet(_DF, name='old')
+    db(batch, name='old')
+    assert len(pd.read_parquet(tmp_data_path + '/old.parquet')) == 4
+
+
+def test_arrow_converted_for_csv(tmp_data_path):
+    pa = pytest.importorskip('pyarrow')
+    db = IODataBase(tmp_data_path, 'csv')
+    assert not db.native_arrow
+    db(pa.table({'a': [1, 2]}), name='test', index=False)
+    assert pd.read_csv(tmp_data_path + '/test.csv').a.tolist() == [1, 2]
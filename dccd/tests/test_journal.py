@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+# Third party packages
+import pandas as pd
+import pytest
+
+# Local packages
+from dccd.tools.io import IODataBase
+from dccd.tools.journal import (
+    ChangeJournal,
+    get_journal,
+    record_change,
+    set_journal,
+)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = ChangeJournal(str(tmp_path))
+    previous = set_journal(journal)
+    yield journal
+    set_journal(previous)
+    journal.close()
+
+
+def test_record_ignores_paths_outside_root(tmp_path, journal):
+    journal.record(str(tmp_path / 'a' / 'b.csv'))
+    journal.record(str(tmp_path.parent / 'other.csv'))
+    journal.record(str(tmp_path / '.dccd' / 'run' / 'journal.log'))
+
+    assert journal.changes('nas') == (1, ['a/b.csv'])
+
+
+def test_changes_per_remote(tmp_path, journal):
+    journal.record(str(tmp_path / 'a.csv'))
+    journal.commit('s3', 0)
+    journal.commit('nas', 1)
+    journal.record(str(tmp_path / 'b.csv'))
+
+    assert journal.changes('nas') == (2, ['b.csv'])
+    assert journal.changes('s3') == (2, ['a.csv', 'b.csv'])
+    assert journal.watermark('nas') == 1
+    assert journal.watermark('s3') == 0
+    assert journal.watermark('sftp') is None
+
+
+def test_rewritten_file_is_pushed_again(tmp_path, journal):
+    journal.record(str(tmp_path / 'a.csv'))
+    seq, _ = journal.changes('nas')
+    journal.record(str(tmp_path / 'a.csv'))
+    journal.commit('nas', seq)
+
+    assert journal.changes('nas') == (2, ['a.csv'])
+
+
+def test_reload_keeps_pending_and_watermarks(tmp_path, journal):
+    for name in ('a.csv', 'b.csv', 'c.csv'):
+        journal.record(str(tmp_path / name))
+    journal.commit('s3', 1)
+    journal.commit('nas', 2)
+    journal.close()
+
+    reloaded = ChangeJournal(str(tmp_path))
+    assert reloaded.changes('nas') == (3, ['c.csv'])
+    assert reloaded.changes('s3') == (3, ['b.csv', 'c.csv'])
+
+    # Log compacted to the files not pushed to every remote
+    log = (tmp_path / '.dccd' / 'journal.log').read_text().splitlines()
+    assert log == ['2\tb.csv', '3\tc.csv']
+
+
+def test_sequence_survives_compaction(tmp_path, journal):
+    journal.record(str(tmp_path / 'a.csv'))
+    journal.commit('nas', 1)
+    journal.close()
+
+    reloaded = ChangeJournal(str(tmp_path))
+    reloaded.record(str(tmp_path / 'b.csv'))
+    assert reloaded.changes('nas') == (2, ['b.csv'])
+    reloaded.close()
+
+
+def test_truncated_log_line_is_skipped(tmp_path):
+    (tmp_path / '.dccd').mkdir()
+    (tmp_path / '.dccd' / 'journal.log').write_text('1\ta.csv\n2\tb.c')
+    journal = ChangeJournal(str(tmp_path))
+
+    assert journal.changes('nas') == (2, ['a.csv', 'b.c'])
+    (tmp_path / '.dccd' / 'journal.log').write_text('1\ta.csv\n2')
+    assert ChangeJournal(str(tmp_path)).changes('nas') == (1, ['a.csv'])
+
+
+def test_record_change_without_journal(tmp_path):
+    assert get_journal() is None
+    record_change(str(tmp_path / 'a.csv'))
+
+
+def test_savers_record_their_files(tmp_path, journal):
+    df = pd.DataFrame({'price': [1.0]})
+    IODataBase(str(tmp_path / 'csv'), method='csv')(df, name='trades')
+    IODataBase(str(tmp_path / 'pq'), method='parquet')(
+        df, name='trades', dataset=True,
+    )
+
+    _, files = journal.changes('nas')
+    assert 'csv/trades.csv' in files
+    assert 'pq/trades.parquet/_metadata' in files
+    assert any(f.startswith('pq/trades.parquet/part-') for f in files)
+
+
+def test_dataset_records_removed_parts(tmp_path, journal):
+    pa = pytest.importorskip('pyarrow')
+    from dccd.tools.io import ParquetDataset
+
+    ds = ParquetDataset(str(tmp_path / 'trades.parquet'), compact_every=0)
+    parts = [ds.append(pa.table({'TS': [float(i)]})) for i in range(3)]
+    names = ['trades.parquet/' + p.rsplit('/', 1)[1] for p in parts]
+    journal.commit('nas', journal.changes('nas')[0])
+    ds.compact()
+
+    # Merged into the first part, the others are removed
+    assert journal.changes('nas')[1] == sorted(
+        names + ['trades.parquet/_metadata']
+    )
+    assert not any((tmp_path / n).exists() for n in names[1:])
+
+    journal.commit('nas', journal.changes('nas')[0])
+    ds.truncate('TS', 0.)
+    assert journal.changes('nas')[1] == ['trades.parquet/_metadata', names[0]]
+    assert not (tmp_path / names[0]).exists()
@@ -53,7 +53,7 @@ def test_malformed_response_raises(loader, monkeypatch):
     m = MagicMock()
     m.status_code = 200
     m.json.return_value = {}
-    monkeypatch.setattr("requests.get", lambda *a, **kw: m)
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: m)
     with pytest.raises(KeyError):
         loader._import_data(start=0)
 
@@ -78,3 +78,17 @@ def test_import_orderbook(loader, mock_kraken_depth):
 def test_import_trades_http_500_raises(loader, mock_http_500):
     with pytest.raises(ValueError):
         loader._import_trades(start=0, end=1)
+
+
+def test_import_trades_paginates_by_since(loader, mock_pages):
+    loader._trades_limit = 2
+    t = 1746057600
+
+    def _page(ts, last):
+        trades = [['50000', '0.1', float(x), 'b', 'l', '', 0] for x in ts]
+        return {'result': {'XXBTZUSD': trades, 'last': last}}
+
+    calls = mock_pages(_page([t, t + 1], '101'), _page([t + 2, t + 9], '102'))
+    data = loader._import_trades(start=t, end=t + 5)
+    assert [c['since'] for c in calls] == [t, '101']
+    assert [d['timestamp'] for d in data] == [t, t + 1, t + 2]
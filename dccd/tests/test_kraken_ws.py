@@ -1,16 +1,22 @@
 #!/usr/bin/env python3
 # coding: utf-8
 
-from unittest.mock import MagicMock, patch
+import asyncio
+import json
+import zlib
+from collections import deque
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from dccd.continuous_dl.kraken import (
     DownloadKrakenData,
+    _kraken_checksum,
     _parser_book,
     _parser_kline,
     _parser_trades,
 )
+from dccd.continuous_dl.orderbook import OrderBook
 
 # =========================================================================== #
 #                           Module-level parsers                              #
@@ -88,8 +94,11 @@ def _make_downloader() -> DownloadKrakenData:
         obj = DownloadKrakenData.__new__(DownloadKrakenData)
         obj._data = {}
         obj.t = 2000
-        obj.d = {}
+        obj.d = OrderBook()
         obj.logger = MagicMock()
+        obj._pending = deque()
+        obj._synced = True
+        obj._precision = None
         return obj
 
 
@@ -161,3 +170,67 @@ async def test_on_message_unknown_ignored():
     dl.parser_trades = MagicMock()
     await dl.on_message({'channel': 'ticker', 'data': []})
     dl.parser_trades.assert_not_called()
+
+
+def test_kraken_checksum():
+    book = OrderBook({'29990.0': 2.0, '-30010.0': -1.5, '-30020.0': -0.05})
+    s = '300100' + '150000000' + '300200' + '5000000' + '299900' + '200000000'
+    assert _kraken_checksum(book, 1, 8) == zlib.crc32(s.encode())
+
+
+@pytest.mark.asyncio
+async def test_checksum_mismatch_resubscribes_book():
+    dl = DownloadKrakenData('BTC/USD', price_precision=1, qty_precision=8)
+    dl.ws = MagicMock()
+    dl.ws.send = AsyncMock()
+    data = [{'symbol': 'BTC/USD', 'bids': [{'price': 29990.0, 'qty': 2.0}],
+             'asks': [{'price': 30010.0, 'qty': 1.5}]}]
+    data[0]['checksum'] = zlib.crc32(b'300100150000000299900200000000')
+    dl.parser_book({'channel': 'book', 'type': 'snapshot', 'data': data})
+    assert dl._synced and dl.n_checksum_errors == 0
+
+    data[0]['checksum'] = 0
+    dl.parser_book({'channel': 'book', 'type': 'update', 'data': data})
+    assert dl.n_checksum_errors == 1 and not dl._synced
+    await asyncio.sleep(0)  # subscribed again, waiting for the snapshot
+    sent = [json.loads(c.args[0]) for c in dl.ws.send.await_args_list]
+    assert [m['method'] for m in sent] == ['unsubscribe', 'subscribe']
+
+    # Deltas are dropped until the new snapshot
+    dl.parser_book({'channel': 'book', 'type': 'update', 'data': [
+        {'bids': [{'price': 1.0, 'qty': 1.0}], 'asks': []}]})
+    assert '1.0' not in dl.d
+    dl._resync_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_resubscribes_again_without_snapshot():
+    dl = DownloadKrakenData('BTC/USD', price_precision=1, qty_precision=8)
+    dl.ws = MagicMock()
+    dl.ws.send, dl.ws.close = AsyncMock(), AsyncMock()
+    dl.snapshot_timeout, dl.max_retries, dl.retry_delay = 0.05, 1, 0
+    dl._start_resync()
+    await dl._resync_task
+
+    sent = [json.loads(c.args[0]) for c in dl.ws.send.await_args_list]
+    assert [m['method'] for m in sent] == ['unsubscribe', 'subscribe'] * 2
+    # Given up after max_retries, reconnected to get a snapshot
+    dl.ws.close.assert_awaited_once()
+
+
+def test_instrument_sets_precision():
+    dl = _make_downloader()
+    dl.pair = 'BTC/USD'
+    dl.parser_instrument({'pairs': [
+        {'symbol': 'ETH/USD', 'price_precision': 2, 'qty_precision': 8},
+        {'symbol': 'BTC/USD', 'price_precision': 1, 'qty_precision': 8},
+    ]})
+    assert dl._precision == (1, 8)
+
+
+def test_book_truncated_to_depth():
+    dl = _make_downloader()
+    dl.parser_book({'channel': 'book', 'type': 'snapshot', 'data': [{
+        'bids': [{'price': float(i), 'qty': 1.0} for i in range(1, 61)],
+        'asks': []}]})
+    assert len(dl.d) == 50 and dl.d.best_bid() == (60.0, 1.0)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from dccd.continuous_dl.multiplex import MultiplexDownloader
+
+_BINANCE_TRADE = {'t': 1, 'T': 1700000000000, 'p': '30000.0', 'q': '0.5',
+                  'm': False}
+_BINANCE_BOOK = {'e': 'depthUpdate', 'E': 1700000000000, 's': 'BTCUSDT',
+                 'U': 157, 'u': 160,
+                 'b': [['29990.0', '2.0']], 'a': [['30010.0', '1.5']]}
+
+
+def test_unknown_exchange_raises():
+    with pytest.raises(ValueError, match='not supported'):
+        MultiplexDownloader('bitmex', ['XBTUSD'])
+
+
+def test_no_pair_raises():
+    with pytest.raises(ValueError, match='at least one pair'):
+        MultiplexDownloader('okx', [])
+
+
+def test_binance_streams_in_url():
+    mux = MultiplexDownloader('binance', ['BTCUSDT', 'ETHUSDT', 'BTCUSDT'])
+    assert list(mux.downloaders) == ['BTCUSDT', 'ETHUSDT']
+    assert mux.host.count('@trade') == 2
+    assert 'ethusdt@depth@100ms' in mux.host
+    with pytest.raises(ValueError, match='at most 1024'):
+        MultiplexDownloader('binance', [f'P{i}USDT' for i in range(513)])
+
+
+@pytest.mark.asyncio
+async def test_binance_routes_by_symbol():
+    mux = MultiplexDownloader('binance', ['BTCUSDT', 'ETHUSDT'])
+    await mux.on_message({'stream': 'ethusdt@trade', 'data': _BINANCE_TRADE})
+    await mux.on_message({'stream': 'btcusdt@depth@100ms',
+                          'data': _BINANCE_BOOK})
+    await mux.on_message({'stream': 'solusdt@trade', 'data': _BINANCE_TRADE})
+
+    btc, eth = mux['BTCUSDT'], mux['ETHUSDT']
+    assert eth._data[mux.t]['trades'][0]['price'] == 30000.0
+    assert len(eth.d) == 0
+    assert btc.d == {'29990.0': 2.0, '-30010.0': -1.5}
+    assert btc._data[mux.t]['trades'] == []
+
+
+@pytest.mark.asyncio
+async def test_kraken_splits_message_by_symbol():
+    mux = MultiplexDownloader('kraken', ['BTC/USD', 'ETH/USD'])
+    await mux.on_message({'channel': 'book', 'type': 'update', 'data': [
+        {'symbol': 'BTC/USD', 'bids': [{'price': 1.0, 'qty': 2.0}], 'asks': []},
+        {'symbol': 'ETH/USD', 'bids': [], 'asks': [{'price': 3.0, 'qty': 1.0}]},
+    ]})
+    await mux.on_message({'channel': 'heartbeat'})
+    assert len(mux['BTC/USD'].d) == 1
+    assert mux['ETH/USD'].d.best_ask() == (3.0, 1.0)
+
+    await mux.on_message({'channel': 'instrument', 'type': 'snapshot', 'data': {
+        'assets': [],
+        'pairs': [{'symbol': 'ETH/USD', 'price_precision': 2,
+                   'qty_precision': 8}],
+    }})
+    assert mux['ETH/USD']._precision == (2, 8)
+    assert mux['BTC/USD']._precision is None
+
+
+@pytest.mark.asyncio
+async def test_bybit_subscription_chunks():
+    mux = MultiplexDownloader('bybit', [f'P{i}USDT' for i in range(6)])
+    mux.ws = MagicMock()
+    mux.ws.send = AsyncMock()
+    await mux._subscribe()
+    sent = [json.loads(c.args[0]) for c in mux.ws.send.call_args_list]
+    assert [len(s['args']) for s in sent] == [10, 2]
+    assert 'orderbook.50.P5USDT' in sent[1]['args']
+    assert mux.is_connect
+
+
+@pytest.mark.asyncio
+async def test_okx_subscription_and_routing():
+    mux = MultiplexDownloader('okx', ['BTC-USDT', 'ETH-USDT'])
+    mux.ws = MagicMock()
+    mux.ws.send = AsyncMock()
+    await mux._subscribe()
+    mux.ws.send.assert_awaited_once()
+    assert len(json.loads(mux.ws.send.call_args.args[0])['args']) == 4
+
+    # Subscription events have no data
+    await mux.on_message({'event': 'subscribe',
+                          'arg': {'channel': 'trades', 'instId': 'BTC-USDT'}})
+    await mux.on_message({
+        'arg': {'channel': 'trades', 'instId': 'ETH-USDT'},
+        'data': [{'tradeId': '7', 'ts': '1700000000000', 'px': '2000',
+                  'sz': '1', 'side': 'sell'}],
+    })
+    assert mux.t not in mux['BTC-USDT']._data
+    assert mux['ETH-USDT']._data[mux.t]['trades'][0]['tid'] == 7
+
+
+@pytest.mark.asyncio
+async def test_snapshot_saved_per_pair():
+    mux = MultiplexDownloader('binance', ['BTCUSDT', 'ETHUSDT'])
+    mux.t = int(time.time()) - 60
+    savers = {pair: MagicMock() for pair in mux.downloaders}
+    for pair, saver in savers.items():
+        mux[pair].set_trades_saver(saver)
+
+    await mux.on_message({'stream': 'ethusdt@trade', 'data': _BINANCE_TRADE})
+    snapshot = await mux.__anext__()
+    assert list(snapshot) == ['ETHUSDT']
+
+    mux._save_snapshot(snapshot)
+    savers['ETHUSDT'].assert_called_once()
+    savers['BTCUSDT'].assert_not_called()
+    assert mux['ETHUSDT']._data == {}
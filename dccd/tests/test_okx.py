@@ -2,6 +2,7 @@
 # coding: utf-8
 
 import time
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -46,11 +47,10 @@ def test_http_500_raises(loader, mock_http_500):
 
 
 def test_malformed_response_raises(loader, monkeypatch):
-    from unittest.mock import MagicMock
     m = MagicMock()
     m.status_code = 200
     m.json.return_value = {}
-    monkeypatch.setattr("requests.get", lambda *a, **kw: m)
+    monkeypatch.setattr("requests.Session.get", lambda *a, **kw: m)
     with pytest.raises(KeyError):
         loader._import_data(start=0)
 
@@ -75,3 +75,46 @@ def test_import_orderbook(loader, mock_okx_books):
 def test_import_trades_http_500_raises(loader, mock_http_500):
     with pytest.raises(ValueError):
         loader._import_trades(start=0, end=1)
+
+
+def test_import_trades_paginates_by_after(loader, mock_pages):
+    loader._trades_limit = 2
+    t = 1746057600
+
+    def _page(*trades):
+        return {'data': [{'tradeId': str(i), 'ts': str(ts * 1000), 'px': '50000',
+                          'sz': '0.1', 'side': 'buy'} for i, ts in trades]}
+
+    calls = mock_pages(_page((4, t + 3), (3, t + 2)), _page((2, t + 1), (1, t - 1)))
+    data = loader._import_trades(start=t, end=t + 3)
+    assert calls[0]['type'] == 2 and calls[0]['after'] == (t + 4) * 1000
+    assert calls[1]['type'] == 1 and calls[1]['after'] == '3'
+    assert len(calls) == 2
+    assert [d['tid'] for d in data] == [4, 3, 2]
+
+
+def test_old_windows_use_history_candles(tmp_data_path, monkeypatch):
+    loader = FromOKX(tmp_data_path, 'BTC', 60)
+    now = int(time.time()) // 60 * 60
+    start = 1514764800  # 2018-01-01, far beyond the latest 1440 candles
+    windows = loader._windows(start, now)
+    old = [w for w in windows if w[0] < loader._recent_start()]
+    assert old and all((e - s) // 60 + 1 <= 100 for s, e in old)
+    assert windows[0][0] == start and windows[-1][1] == now
+    assert all(b[0] == a[1] + 60 for a, b in zip(windows, windows[1:]))
+
+    urls = []
+
+    def _get(self, url, params=None, **kw):
+        urls.append((url, params['limit']))
+        m = MagicMock(status_code=200)
+        m.json.return_value = {'data': []}
+        return m
+
+    monkeypatch.setattr('requests.Session.get', _get)
+    loader._import_window(start, start + 99 * 60)
+    loader._import_window(now - 299 * 60, now)
+    assert urls == [
+        ('https://www.okx.com/api/v5/market/history-candles', 100),
+        ('https://www.okx.com/api/v5/market/candles', 300),
+    ]
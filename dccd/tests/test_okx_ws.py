@@ -1,16 +1,21 @@
 #!/usr/bin/env python3
 # coding: utf-8
 
-from unittest.mock import MagicMock, patch
+import asyncio
+import json
+import zlib
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from dccd.continuous_dl.okx import (
     DownloadOKXData,
+    _okx_checksum,
     _parser_book,
     _parser_kline,
     _parser_trades,
 )
+from dccd.continuous_dl.orderbook import OrderBook
 
 # =========================================================================== #
 #                           Module-level parsers                              #
@@ -83,7 +88,7 @@ def _make_downloader() -> DownloadOKXData:
         obj = DownloadOKXData.__new__(DownloadOKXData)
         obj._data = {}
         obj.t = 2000
-        obj.d = {}
+        obj.d = OrderBook()
         obj.logger = MagicMock()
         return obj
 
@@ -150,3 +155,85 @@ async def test_on_message_unknown_does_nothing():
     await dl.on_message({'arg': {'channel': 'tickers'}, 'data': []})
     dl.parser_trades.assert_not_called()
     dl.parser_book.assert_not_called()
+
+
+def _books(action: str, prev: int, seq: int, bids: list) -> dict:
+    return {'arg': {'channel': 'books50-l2-tbt', 'instId': 'BTC-USDT'},
+            'action': action,
+            'data': [{'bids': bids, 'asks': [], 'prevSeqId': prev, 'seqId': seq}]}
+
+
+@pytest.mark.asyncio
+async def test_gap_resubscribes_book_until_snapshot():
+    dl = DownloadOKXData('BTC-USDT')
+    dl.ws = MagicMock()
+    dl.ws.send = AsyncMock()
+    dl.parser_book(_books('snapshot', -1, 10, [['100', '1', '0', '1']]))
+    dl.parser_book(_books('update', 10, 12, [['99', '1', '0', '1']]))
+    dl.parser_book(_books('update', 13, 15, [['98', '1', '0', '1']]))  # gap
+    assert dl.n_gaps == 1 and not dl._synced
+    task = dl._resync_task
+    await asyncio.sleep(0)  # subscribed again, waiting for the snapshot
+    ops = [json.loads(c.args[0])['op'] for c in dl.ws.send.await_args_list]
+    assert ops == ['unsubscribe', 'subscribe']
+
+    dl.parser_book(_books('snapshot', -1, 20, [['101', '2', '0', '1']]))
+    dl.parser_book(_books('update', 20, 21, [['102', '1', '0', '1']]))
+    await task
+    assert dl._synced and dl._seq == 21
+    assert dict(dl.d) == {'101': 2.0, '102': 1.0}
+
+
+@pytest.mark.asyncio
+async def test_sequence_reset_resubscribes_book():
+    dl = DownloadOKXData('BTC-USDT')
+    dl.ws = MagicMock()
+    dl.ws.send = AsyncMock()
+    dl.parser_book(_books('snapshot', -1, 100, [['100', '1', '0', '1']]))
+    # Sequence restarted after a maintenance
+    dl.parser_book(_books('update', 3, 4, [['99', '1', '0', '1']]))
+    assert dl.n_gaps == 1 and not dl._synced
+    task = dl._resync_task
+    await asyncio.sleep(0)  # subscribed again, waiting for the snapshot
+    ops = [json.loads(c.args[0])['op'] for c in dl.ws.send.await_args_list]
+    assert ops == ['unsubscribe', 'subscribe']
+
+    dl.parser_book(_books('snapshot', -1, 5, [['101', '2', '0', '1']]))
+    dl.parser_book(_books('update', 5, 6, [['102', '1', '0', '1']]))
+    await task
+    assert dl._synced and dl._seq == 6
+    assert dict(dl.d) == {'101': 2.0, '102': 1.0}
+
+
+def test_okx_checksum():
+    book = OrderBook({'3366.1': 7., '3366': 6., '-3366.8': -9.,
+                      '-3368': -8., '-3370': -1.})
+    sizes = {'3366.1': '7', '3366': '6', '-3366.8': '9', '-3368': '8',
+             '-3370': '1.0'}
+    crc = zlib.crc32(b'3366.1:7:3366.8:9:3366:6:3368:8:3370:1.0')
+    assert _okx_checksum(book, sizes) == crc
+    # Signed as the OKX checksums
+    book.set('-3370', 0.)
+    assert _okx_checksum(book, sizes) == -1881014294
+
+
+@pytest.mark.asyncio
+async def test_checksum_mismatch_resubscribes_book():
+    dl = DownloadOKXData('BTC-USDT')
+    dl.ws = MagicMock()
+    dl.ws.send = AsyncMock()
+    msg = _books('snapshot', -1, 10, [['100', '1.50', '0', '1']])
+    msg['data'][0]['checksum'] = _okx_checksum(OrderBook({'100': 1.5}),
+                                               {'100': '1.50'})
+    dl.parser_book(msg)
+    assert dl._synced and dl._sizes == {'100': '1.50'}
+
+    msg = _books('update', 10, 11, [['100', '0', '0', '0']])
+    msg['data'][0]['checksum'] = 1
+    dl.parser_book(msg)
+    assert dl.n_checksum_errors == 1 and not dl._synced
+    assert dl._sizes == {}
+    await asyncio.sleep(0)  # subscribed again, waiting for the snapshot
+    ops = [json.loads(c.args[0])['op'] for c in dl.ws.send.await_args_list]
+    assert ops == ['unsubscribe', 'subscribe']
+    dl._resync_task.cancel()
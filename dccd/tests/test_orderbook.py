@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+from dccd.continuous_dl.orderbook import OrderBook
+
+
+def _book():
+    return OrderBook({'100.0': 1., '99.0': 2., '98.0': 3.,
+                      '-101.0': -1., '-102.0': -2.})
+
+
+def test_best_levels_and_mid():
+    book = _book()
+    assert book.best_bid() == (100., 1.)
+    assert book.best_ask() == (101., 1.)
+    assert book.mid() == 100.5
+
+
+def test_empty_book():
+    book = OrderBook()
+    assert book.best_bid() is None
+    assert book.best_ask() is None
+    assert book.mid() is None
+    assert book.depth(5) == ([], [])
+    assert len(book) == 0
+
+
+def test_apply_updates_in_place():
+    book = _book()
+    book.apply({'100.0': 0., '99.0': 5., '-100.5': -4., '97.0': 0.})
+    assert book.best_bid() == (99., 5.)
+    assert book.best_ask() == (100.5, 4.)
+    assert '100.0' not in book
+    assert len(book) == 5
+
+
+def test_level_changing_side():
+    book = _book()
+    book.set('-101.0', 2.)
+    assert book.best_bid() == (101., 2.)
+    assert book.best_ask() == (102., 2.)
+
+
+def test_depth_sorted_from_best_price():
+    bids, asks = _book().depth(2)
+    assert bids == [(100., 1.), (99., 2.)]
+    assert asks == [(101., 1.), (102., 2.)]
+    bids, asks = _book().depth(10)
+    assert [p for p, _ in bids] == [100., 99., 98.]
+
+
+def test_snapshot_is_a_copy():
+    book = _book()
+    snap = book.snapshot()
+    book.set('100.0', 0.)
+    assert snap['100.0'] == 1.
+    assert book == {'99.0': 2., '98.0': 3., '-101.0': -1., '-102.0': -2.}
+
+
+def test_float_keys():
+    book = OrderBook({30000.: 10, 30010.: -5})
+    book.set(30000., 20)
+    assert book.best_bid() == (30000., 20)
+    assert book.snapshot() == {30000.: 20, 30010.: -5}
+
+
+def test_clear():
+    book = _book()
+    book.clear()
+    assert len(book) == 0
+    assert book.best_bid() is None
+
+
+def test_top_and_truncate():
+    book = _book()
+    assert book.top(2) == (['100.0', '99.0'], ['-101.0', '-102.0'])
+    book.truncate(1)
+    assert dict(book) == {'100.0': 1., '-101.0': -1.}
+    assert book.depth(3) == ([(100., 1.)], [(101., 1.)])
@@ -2,6 +2,7 @@
 # coding: utf-8
 
 import pandas as pd
+import pytest
 
 from dccd.process_data import set_marketdepth, set_ohlc, set_orders, set_trades
 
@@ -74,3 +75,58 @@ def test_set_marketdepth_columns():
     assert 'price' in col_names
     assert 'cum_amount' in col_names
     assert 'vwab' in col_names
+
+
+def test_set_ohlc_bucket_boundaries():
+    trades = _trades() + [
+        {'tid': 3, 'price': 50200.0, 'amount': 2.0, 'timestamp': (_TS + 60) * 1000},
+        {'tid': 4, 'price': 49900.0, 'amount': 1.0, 'timestamp': (_TS + 185) * 1000},
+    ]
+    result = set_ohlc(trades, ts=60)
+    assert list(result.index) == [_TS, _TS + 60, _TS + 120, _TS + 180]
+    # A trade on the bucket edge is counted once, in the next bucket
+    assert result.loc[_TS, 'volume'] == 1.5
+    assert result.loc[_TS + 60, 'open'] == 50200.0
+    assert result.loc[_TS + 120].isna().all()
+    assert (result.dtypes == 'float64').all()
+
+
+def test_set_ohlc_optional_columns():
+    trades = [dict(t, type=side) for t, side in zip(_trades(), ['sell', 'buy'])]
+    result = set_ohlc(trades, ts=60, vwap=True, count=True, buy_sell=True)
+    assert list(result.columns) == ['open', 'high', 'low', 'close', 'volume',
+                                    'vwap', 'count', 'buy_volume',
+                                    'sell_volume']
+    row = result.iloc[0]
+    assert row['vwap'] == (50100.0 * 0.5 + 50000.0) / 1.5
+    assert row['count'] == 2
+    assert row['buy_volume'] == 1.0
+    assert row['sell_volume'] == 0.5
+
+
+def test_set_ohlc_empty():
+    result = set_ohlc([], ts=60, count=True)
+    assert result.empty
+    assert list(result.columns) == ['open', 'high', 'low', 'close', 'volume',
+                                    'count']
+
+
+def test_set_marketdepth_sorted_numerically():
+    book = {'9.5': 1.0, '10': 2.0, '-10.5': -1.0, '-9.9': -3.0}
+    result = set_marketdepth(book, t=_TS)
+    assert result.loc[(_TS, 'bid', 'price')].tolist() == [10.0, 9.5]
+    assert result.loc[(_TS, 'ask', 'price')].tolist() == [9.9, 10.5]
+    assert result.loc[(_TS, 'ask', 'vwab'), 1] == (9.9 * 3 + 10.5) / 4
+
+
+def test_set_marketdepth_fixed_depth_and_wide():
+    result = set_marketdepth(_book(), t=_TS, depth=3)
+    assert list(result.columns) == [0, 1, 2]
+    assert result.loc[(_TS, 'bid', 'cum_amount')].tolist()[:2] == [1.0, 1.5]
+    assert result[2].isna().all()
+
+    wide = set_marketdepth(_book(), t=_TS, depth=3, wide=True)
+    assert wide.shape == (1, 18) and list(wide.index) == [_TS]
+    assert wide.loc[_TS, 'ask_price_1'] == 50200.0
+    with pytest.raises(ValueError, match='fixed depth'):
+        set_marketdepth(_book(), wide=True)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+from unittest.mock import patch
+
+import pytest
+
+from dccd.tools.rate_limit import TokenBucket, get_rate_limiter
+
+
+def test_reserve_within_capacity_no_delay():
+    bucket = TokenBucket(10, 1.)
+    assert all(bucket.reserve(2) == 0. for _ in range(5))
+
+
+def test_reserve_over_capacity_delays_by_weight():
+    bucket = TokenBucket(10, 1.)
+    bucket.reserve(10)
+    assert bucket.reserve(5) == pytest.approx(0.5, abs=0.01)
+    # Reservations queue behind each other
+    assert bucket.reserve(5) == pytest.approx(1., abs=0.01)
+
+
+def test_acquire_sleeps_when_empty():
+    bucket = TokenBucket(1, 1.)
+    bucket.acquire()
+    with patch('dccd.tools.rate_limit.time.sleep') as mock_sleep:
+        bucket.acquire()
+    mock_sleep.assert_called_once()
+    assert mock_sleep.call_args[0][0] > 0
+
+
+def test_get_rate_limiter_shared_by_key():
+    a = get_rate_limiter('test-shared', 5, 1.)
+    b = get_rate_limiter('test-shared', 50, 1.)
+    c = get_rate_limiter('test-other', 5, 1.)
+    assert a is b
+    assert a is not c
+
+
+@pytest.mark.asyncio
+async def test_acquire_async_sleeps_when_empty():
+    bucket = TokenBucket(1, 1.)
+    await bucket.acquire_async()
+    with patch('dccd.tools.rate_limit.asyncio.sleep') as mock_sleep:
+        await bucket.acquire_async()
+    mock_sleep.assert_called_once()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dccd.continuous_dl.exchange import ContinuousDownloader
+from dccd.continuous_dl.trades import TradeBuffer
+from dccd.process_data import set_trades
+from dccd.validation import DataValidationError
+
+
+def _trades(n, start=0):
+    return [{'tid': start + i, 'timestamp': 1.7e9 + i, 'price': 100. + i,
+             'amount': 1., 'type': 'buy' if i % 2 else 'sell'}
+            for i in range(n)]
+
+
+def test_buffer_grows_and_keeps_columns():
+    buffer = TradeBuffer(capacity=2)
+    buffer.extend(_trades(3))
+    buffer.extend(_trades(4, start=3))
+    assert len(buffer) == 7 and buffer._capacity >= 7
+    cols = buffer.columns()
+    np.testing.assert_array_equal(cols['tid'], np.arange(7))
+    assert cols['price'].dtype == np.float64
+    assert list(cols['side'][:2]) == [-1, 1]
+    assert buffer[-1] == _trades(4, start=3)[-1]
+
+
+def test_invalid_batch_is_not_appended():
+    buffer = TradeBuffer()
+    buffer.extend(_trades(2))
+    bad = _trades(3)
+    bad[1]['price'] = None
+    bad[2]['amount'] = float('inf')
+    with pytest.raises(DataValidationError, match='rows \\[1\\].*rows \\[2\\]'):
+        buffer.extend(bad)
+
+    assert len(buffer) == 2
+
+
+def test_to_frame_missing_tid():
+    buffer = TradeBuffer()
+    buffer.extend([{'tid': None, 'timestamp': 1., 'price': '2.5',
+                    'amount': 1.}])
+    df = buffer.to_frame()
+    assert df.tid.isna().all() and df.price.tolist() == [2.5]
+    assert df.type.tolist() == [None]
+
+
+def test_set_trades_from_buffer():
+    buffer = TradeBuffer()
+    buffer.extend(_trades(3)[::-1])
+    df = set_trades(buffer)
+    assert df.tid.tolist() == [0, 1, 2]
+    assert list(df.columns) == ['tid', 'timestamp', 'price', 'amount', 'type']
+
+
+def test_push_trades_mixed_with_other_records():
+    dl = ContinuousDownloader('wss://example.com', time_step=60)
+    dl._push_trades(_trades(2))
+    assert isinstance(dl._data[dl.t]['trades'], TradeBuffer)
+
+    dl._raw_parser({'timestamp': 1., 'open': 1.})
+    dl._push_trades(_trades(1, start=2))
+    trades = dl._data[dl.t]['trades']
+    assert isinstance(trades, list) and len(trades) == 4
+    assert trades[2] == {'timestamp': 1., 'open': 1.}
+    assert trades[3]['tid'] == 2
+
+
+def test_arrow_handed_to_parquet_saver(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    from dccd.tools.io import IODataBase
+
+    dl = ContinuousDownloader('wss://example.com', time_step=60)
+    dl.set_trades_saver(IODataBase(str(tmp_path), 'parquet'), name='trades')
+    assert dl._trades_arrow
+    dl._push_trades(_trades(3)[::-1])
+    batch = set_trades(dl._data[dl.t]['trades'], output='arrow')
+    assert isinstance(batch, pa.RecordBatch)
+    assert batch.column('tid').to_pylist() == [0, 1, 2]
+
+    dl._save_snapshot(dl._pop_snapshot(dl.t))
+    df = pd.read_parquet(tmp_path / 'trades.parquet')
+    assert df.tid.tolist() == [0, 1, 2]
+    assert df.type.tolist() == ['sell', 'buy', 'sell']
+
+
+def test_set_trades_arrow_from_list():
+    pytest.importorskip('pyarrow')
+    batch = set_trades(_trades(3)[::-1], output='arrow')
+    assert batch.column('tid').to_pylist() == [0, 1, 2]
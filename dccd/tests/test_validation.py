@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from dccd.validation import (
+    DataValidationError,
+    validate_ohlc,
+    validate_orderbook,
+    validate_trades,
+)
+
+
+def _bar(date, high=3., low=1., **kw):
+    bar = {'date': date, 'open': 2., 'high': high, 'low': low, 'close': 2.,
+           'volume': 1., 'quoteVolume': 2.}
+    bar.update(kw)
+    return bar
+
+
+def test_ohlc_valid_columns_and_dtypes():
+    df = validate_ohlc([_bar(0, open='2.5'), _bar(60, weightedAverage=2.)])
+    assert list(df.columns) == ['date', 'open', 'high', 'low', 'close',
+                                'volume', 'quoteVolume', 'weightedAverage']
+    assert (df.dtypes == np.float64).all()
+    assert df.open.tolist() == [2.5, 2.]
+    assert np.isnan(df.weightedAverage.iloc[0])
+
+
+def test_ohlc_reports_all_bad_rows_at_once():
+    bars = [_bar(0), _bar(60, high=0.5), _bar(120, close='x'),
+            _bar(60), _bar(240, volume=None)]
+    with pytest.raises(DataValidationError) as exc:
+        validate_ohlc(bars)
+    errors = exc.value.errors
+    assert errors['high < low'].tolist() == [1]
+    assert errors["invalid 'close'"].tolist() == [2]
+    assert errors['date not increasing'].tolist() == [3]
+    assert errors["invalid 'volume'"].tolist() == [4]
+    assert '4 invalid OHLC row(s)' in str(exc.value)
+
+
+def test_ohlc_drop_bad_rows(caplog):
+    df = validate_ohlc([_bar(0), _bar(60, high=0.5), _bar(120)], errors='drop')
+    assert df.date.tolist() == [0., 120.]
+    assert 'rows dropped' in caplog.text
+
+
+def test_ohlc_strict_uses_pydantic():
+    df = validate_ohlc([_bar(0)], strict=True)
+    assert df.close.tolist() == [2.]
+    with pytest.raises(ValidationError):
+        validate_ohlc([{'date': 0}], strict=True)
+
+
+def test_trades_tid_nullable_integer():
+    df = validate_trades([
+        {'tid': 1, 'timestamp': 0, 'price': 2, 'amount': 1, 'type': 'buy'},
+        {'tid': None, 'timestamp': 1, 'price': 2, 'amount': 1, 'type': 'sell'},
+    ])
+    assert str(df.tid.dtype) == 'Int64'
+    assert df.tid.isna().tolist() == [False, True]
+
+
+def test_trades_bad_rows():
+    with pytest.raises(DataValidationError) as exc:
+        validate_trades([
+            {'tid': 1.5, 'timestamp': 0, 'price': 2, 'amount': 1},
+            {'tid': 2, 'timestamp': 0, 'price': -1, 'amount': 0},
+            {'tid': 3, 'timestamp': np.nan, 'price': 2, 'amount': 1},
+        ])
+    assert set(exc.value.errors) == {"invalid 'tid'", "invalid 'timestamp'"}
+    # Zero amounts and negative prices are kept, as the exchanges send them
+    assert exc.value.errors["invalid 'tid'"].tolist() == [0]
+
+
+def test_orderbook_validation():
+    levels = pd.DataFrame({'side': ['bid', 'ask', 'mid'],
+                           'price': ['10', '11', '12'],
+                           'amount': [1., -1., 1.]})
+    with pytest.raises(DataValidationError) as exc:
+        validate_orderbook(levels)
+    assert exc.value.errors['amount < 0'].tolist() == [1]
+    assert exc.value.errors["side not 'bid' or 'ask'"].tolist() == [2]
+    df = validate_orderbook(levels.iloc[:1])
+    assert df.price.tolist() == ['10']
+    assert df['count'].isna().all()
@@ -2,11 +2,12 @@
 # coding: utf-8
 
 import asyncio
-from unittest.mock import MagicMock, patch
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from dccd.tools.websocket import BasisWebSocket
+from dccd.tools.websocket import BasisWebSocket, backoff_delay
 
 
 def _make_ws(host: str = 'wss://example.com') -> BasisWebSocket:
@@ -67,3 +68,179 @@ def test_on_close_sets_is_connect_false():
     ws.ws = MagicMock()
     ws.on_close()
     assert ws.is_connect is False
+
+
+class _FakeConnection:
+    """ Connection yielding `messages` then closing. """
+
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def __aiter__(self):
+        for msg in self.messages:
+            yield msg
+            await asyncio.sleep(0)
+
+
+async def _run(ws: BasisWebSocket, messages: list[str]) -> list:
+    received = []
+
+    async def _subscribe(**kwargs):
+        ws.is_connect = True
+
+    async def _on_message(msg):
+        received.append(msg)
+        await asyncio.sleep(0.001)
+
+    ws._subscribe = _subscribe
+    ws.on_message = _on_message
+    with patch('dccd.tools.websocket.websockets.connect',
+               return_value=_FakeConnection(messages)):
+        await ws._connect()
+
+    return received
+
+
+def test_unknown_overflow_raises():
+    with pytest.raises(ValueError, match='overflow policy'):
+        BasisWebSocket('wss://example.com', overflow='drop')
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('overflow', ['block', 'spill'])
+async def test_connect_parses_all_messages_in_order(overflow):
+    ws = BasisWebSocket('wss://example.com', queue_size=2, overflow=overflow,
+                        reconnect=False)
+    messages = [f'{{"i": {i}}}' for i in range(20)]
+    received = await _run(ws, messages)
+    assert received == [{'i': i} for i in range(20)]
+    assert ws.queue_stats()['depth'] == 0
+    if overflow == 'spill':
+        assert ws.queue_stats()['spilled'] > 0
+
+
+@pytest.mark.asyncio
+async def test_connect_stops_when_disconnected():
+    ws = BasisWebSocket('wss://example.com')
+
+    async def _subscribe(**kwargs):
+        ws.is_connect = True
+
+    async def _on_message(msg):
+        ws.is_connect = False
+
+    ws._subscribe = _subscribe
+    ws.on_message = AsyncMock(side_effect=_on_message)
+    with patch('dccd.tools.websocket.websockets.connect',
+               return_value=_FakeConnection(['{}', '{}'])):
+        await ws._connect()
+
+    ws.on_message.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_counts_dropped():
+    ws = BasisWebSocket('wss://example.com', queue_size=2,
+                        overflow='drop_oldest')
+    ws._queue = asyncio.Queue(2)
+    for i in range(5):
+        await ws._put((0., str(i)))
+
+    assert [ws._queue.get_nowait()[1] for _ in range(2)] == ['3', '4']
+    stats = ws.queue_stats()
+    assert stats['dropped'] == 3
+    assert stats['depth'] == 0
+
+
+@pytest.mark.asyncio
+async def test_spill_keeps_order_and_lag():
+    ws = BasisWebSocket('wss://example.com', queue_size=1, overflow='spill')
+    ws._queue = asyncio.Queue(1)
+    ws.is_connect = True
+    t = time.monotonic() - 0.5
+    for i in range(3):
+        await ws._put((t, f'[{i}]'))
+
+    assert ws.queue_stats()['depth'] == 3
+    assert ws.queue_stats()['spilled'] == 2
+    ws._write_spill(None)
+    ws.on_message = AsyncMock()
+    await ws._parse()
+    assert [c.args[0] for c in ws.on_message.await_args_list] == [[0], [1], [2]]
+    assert ws.queue_stats()['lag_ms'] >= 500
+
+
+def test_unspill_reads_back_by_batch(monkeypatch):
+    monkeypatch.setattr('dccd.tools.websocket._SPILL_COMPACT', 50)
+    ws = BasisWebSocket('wss://example.com', overflow='spill')
+    for i in range(10):
+        ws._write_spill((0., f'[{i}]'))
+
+    assert [m for _, m in ws._unspill(3)] == ['[0]', '[1]', '[2]']
+    ws._write_spill((0., '[10]'))
+    assert ws.queue_stats()['depth'] == 8
+    # More than half of the file read back, the rest is moved to a new file
+    spill = ws._spill
+    assert [m for _, m in ws._unspill(4)] == ['[3]', '[4]', '[5]', '[6]']
+    assert ws._spill is not spill and ws._spill_pos == 0
+    assert [m for _, m in ws._unspill()] == ['[7]', '[8]', '[9]', '[10]']
+    assert ws._spill.seek(0, 2) == 0 and ws._n_spill == 0
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_connection_lost():
+    ws = BasisWebSocket('wss://example.com')
+    received, connects = [], []
+
+    async def _subscribe(**kwargs):
+        ws.is_connect = True
+
+    async def _on_connect():
+        connects.append(ws.n_reconnects)
+
+    async def _on_message(msg):
+        received.append(msg['i'])
+        if msg['i'] == 1:
+            ws.is_connect = False
+
+    ws._subscribe = _subscribe
+    ws.on_connect = _on_connect
+    ws.on_message = _on_message
+    connections = [_FakeConnection(['{"i": 0}']), OSError('refused'),
+                   _FakeConnection(['{"i": 1}', '{"i": 2}'])]
+    with patch('dccd.tools.websocket.websockets.connect',
+               side_effect=connections):
+        await ws._connect()
+
+    assert received == [0, 1]
+    assert connects == [0, 1]
+    assert ws.n_reconnects == 1
+    assert 0 < ws.downtime < 1
+
+
+@pytest.mark.asyncio
+async def test_reconnect_gives_up_after_max_retries():
+    ws = BasisWebSocket('wss://example.com', max_retries=2)
+    ws.is_connect = True
+    ws.ws = MagicMock()
+    with patch('dccd.tools.websocket.websockets.connect',
+               side_effect=OSError('refused')) as connect, \
+         patch('dccd.tools.websocket.asyncio.sleep', AsyncMock()):
+        with pytest.raises(OSError):
+            await ws._connect()
+
+    assert connect.call_count == 3
+    assert ws.is_connect is False
+
+
+def test_backoff_delay_grows_and_is_capped():
+    delays = [max(backoff_delay(n) for _ in range(200)) for n in range(8)]
+    assert delays[0] <= 0.1
+    assert delays[3] > 0.1
+    assert max(delays) <= 5
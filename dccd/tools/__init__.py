@@ -15,7 +15,11 @@
    :caption: Contents:
 
    tools.date_time
+   tools.decoder
+   tools.http
    tools.io
+   tools.journal
+   tools.rate_limit
    tools.websocket
 
 """
@@ -25,8 +29,12 @@
 # Third party packages
 
 # Local packages
-from . import date_time, io, websocket
+from . import date_time, decoder, http, io, journal, rate_limit, websocket
 
 __all__ = io.__all__
 __all__ += date_time.__all__
+__all__ += decoder.__all__
+__all__ += http.__all__
+__all__ += journal.__all__
+__all__ += rate_limit.__all__
 __all__ += websocket.__all__
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+""" JSON decoders of the WebSocket messages.
+
+.. currentmodule:: dccd.tools.decoder
+
+.. autofunction:: get_decoder
+
+Notes
+-----
+`msgspec` and `orjson` decode several times faster than the standard
+library, they are used when installed (``pip install dccd[json]``). With
+`msgspec` a message can also be decoded straight into a typed schema
+(:class:`msgspec.Struct`, dataclass, ``list[tuple[str, str]]``...), which
+skips the intermediate dicts.
+
+"""
+
+# Built-in packages
+import json
+from collections.abc import Callable
+from typing import Any
+
+# Third party packages
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Local packages
+
+__all__ = ['get_decoder']
+
+Decoder = Callable[[str | bytes], Any]
+
+_BACKENDS = ('auto', 'msgspec', 'orjson', 'json')
+
+
+def get_decoder(backend: str = 'auto', type: Any = None) -> Decoder:
+    """ Get a function decoding a JSON message.
+
+    Parameters
+    ----------
+    backend : {'auto', 'msgspec', 'orjson', 'json'}, optional
+        JSON library. ``'auto'`` (default) picks the fastest installed one,
+        `msgspec` then `orjson` then the standard library.
+    type : type, optional
+        Schema to decode into, e.g. a :class:`msgspec.Struct`; requires
+        `msgspec`. Default decodes into dicts and lists.
+
+    Returns
+    -------
+    callable
+        Function of a ``str`` or ``bytes`` message returning the decoded
+        object.
+
+    Raises
+    ------
+    ImportError
+        If the library of `backend` (or `msgspec` for `type`) is not
+        installed.
+    ValueError
+        If `backend` is unknown.
+
+    Examples
+    --------
+    >>> decode = get_decoder()
+    >>> decode('{"stream": "btcusdt@trade", "data": {"p": "1.5"}}')
+    {'stream': 'btcusdt@trade', 'data': {'p': '1.5'}}
+
+    """
+    if backend not in _BACKENDS:
+        raise ValueError(f'Unknown JSON backend {backend!r}, allowed: {_BACKENDS}')
+
+    if type is not None and backend not in ('auto', 'msgspec'):
+        raise ValueError(f'Typed decoding requires msgspec, not {backend!r}')
+
+    if backend == 'auto':
+        if HAS_MSGSPEC or type is not None:
+            backend = 'msgspec'
+        else:
+            backend = 'orjson' if HAS_ORJSON else 'json'
+
+    if backend == 'msgspec':
+        if not HAS_MSGSPEC:
+            raise ImportError(
+                "msgspec is required for this decoder: pip install msgspec"
+            )
+
+        if type is None:
+
+            return msgspec.json.Decoder().decode
+
+        return msgspec.json.Decoder(type).decode
+
+    if backend == 'orjson':
+        if not HAS_ORJSON:
+            raise ImportError(
+                "orjson is required for this decoder: pip install orjson"
+            )
+
+        return orjson.loads
+
+    return json.loads
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+""" Pooled HTTP sessions shared by the REST downloaders.
+
+Each exchange owns one :class:`PooledSession`, returned by
+:func:`get_session`, so that every downloader instance, every thread and the
+daemon scheduler reuse the same keep-alive connections instead of paying a
+TCP and TLS handshake per request. The asynchronous downloaders get the same
+pooling from :func:`get_async_session` (requires `aiohttp`).
+
+"""
+
+# Built-in packages
+import asyncio
+import threading
+from typing import Any
+
+# Third party packages
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+# Local packages
+
+__all__ = [
+    'PooledSession', 'close_async_sessions', 'configure_http',
+    'connection_stats', 'get_async_session', 'get_session',
+]
+
+_SETTINGS: dict[str, Any] = {'pool_size': 10, 'timeout': 30., 'keep_alive': True}
+_SESSIONS: dict[str, 'PooledSession'] = {}
+_ASYNC_SESSIONS: dict[tuple[str, asyncio.AbstractEventLoop], Any] = {}
+_LOCK = threading.Lock()
+
+
+class _CountingAdapter(HTTPAdapter):
+    """ Transport adapter counting the requests sent and the sockets opened.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.n_requests = 0
+        self.n_connections = 0
+        self._count_lock = threading.Lock()
+        super(_CountingAdapter, self).__init__(*args, **kwargs)
+
+    def _count(self, attr: str) -> None:
+        with self._count_lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super(_CountingAdapter, self).init_poolmanager(*args, **kwargs)
+        pool_classes: dict[str, type[HTTPConnectionPool]] = {}
+        pool_cls: type[HTTPConnectionPool]
+        for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items():
+            conn_cls = self._counting_connection(pool_cls.ConnectionCls)
+            pool_classes[scheme] = type(pool_cls.__name__, (pool_cls,),
+                                        {'ConnectionCls': conn_cls})
+
+        self.poolmanager.pool_classes_by_scheme = pool_classes
+
+    def _counting_connection(self, base: type[Any]) -> type[Any]:
+        """ Subclass the connection class `base` to count its connects. """
+        adapter = self
+
+        def connect(conn: Any) -> None:
+            base.connect(conn)
+            adapter._count('n_connections')
+
+        return type(base.__name__, (base,), {'connect': connect})
+
+    def send(self, request: requests.PreparedRequest, *args: Any,
+             **kwargs: Any) -> requests.Response:
+        self._count('n_requests')
+
+        return super(_CountingAdapter, self).send(request, *args, **kwargs)
+
+
+class PooledSession(requests.Session):
+    """ HTTP session with a bounded connection pool and a default timeout.
+
+    Parameters
+    ----------
+    pool_size : int, optional
+        Maximum number of connections kept alive per host, it should be at
+        least the number of threads sharing the session. Default is 10.
+    timeout : float, optional
+        Default timeout in seconds of each request, default is 30.
+    keep_alive : bool, optional
+        If False, connections are closed after each response. Default is
+        True.
+
+    Examples
+    --------
+    >>> session = PooledSession(pool_size=4, timeout=5.)
+    >>> session.stats()
+    {'requests': 0, 'connections': 0, 'reused': 0}
+    >>> session.close()
+
+    """
+
+    def __init__(self, pool_size: int = 10, timeout: float = 30., keep_alive: bool = True) -> None:
+        """ Initialize object. """
+        super(PooledSession, self).__init__()
+        self.timeout = timeout
+        adapter = _CountingAdapter(pool_connections=pool_size,
+                                   pool_maxsize=pool_size, pool_block=True)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        self._adapter = adapter
+
+        if not keep_alive:
+            self.headers['Connection'] = 'close'
+
+    def request(self, method: str, url: str | bytes, *args: Any,
+                **kwargs: Any) -> requests.Response:
+        """ Send a request, with the default timeout if none is given. """
+        # `timeout` is the 7th argument after `url`
+        if len(args) < 7:
+            kwargs.setdefault('timeout', self.timeout)
+
+        return super(PooledSession, self).request(method, url, *args, **kwargs)
+
+    def stats(self) -> dict[str, int]:
+        """ Count the requests sent and the connections opened.
+
+        Returns
+        -------
+        dict
+            ``'requests'`` sent, ``'connections'`` opened and ``'reused'``
+            the number of requests sent over an already open connection.
+
+        """
+        n_req = self._adapter.n_requests
+        n_conn = self._adapter.n_connections
+
+        return {'requests': n_req, 'connections': n_conn,
+                'reused': max(n_req - n_conn, 0)}
+
+
+def configure_http(pool_size: int | None = None, timeout: float | None = None,
+                   keep_alive: bool | None = None) -> None:
+    """ Set the settings of the shared sessions.
+
+    Sessions already opened are closed, the next call to :func:`get_session`
+    opens a new one with the new settings. Asynchronous sessions opened
+    afterwards by :func:`get_async_session` use the new settings too.
+
+    Parameters
+    ----------
+    pool_size : int, optional
+        Maximum number of connections kept alive per host.
+    timeout : float, optional
+        Default timeout in seconds of each request.
+    keep_alive : bool, optional
+        Whether connections are kept open between requests.
+
+    """
+    with _LOCK:
+        for k, v in (('pool_size', pool_size), ('timeout', timeout),
+                     ('keep_alive', keep_alive)):
+            if v is not None:
+                _SETTINGS[k] = v
+
+        for session in _SESSIONS.values():
+            session.close()
+
+        _SESSIONS.clear()
+
+
+def get_session(key: str) -> PooledSession:
+    """ Get the process-wide session registered under `key`.
+
+    Parameters
+    ----------
+    key : str
+        Name of the session, usually the exchange e.g. ``'Binance'``.
+
+    Returns
+    -------
+    PooledSession
+        Shared session.
+
+    Examples
+    --------
+    >>> get_session('doc') is get_session('doc')
+    True
+
+    """
+    with _LOCK:
+        if key not in _SESSIONS:
+            _SESSIONS[key] = PooledSession(**_SETTINGS)
+
+        return _SESSIONS[key]
+
+
+def connection_stats() -> dict[str, dict[str, int]]:
+    """ Get the connection counters of every shared session.
+
+    Returns
+    -------
+    dict
+        Counters returned by :meth:`PooledSession.stats` keyed by session.
+
+    """
+    with _LOCK:
+        sessions = dict(_SESSIONS)
+
+    return {k: v.stats() for k, v in sessions.items()}
+
+
+def get_async_session(key: str) -> 'aiohttp.ClientSession':
+    """ Get the asynchronous session of `key` bound to the running loop.
+
+    The session follows the settings of :func:`configure_http`, it must be
+    called from a coroutine and closed by :func:`close_async_sessions`
+    before the event loop stops.
+
+    Parameters
+    ----------
+    key : str
+        Name of the session, usually the exchange e.g. ``'Binance'``.
+
+    Returns
+    -------
+    aiohttp.ClientSession
+        Shared session of the running event loop.
+
+    """
+    if not HAS_AIOHTTP:
+        raise ImportError(
+            "aiohttp is required for this function: pip install dccd[async]"
+        )
+
+    loop = asyncio.get_running_loop()
+    with _LOCK:
+        session = _ASYNC_SESSIONS.get((key, loop))
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=_SETTINGS['pool_size'],
+                force_close=not _SETTINGS['keep_alive'],
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=_SETTINGS['timeout']),
+            )
+            _ASYNC_SESSIONS[(key, loop)] = session
+
+        return session
+
+
+async def close_async_sessions() -> None:
+    """ Close the asynchronous sessions bound to the running loop. """
+    loop = asyncio.get_running_loop()
+    with _LOCK:
+        keys = [k for k in _ASYNC_SESSIONS if k[1] is loop]
+        sessions = [_ASYNC_SESSIONS.pop(k) for k in keys]
+
+    for session in sessions:
+        await session.close()
@@ -11,15 +11,16 @@
 # Built-in packages
 import os.path
 import sqlite3
+import threading
 import time
 from collections.abc import Callable
 from os import makedirs
 from pickle import Pickler, Unpickler
-from typing import Any, Literal
+from typing import Any, Literal, TypeGuard
 
 # Third-party packages
 import pandas as pd
-from sqlalchemy import URL, create_engine
+from sqlalchemy import URL, Engine, create_engine
 
 try:
     import polars as pl
@@ -27,10 +28,36 @@ try:
 except ImportError:
     HAS_POLARS = False
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute  # noqa: F401
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 # Local packages
+from dccd.tools.journal import record_change
+
+__all__ = ['IODataBase', 'ParquetDataset', 'get_dataset', 'get_df', 'save_df']
+
+_DATASETS: dict[str, 'ParquetDataset'] = {}
+_DATASETS_LOCK = threading.Lock()
+
+# Methods writing Arrow data without conversion to pandas
+_ARROW_METHODS = ('parquet', 'polars')
+
+
+def _is_arrow(data: Any) -> 'TypeGuard[pa.RecordBatch | pa.Table]':
+    return HAS_PYARROW and isinstance(data, (pa.RecordBatch, pa.Table))
+
 
+def _to_table(data: 'pa.RecordBatch | pa.Table') -> 'pa.Table':
+    if isinstance(data, pa.RecordBatch):
 
-__all__ = ['IODataBase', 'get_df', 'save_df']
+        return pa.Table.from_batches([data])
+
+    return data
 
 
 class IODataBase:
@@ -53,6 +80,9 @@ class IODataBase:
         Kind/format of the database.
     parser : dict
         Values are function to corresponding to `method`.
+    native_arrow : bool
+        True if `method` writes Arrow data (pyarrow.RecordBatch or
+        pyarrow.Table) without converting it to pandas.
 
     Methods
     -------
@@ -61,8 +91,18 @@ class IODataBase:
     save_as_sqlite
     save_as_csv
     save_as_excel
+    close
     __call__
 
+    Notes
+    -----
+    SQLite connections and SQLAlchemy engines are opened at the first save
+    in a database and kept open until :meth:`close`, the object can be used
+    as a context manager to close them.
+
+    Arrow data is written as is by the Parquet and Polars methods, and
+    converted once to a pd.DataFrame for the other methods.
+
     """
 
     # TODO:
@@ -98,17 +138,69 @@ class IODataBase:
                 "`method` should be DataFrame, SQLite, CSV or Excel"
             )
 
-    def __call__(self, new_data: pd.DataFrame, **kwargs: Any) -> None:
+        self.native_arrow = HAS_PYARROW and self.method in _ARROW_METHODS
+
+        # Long-lived connections, keyed by database
+        self._sqlite_conns: dict[str, sqlite3.Connection] = {}
+        self._engines: dict[str, Engine] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'IODataBase':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """ Close the SQLite connections and dispose the SQL engines. """
+        with self._lock:
+            for conn in self._sqlite_conns.values():
+                conn.close()
+
+            for engine in self._engines.values():
+                engine.dispose()
+
+            self._sqlite_conns.clear()
+            self._engines.clear()
+
+    def _sqlite(self, path: str) -> sqlite3.Connection:
+        """ Get the connection of the SQLite database `path`, in WAL mode.
+
+        Must be called with the lock held.
+
+        """
+        if path not in self._sqlite_conns:
+            conn = sqlite3.connect(path, check_same_thread=False)
+            # Readers don't block the writer, and a commit needs no fsync
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._sqlite_conns[path] = conn
+
+        return self._sqlite_conns[path]
+
+    def _engine(self, url: URL) -> Engine:
+        """ Get the SQLAlchemy engine of `url`. """
+        key = url.render_as_string(hide_password=False)
+        with self._lock:
+            if key not in self._engines:
+                self._engines[key] = create_engine(url, pool_pre_ping=True)
+
+            return self._engines[key]
+
+    def __call__(self, new_data: 'pd.DataFrame | pa.RecordBatch | pa.Table', **kwargs: Any) -> None:
         """ Append and save `new_data` in database as `method` format.
 
         Parameters
         ----------
-        new_data : pd.DataFrame
+        new_data : pd.DataFrame, pyarrow.RecordBatch or pyarrow.Table
             Data to append to the database.
         kwargs : dict, optional
             Cf parameters of corresponding `method`.
 
         """
+        if _is_arrow(new_data) and not self.native_arrow:
+            new_data = new_data.to_pandas()
+
         return self.parser[self.method](new_data, **kwargs)
 
     def save_as_dataframe(self, new_data: pd.DataFrame, name: str | None = None, ext: str = '.dat') -> None:
@@ -137,6 +229,7 @@ class IODataBase:
         database = pd.concat([database, new_data], sort=False)
         # Save new data
         save_df(database, self.path, name, ext=ext)
+        record_change(self.path + name + ext)
 
     def get_from_dataframe(self, name: str, ext: str = '.dat') -> pd.DataFrame:
         """ Get data from pd.DataFrame binary object.
@@ -181,13 +274,13 @@ class IODataBase:
         if name is None:
             name = time.strftime('%y', time.gmtime(time.time()))
 
-        # Open connection with database
-        conn = sqlite3.connect(self.path + name + ext)
-        # Append data
-        new_data.to_sql(table, con=conn, if_exists='append', index=index,
-                        index_label=index_label)
-        # Close connection
-        conn.close()
+        with self._lock:
+            conn = self._sqlite(self.path + name + ext)
+            # Rows are inserted by a single executemany and one commit
+            new_data.to_sql(table, con=conn, if_exists='append', index=index,
+                            index_label=index_label)
+
+        record_change(self.path + name + ext)
 
     def get_from_sqlite(self, name: str, table: str = 'main_table', ext: str = '.db') -> pd.DataFrame:
         """ Get data from SQLite database.
@@ -209,16 +302,10 @@ class IODataBase:
             given if the pd.DataFrame uses pd.MultiIndex.
 
         """
-        # TODO : to finish !
-
-        # Open connection with database
-        conn = sqlite3.connect(self.path + name + ext)
-        # Append data
-        df = pd.read_sql(table, con=conn)
-        # Close connection
-        conn.close()
+        with self._lock:
+            conn = self._sqlite(self.path + name + ext)
 
-        return df
+            return pd.read_sql(f'SELECT * FROM "{table}"', con=conn)
 
     def save_as_sql(self, new_data: pd.DataFrame, table: str = 'main_table', name: str | None = None, ext: str = '', index: bool = True, index_label: str | list[str] | None = None, driver: str | None = None, username: str | None = None, password: str | None = None, host: str | None = None, port: str | int | None = None, **kwargs: Any) -> None:
         """ Append and save `new_data` in SQL database.
@@ -276,17 +363,13 @@ class IODataBase:
         else:
             driver = self.method + '+' + driver
 
-        # Open connection with database
         url = URL.create(
             driver, username=username, password=password, host=host,
             port=port, database=self.path + name + ext, query=kwargs,
         )
-        conn = create_engine(url)
-        # Append data
-        new_data.to_sql(table, con=conn, if_exists='append', index=index,
-                        index_label=index_label)
-        # Close connection
-        # conn.close()
+        # Append data with the pooled engine of this database
+        new_data.to_sql(table, con=self._engine(url), if_exists='append',
+                        index=index, index_label=index_label)
 
     def save_as_csv(self, new_data: pd.DataFrame, name: str | None = None, ext: str = '.csv', index: bool = True, index_label: str | list[str] | None = None) -> None:
         """ Append and save `new_data` in database as CSV format.
@@ -325,15 +408,18 @@ class IODataBase:
             new_data.to_csv(self.path + name + ext, mode='w', header=True,
                             index=index, index_label=index_label)
 
-    def save_as_parquet(self, new_data: pd.DataFrame, name: str | None = None, ext: str = '.parquet', index: bool = True, compression: Literal['snappy', 'gzip', 'brotli', 'lz4', 'zstd'] = 'snappy') -> None:
+        record_change(self.path + name + ext)
+
+    def save_as_parquet(self, new_data: 'pd.DataFrame | pa.RecordBatch | pa.Table', name: str | None = None, ext: str = '.parquet', index: bool = True, compression: Literal['snappy', 'gzip', 'brotli', 'lz4', 'zstd'] = 'snappy', dataset: bool = False) -> None:
         """ Append and save `new_data` as Parquet file.
 
         Requires pyarrow: ``pip install dccd[io]``.
 
         Parameters
         ----------
-        new_data : pd.DataFrame
-            Data to append to the database.
+        new_data : pd.DataFrame, pyarrow.RecordBatch or pyarrow.Table
+            Data to append to the database, Arrow data is written without
+            conversion.
         name : str, optional
             Name of the file, default is the current year.
         ext : str, optional
@@ -342,32 +428,67 @@ class IODataBase:
             Write DataFrame index, default is True.
         compression : str, optional
             Compression codec, default is 'snappy'.
+        dataset : bool, optional
+            If True, `name` is a :class:`ParquetDataset` directory and
+            `new_data` is written as a new part file, instead of reading and
+            rewriting the whole file. Default is False.
 
         """
         if name is None:
             name = time.strftime('%y', time.gmtime(time.time()))
 
         path = self.path + name + ext
+        if dataset:
+            if _is_arrow(new_data):
+                table = _to_table(new_data)
+            else:
+                table = pa.Table.from_pandas(new_data, preserve_index=index)
+
+            get_dataset(path).append(table, compression=compression)
+
+            return
+
+        if _is_arrow(new_data):
+            table = _to_table(new_data)
+            existing = pq.read_table(path) if os.path.exists(path) else None
+            if existing is None or existing.schema.names == table.schema.names:
+                if existing is not None:
+                    table = pa.concat_tables([existing, table.cast(existing.schema)])
+
+                pq.write_table(table, path, compression=compression)
+                record_change(path)
+
+                return
+
+            # Written from a pd.DataFrame, e.g. with its index
+            new_data = table.to_pandas()
+
         if os.path.exists(path):
             existing = pd.read_parquet(path)
             new_data = pd.concat([existing, new_data])
         new_data.to_parquet(path, index=index, compression=compression)
+        record_change(path)
 
-    def save_as_polars(self, new_data: pd.DataFrame, name: str | None = None, ext: str = '.parquet', compression: Literal['snappy', 'gzip', 'brotli', 'lz4', 'zstd'] = 'snappy') -> None:
+    def save_as_polars(self, new_data: 'pd.DataFrame | pa.RecordBatch | pa.Table', name: str | None = None, ext: str = '.parquet', compression: Literal['snappy', 'gzip', 'brotli', 'lz4', 'zstd'] = 'snappy', dataset: bool = False) -> None:
         """ Append and save `new_data` as Parquet file via Polars.
 
         Requires polars: ``pip install dccd[io]``.
 
         Parameters
         ----------
-        new_data : pd.DataFrame
-            Data to append to the database.
+        new_data : pd.DataFrame, pyarrow.RecordBatch or pyarrow.Table
+            Data to append to the database, Arrow data is read by Polars
+            without copy.
         name : str, optional
             Name of the file, default is the current year.
         ext : str, optional
             Extension, default is '.parquet'.
         compression : str, optional
             Compression codec, default is 'snappy'.
+        dataset : bool, optional
+            If True, `name` is a :class:`ParquetDataset` directory and
+            `new_data` is written as a new part file, instead of reading and
+            rewriting the whole file. Default is False.
 
         """
         if not HAS_POLARS:
@@ -379,11 +500,41 @@ class IODataBase:
             name = time.strftime('%y', time.gmtime(time.time()))
 
         path = self.path + name + ext
-        new_pl = pl.from_pandas(new_data)
+        if _is_arrow(new_data):
+            frame = pl.from_arrow(new_data)
+            # Tables and record batches are converted to a dataframe
+            new_pl = frame if isinstance(frame, pl.DataFrame) else frame.to_frame()
+        else:
+            new_pl = pl.from_pandas(new_data)
+
+        if dataset:
+            get_dataset(path).append(new_pl.to_arrow(), compression=compression)
+
+            return
+
         if os.path.exists(path):
             existing = pl.read_parquet(path)
             new_pl = pl.concat([existing, new_pl])
         new_pl.write_parquet(path, compression=compression)
+        record_change(path)
+
+    def get_from_parquet(self, name: str, ext: str = '.parquet') -> pd.DataFrame:
+        """ Get data from a Parquet file or a :class:`ParquetDataset`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the file or of the dataset directory.
+        ext : str, optional
+            Extension, default is '.parquet'.
+
+        """
+        path = self.path + name + ext
+        if os.path.isdir(path):
+
+            return get_dataset(path).read()
+
+        return pd.read_parquet(path)
 
     def save_as_excel(self, new_data: pd.DataFrame, name: str | None = None, sheet_name: str = 'Sheet1', ext: str = '.xlsx', index: bool = True, index_label: str | list[str] | None = None) -> None:
         """ Append and save `new_data` in database as Excel format.
@@ -428,6 +579,338 @@ class IODataBase:
             new_data.to_excel(path, sheet_name=sheet_name, merge_cells=False,
                               index=index, index_label=index_label)
 
+        record_change(path)
+
+
+class ParquetDataset:
+    """ Append-only Parquet dataset, written as one part file per call.
+
+    Each :meth:`append` writes the new rows into a new part file named after
+    the time of the write, so its cost depends on the size of the batch and
+    not on the size of the dataset. A ``_metadata`` file gathers the schema
+    and the row groups of every part. When `compact_every` small parts have
+    been written, a background thread merges the last run of small parts
+    into one file. Readers such as ``pd.read_parquet(path)`` see a single
+    table, ordered as written. The parts removed by a compaction or by
+    :meth:`truncate` are recorded with
+    :func:`~dccd.tools.journal.record_change`, so that they are removed from
+    the remotes as well.
+
+    Requires pyarrow: ``pip install dccd[io]``.
+
+    Parameters
+    ----------
+    path : str
+        Directory of the dataset. An existing Parquet file at this path
+        becomes the first part of the dataset.
+    compact_every : int, optional
+        Number of parts smaller than `target_size` which triggers a
+        compaction, default is 64. If 0, parts are only merged by
+        :meth:`compact`.
+    target_size : int, optional
+        Size in bytes under which a part is merged by the compaction, default
+        is 128 MiB.
+
+    Attributes
+    ----------
+    path : str
+        Directory of the dataset.
+
+    Methods
+    -------
+    append
+    compact
+    parts
+    read
+    truncate
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> ds = ParquetDataset(tempfile.mkdtemp() + '/trades.parquet')
+    >>> for i in range(3):
+    ...     _ = ds.append(pa.table({'price': [float(i)]}))
+    >>> len(ds.parts())
+    3
+    >>> ds.compact()
+    >>> len(ds.parts()), ds.read().price.tolist()
+    (1, [0.0, 1.0, 2.0])
+
+    """
+
+    def __init__(self, path: str, compact_every: int = 64, target_size: int = 128 * 2 ** 20) -> None:
+        """ Initialize object. """
+        if not HAS_PYARROW:
+            raise ImportError(
+                "pyarrow is required for this class: pip install dccd[io]"
+            )
+
+        self.path = path.rstrip('/')
+        self.compact_every = compact_every
+        self.target_size = target_size
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._compactor: threading.Thread | None = None
+        self._last_ns = 0
+
+        if os.path.isfile(self.path):
+            # Former single file, kept as the first part
+            tmp = self.path + '.tmp'
+            os.replace(self.path, tmp)
+            makedirs(self.path)
+            os.replace(tmp, os.path.join(self.path, self._part_name(0)))
+            record_change(os.path.join(self.path, self._part_name(0)))
+            self._write_metadata(self.parts())
+
+        makedirs(self.path, exist_ok=True)
+        self._n_small = len(self._small_run(self.parts()))
+
+    @staticmethod
+    def _part_name(ns: int) -> str:
+        return f'part-{ns:020d}.parquet'
+
+    def parts(self) -> list[str]:
+        """ List the paths of the part files, in the order of the writes. """
+        return sorted(
+            os.path.join(self.path, f) for f in os.listdir(self.path)
+            if f.startswith('part-') and f.endswith('.parquet')
+        )
+
+    def _small_run(self, parts: list[str]) -> list[str]:
+        """ Last parts smaller than `target_size`. """
+        i = len(parts)
+        while i > 0 and os.path.getsize(parts[i - 1]) < self.target_size:
+            i -= 1
+
+        return parts[i:]
+
+    def _schema(self) -> 'pa.Schema | None':
+        path = os.path.join(self.path, '_common_metadata')
+        if not os.path.exists(path):
+
+            return None
+
+        return pq.read_schema(path)
+
+    def _write_metadata(self, parts: list[str], new: 'pq.FileMetaData | None' = None) -> None:
+        """ Write ``_metadata``, appending `new` or reading the footers of
+        `parts`.
+        """
+        meta_path = os.path.join(self.path, '_metadata')
+        if new is not None and os.path.exists(meta_path):
+            metadata = pq.read_metadata(meta_path)
+            metadata.append_row_groups(new)
+
+        else:
+            metadata = None
+            for part in parts if new is None else []:
+                md = pq.read_metadata(part)
+                md.set_file_path(os.path.basename(part))
+                if metadata is None:
+                    metadata = md
+                else:
+                    metadata.append_row_groups(md)
+
+            metadata = new if metadata is None else metadata
+
+        if metadata is None:
+
+            return
+
+        if self._schema() is None:
+            common_path = os.path.join(self.path, '_common_metadata')
+            pq.write_metadata(metadata.schema.to_arrow_schema(), common_path)
+            record_change(common_path)
+
+        tmp = os.path.join(self.path, '._metadata.tmp')
+        metadata.write_metadata_file(tmp)
+        os.replace(tmp, meta_path)
+        record_change(meta_path)
+
+    def append(self, table: 'pa.Table', compression: str = 'snappy') -> str:
+        """ Write `table` as a new part file.
+
+        Parameters
+        ----------
+        table : pyarrow.Table
+            Rows to append, cast to the schema of the dataset.
+        compression : str, optional
+            Compression codec, default is 'snappy'.
+
+        Returns
+        -------
+        str
+            Path of the part file.
+
+        """
+        with self._lock:
+            schema = self._schema()
+            if schema is not None and not table.schema.equals(schema):
+                if set(table.schema.names) != set(schema.names):
+                    raise ValueError(
+                        f"Columns {table.schema.names} don't match the "
+                        f"dataset {self.path!r}: {schema.names}"
+                    )
+
+                table = table.select(schema.names).cast(schema)
+
+            self._last_ns = max(time.time_ns(), self._last_ns + 1)
+            name = self._part_name(self._last_ns)
+            tmp = os.path.join(self.path, '.' + name)
+            collector: list[pq.FileMetaData] = []
+            pq.write_table(table, tmp, compression=compression,
+                           metadata_collector=collector)
+            os.replace(tmp, os.path.join(self.path, name))
+            record_change(os.path.join(self.path, name))
+            collector[0].set_file_path(name)
+            self._write_metadata([], new=collector[0])
+            self._n_small += 1
+            compact = self.compact_every and self._n_small >= self.compact_every
+
+        if compact:
+            self.compact(wait=False)
+
+        return os.path.join(self.path, name)
+
+    def compact(self, wait: bool = True) -> None:
+        """ Merge the last run of small parts into one file.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            If False, run the compaction in a background thread (a single
+            one per dataset) and return immediately. Default is True.
+
+        """
+        if wait:
+            self._compact()
+
+        elif self._compactor is None or not self._compactor.is_alive():
+            self._compactor = threading.Thread(
+                target=self._compact, name=f'compact-{self.path}', daemon=True
+            )
+            self._compactor.start()
+
+    def _compact(self) -> None:
+        with self._compact_lock:
+            with self._lock:
+                small = self._small_run(self.parts())
+
+            if len(small) < 2:
+
+                return
+
+            # Appends go on while the parts are merged
+            table = pa.concat_tables([pq.read_table(p) for p in small])
+            tmp = os.path.join(self.path, '.compact.tmp')
+            pq.write_table(table, tmp, compression='snappy')
+
+            with self._lock:
+                os.replace(tmp, small[0])
+                record_change(small[0])
+                for part in small[1:]:
+                    os.remove(part)
+                    # Removed from the remotes too, see dccd.tools.storage
+                    record_change(part)
+
+                parts = self.parts()
+                self._write_metadata(parts)
+                self._n_small = len(self._small_run(parts))
+
+    def truncate(self, column: str, value: Any) -> None:
+        """ Remove the rows where `column` is greater than or equal to `value`.
+
+        Only the parts whose footer statistics reach `value` are read and
+        written again, e.g. the last part for a column increasing with the
+        writes such as a timestamp.
+
+        Parameters
+        ----------
+        column : str
+            Name of the column.
+        value : object
+            First value to remove.
+
+        """
+        with self._compact_lock, self._lock:
+            meta_path = os.path.join(self.path, '_metadata')
+            if not os.path.exists(meta_path):
+
+                return
+
+            metadata = pq.read_metadata(meta_path)
+            names = metadata.schema.to_arrow_schema().names
+            if column not in names:
+                raise ValueError(
+                    f"No column {column!r} in the dataset {self.path!r}"
+                )
+
+            j = names.index(column)
+            touched = set()
+            for i in range(metadata.num_row_groups):
+                rg = metadata.row_group(i)
+                stats = rg.column(j).statistics
+                if stats is None or not stats.has_min_max or stats.max >= value:
+                    touched.add(rg.column(j).file_path)
+
+            for name in sorted(touched):
+                part = os.path.join(self.path, name)
+                table = pq.read_table(part)
+                table = table.filter(pa.compute.less(table[column], value))
+                if table.num_rows:
+                    tmp = os.path.join(self.path, '.truncate.tmp')
+                    pq.write_table(table, tmp, compression='snappy')
+                    os.replace(tmp, part)
+                    record_change(part)
+                else:
+                    os.remove(part)
+                    record_change(part)
+
+            if touched:
+                parts = self.parts()
+                if parts:
+                    self._write_metadata(parts)
+                else:
+                    os.remove(meta_path)
+                    record_change(meta_path)
+                self._n_small = len(self._small_run(parts))
+
+    def read(self) -> pd.DataFrame:
+        """ Read the whole dataset as a single dataframe. """
+        with self._lock:
+            if not self.parts():
+
+                return pd.DataFrame()
+
+            return pq.read_table(self.parts()).to_pandas()
+
+
+def get_dataset(path: str, **kwargs: Any) -> ParquetDataset:
+    """ Get the process-wide :class:`ParquetDataset` of `path`.
+
+    Every writer of a dataset in the process shares the same object, hence
+    the same lock and compaction thread.
+
+    Parameters
+    ----------
+    path : str
+        Directory of the dataset.
+    **kwargs
+        Parameters of :class:`ParquetDataset`, used at the first call only.
+
+    Returns
+    -------
+    ParquetDataset
+        Shared dataset.
+
+    """
+    path = os.path.abspath(path)
+    with _DATASETS_LOCK:
+        if path not in _DATASETS:
+            _DATASETS[path] = ParquetDataset(path, **kwargs)
+
+        return _DATASETS[path]
+
 
 def get_df(path: str, name: str, ext: str = '') -> pd.DataFrame:
     """ Load a dataframe as binnary file.
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+""" Journal of the files written or removed under a data directory.
+
+.. currentmodule:: dccd.tools.journal
+
+.. autoclass:: ChangeJournal
+   :members: record, changes, watermark, commit, compact, close
+
+.. autofunction:: get_journal
+.. autofunction:: set_journal
+.. autofunction:: record_change
+
+Notes
+-----
+The savers of :mod:`dccd.tools.io` and the ``save`` methods of the
+historical downloaders call :func:`record_change` after each write or
+removal. Nothing is recorded until a journal is installed with
+:func:`set_journal`, e.g. by :class:`dccd.daemon.stream_manager.SyncService`
+or by the ``dccd run`` command.
+
+"""
+
+# Built-in packages
+import json
+import os
+import threading
+from typing import IO
+
+# Third party packages
+# Local packages
+
+__all__ = ['ChangeJournal', 'get_journal', 'record_change', 'set_journal']
+
+_JOURNAL: 'ChangeJournal | None' = None
+
+
+class ChangeJournal:
+    """ Persistent log of the files changed since each remote was synced.
+
+    Every write or removal is appended to ``journal.log`` as
+    ``seq<TAB>path`` with an increasing sequence number, the path being
+    relative to `root`. Each remote has a watermark, the last sequence
+    number pushed to it, saved in ``journal.json``; the files changed after
+    the watermark of a remote are the ones to push to (or remove from) it.
+    The entries pushed to every remote are dropped from the log at each
+    :meth:`commit`, so the log stays as small as the backlog of the slowest
+    remote. The files under `path` are not recorded.
+
+    Parameters
+    ----------
+    root : str
+        Data directory, paths outside of it are ignored.
+    path : str, optional
+        Directory of the journal files, default is ``<root>/.dccd``.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> journal = ChangeJournal(tempfile.mkdtemp())
+    >>> journal.record(journal.root + '/Binance/BTCUSDT/trades.csv')
+    >>> journal.record(journal.root + '/Kraken/XBTUSD/book.csv')
+    >>> journal.changes('mynas:crypto')
+    (2, ['Binance/BTCUSDT/trades.csv', 'Kraken/XBTUSD/book.csv'])
+    >>> journal.commit('mynas:crypto', 2)
+    >>> journal.changes('mynas:crypto')
+    (2, [])
+    >>> journal.close()
+
+    """
+
+    def __init__(self, root: str, path: str | None = None) -> None:
+        """ Initialize object. """
+        self.root = os.path.abspath(root)
+        self.path = os.path.abspath(path or os.path.join(self.root, '.dccd'))
+        self._log_path = os.path.join(self.path, 'journal.log')
+        self._state_path = os.path.join(self.path, 'journal.json')
+        self._lock = threading.Lock()
+        self._log: IO[str] | None = None
+        self._files: dict[str, int] = {}
+        self._seq = 0
+        self._watermarks: dict[str, int] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if os.path.exists(self._state_path):
+            with open(self._state_path) as f:
+                state = json.load(f)
+
+            self._seq = state.get('seq', 0)
+            self._watermarks = state.get('watermarks', {})
+
+        if os.path.exists(self._log_path):
+            with open(self._log_path) as f:
+                for line in f:
+                    seq, _, rel = line.rstrip('\n').partition('\t')
+                    # A line cut by a crash is skipped
+                    if rel and seq.isdigit():
+                        self._files[rel] = int(seq)
+                        self._seq = max(self._seq, int(seq))
+
+        self._drop_synced()
+
+    def _drop_synced(self) -> None:
+        """ Forget the files pushed to every remote. """
+        if self._watermarks:
+            low = min(self._watermarks.values())
+            self._files = {k: v for k, v in self._files.items() if v > low}
+
+    def record(self, path: str) -> None:
+        """ Record that the file at `path` was written or removed.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file, ignored if it is not under :attr:`root` or if
+            it is under :attr:`path` (the files of the journal).
+
+        """
+        path = os.path.abspath(path)
+        if path == self.path or path.startswith(self.path + os.sep):
+
+            return
+
+        rel = os.path.relpath(path, self.root)
+        if rel.startswith(os.pardir) or os.path.isabs(rel):
+
+            return
+
+        rel = rel.replace(os.sep, '/')
+        with self._lock:
+            self._seq += 1
+            self._files[rel] = self._seq
+            if self._log is None:
+                os.makedirs(self.path, exist_ok=True)
+                self._log = open(self._log_path, 'a')
+
+            self._log.write(f'{self._seq}\t{rel}\n')
+            self._log.flush()
+
+    def watermark(self, remote: str) -> int | None:
+        """ Get the last sequence number pushed to `remote`, None if never.
+        """
+        with self._lock:
+            return self._watermarks.get(remote)
+
+    def changes(self, remote: str) -> tuple[int, list[str]]:
+        """ Get the files changed since the last push to `remote`.
+
+        Parameters
+        ----------
+        remote : str
+            Name of the remote, e.g. its rclone destination.
+
+        Returns
+        -------
+        seq : int
+            Current sequence number, to :meth:`commit` once the files are
+            pushed.
+        files : list of str
+            Sorted paths relative to :attr:`root`, all files recorded if
+            `remote` was never synced.
+
+        """
+        with self._lock:
+            low = self._watermarks.get(remote, 0)
+
+            return self._seq, sorted(k for k, v in self._files.items() if v > low)
+
+    def commit(self, remote: str, seq: int) -> None:
+        """ Set that the changes up to `seq` are pushed to `remote`.
+
+        Parameters
+        ----------
+        remote : str
+            Name of the remote.
+        seq : int
+            Sequence number returned by :meth:`changes`.
+
+        """
+        with self._lock:
+            self._watermarks[remote] = max(seq, self._watermarks.get(remote, 0))
+            os.makedirs(self.path, exist_ok=True)
+            tmp = self._state_path + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump({'seq': self._seq, 'watermarks': self._watermarks}, f)
+
+            os.replace(tmp, self._state_path)
+            self._compact()
+
+    def compact(self) -> None:
+        """ Rewrite the log without the files pushed to every remote. """
+        with self._lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        self._drop_synced()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+        tmp = self._log_path + '.tmp'
+        with open(tmp, 'w') as f:
+            for rel, seq in sorted(self._files.items(), key=lambda x: x[1]):
+                f.write(f'{seq}\t{rel}\n')
+
+        os.replace(tmp, self._log_path)
+
+    def close(self) -> None:
+        """ Close the log file, it is opened again at the next record. """
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+
+def get_journal() -> ChangeJournal | None:
+    """ Get the journal of the process, None if not installed. """
+    return _JOURNAL
+
+
+def set_journal(journal: ChangeJournal | None) -> ChangeJournal | None:
+    """ Install `journal` as the journal of the process.
+
+    Parameters
+    ----------
+    journal : ChangeJournal or None
+        Journal recording the writes of the savers, None to stop recording.
+
+    Returns
+    -------
+    ChangeJournal or None
+        Journal previously installed.
+
+    """
+    global _JOURNAL
+    previous, _JOURNAL = _JOURNAL, journal
+
+    return previous
+
+
+def record_change(path: str) -> None:
+    """ Record a write of `path` in the journal of the process, if any. """
+    journal = _JOURNAL
+    if journal is not None:
+        journal.record(path)
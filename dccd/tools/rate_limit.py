@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+""" Process-wide rate limiters shared by the REST downloaders.
+
+Each exchange (or exchange endpoint) owns one :class:`TokenBucket`, returned
+by :func:`get_rate_limiter`, so that every downloader instance and every
+thread of the process draws from the same budget.
+
+"""
+
+# Built-in packages
+import asyncio
+import threading
+import time
+
+# Third party packages
+
+# Local packages
+
+__all__ = ['TokenBucket', 'get_rate_limiter']
+
+_LIMITERS: dict[str, 'TokenBucket'] = {}
+_LOCK = threading.Lock()
+
+
+class TokenBucket:
+    """ Thread-safe and weight-aware token bucket.
+
+    The bucket holds at most `capacity` tokens and is refilled continuously
+    at `capacity / period` tokens per second. A request of weight `w` takes
+    `w` tokens; when the bucket is empty the request is delayed until the
+    refill covers it. Reservations are granted in call order, so concurrent
+    callers are spread over time instead of all waking up together.
+
+    Parameters
+    ----------
+    capacity : float
+        Maximum number of tokens, i.e. the documented limit of the exchange
+        (e.g. 6000 request weight for Binance).
+    period : float
+        Number of seconds over which `capacity` tokens are refilled.
+
+    Attributes
+    ----------
+    capacity : float
+        Maximum number of tokens.
+    rate : float
+        Refill rate in tokens per second.
+
+    Examples
+    --------
+    >>> bucket = TokenBucket(2, 1.)
+    >>> bucket.reserve(1)
+    0.0
+    >>> bucket.reserve(1)
+    0.0
+    >>> bucket.reserve(1) > 0
+    True
+
+    """
+
+    def __init__(self, capacity: float, period: float) -> None:
+        """ Initialize object. """
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, weight: float = 1.) -> float:
+        """ Take `weight` tokens and return the delay to respect.
+
+        Parameters
+        ----------
+        weight : float, optional
+            Cost of the request, default is 1.
+
+        Returns
+        -------
+        float
+            Number of seconds to wait before sending the request, ``0.`` if
+            it can be sent immediately.
+
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._tokens -= weight
+
+            if self._tokens >= 0:
+
+                return 0.
+
+            return -self._tokens / self.rate
+
+    def acquire(self, weight: float = 1.) -> None:
+        """ Block until `weight` tokens are available.
+
+        Parameters
+        ----------
+        weight : float, optional
+            Cost of the request, default is 1.
+
+        """
+        delay = self.reserve(weight)
+
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, weight: float = 1.) -> None:
+        """ Wait without blocking the event loop until `weight` tokens are
+        available.
+
+        Parameters
+        ----------
+        weight : float, optional
+            Cost of the request, default is 1.
+
+        """
+        delay = self.reserve(weight)
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def get_rate_limiter(key: str, capacity: float, period: float) -> TokenBucket:
+    """ Get the process-wide token bucket registered under `key`.
+
+    The bucket is created on the first call, later calls with the same `key`
+    return the same object whatever `capacity` and `period`.
+
+    Parameters
+    ----------
+    key : str
+        Name of the limit, e.g. ``'Binance'`` or
+        ``'OKX:/api/v5/market/candles'``.
+    capacity : float
+        Maximum number of tokens.
+    period : float
+        Number of seconds to refill `capacity` tokens.
+
+    Returns
+    -------
+    TokenBucket
+        Shared token bucket.
+
+    Examples
+    --------
+    >>> get_rate_limiter('doc', 10, 1) is get_rate_limiter('doc', 10, 1)
+    True
+
+    """
+    with _LOCK:
+        if key not in _LIMITERS:
+            _LIMITERS[key] = TokenBucket(capacity, period)
+
+        return _LIMITERS[key]
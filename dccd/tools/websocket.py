@@ -12,15 +12,53 @@
 import asyncio
 import json
 import logging
+import os
+import random
+import shutil
+import tempfile
 import time
-from typing import Any
+from typing import IO, Any
 
 # Third party packages
 import websockets
 
 # Local packages
+from dccd.tools.decoder import Decoder, get_decoder
 
-__all__ = ['BasisWebSocket']
+__all__ = ['BasisWebSocket', 'backoff_delay']
+
+_OVERFLOW = ('block', 'drop_oldest', 'spill')
+_RECONNECT_DELAY = 0.1  # seconds before the first reconnection attempt
+_SPILL_BATCH = 1000  # messages read back from the spill file at once
+_SPILL_COMPACT = 2 ** 20  # bytes read back before the spill file is compacted
+
+
+def backoff_delay(attempt: int, base: float = _RECONNECT_DELAY, cap: float = 5.) -> float:
+    """ Get a random delay growing exponentially with the attempts.
+
+    Parameters
+    ----------
+    attempt : int
+        Number of the attempt, from 0.
+    base : float, optional
+        Maximum delay of the first attempt in seconds, default is 0.1.
+    cap : float, optional
+        Maximum delay in seconds, default is 5.
+
+    Returns
+    -------
+    float
+        Delay drawn uniformly between 0 and ``min(cap, base * 2 ** attempt)``
+        (full jitter), so that clients disconnected together do not
+        reconnect together.
+
+    Examples
+    --------
+    >>> 0 <= backoff_delay(3) <= 0.8
+    True
+
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
 
 # =========================================================================== #
 #                                Basis objects                                #
@@ -38,6 +76,24 @@ class BasisWebSocket:
         Parameters to connection setting.
     subs : dict
         Data to subscribe to a stream.
+    decoder : str or callable, optional
+        JSON library of the messages (``'auto'``, ``'msgspec'``, ``'orjson'``
+        or ``'json'``), see :func:`~dccd.tools.decoder.get_decoder`, or a
+        function decoding a message. Default is ``'auto'``, the fastest
+        installed library.
+    queue_size : int, optional
+        Maximum number of messages received and not yet parsed, default is
+        10 000.
+    overflow : {'block', 'drop_oldest', 'spill'}, optional
+        What to do with a message received when the queue is full: wait for
+        a free slot, which stops reading the socket (default), drop the
+        oldest message of the queue, or write it to a temporary file read
+        back in order once the queue is empty.
+    reconnect : bool, optional
+        If True (default), reconnect after the connection is lost, with a
+        jittered exponential delay (see :func:`backoff_delay`) starting at
+        100 ms and capped by `retry_delay`, at most `max_retries` times in
+        a row.
 
     Attributes
     ----------
@@ -50,31 +106,101 @@ class BasisWebSocket:
     is_connect : bool
         - True if connected.
         - False`otherwise.
+    decode : callable
+        Function decoding each message received.
+    n_reconnects : int
+        Number of reconnections.
+    downtime : float
+        Seconds between the loss of the connection and the subscription of
+        the new one, at the last reconnection.
 
     Methods
     -------
     on_open
+    on_connect
+    queue_stats
+
+    Notes
+    -----
+    Messages are read from the socket into a bounded queue and parsed by
+    another task, so that a slow parser does not stall the reads (servers
+    such as Binance disconnect slow consumers).
 
     """
 
-    ws = False
+    ws: Any = False
     is_connect = False
+    _t_lost: float | None = None
 
-    def __init__(self, host: str, conn: dict[str, Any] | None = None, subs: dict[str, Any] | None = None, max_retries: int = 5, retry_delay: int = 5) -> None:
+    def __init__(self, host: str, conn: dict[str, Any] | None = None, subs: dict[str, Any] | None = None, max_retries: int = 5, retry_delay: int = 5, decoder: str | Decoder = 'auto', queue_size: int = 10_000, overflow: str = 'block', reconnect: bool = True) -> None:
         """ Initialize object. """
+        if overflow not in _OVERFLOW:
+            raise ValueError(
+                f"Unknown overflow policy {overflow!r}, allowed: {_OVERFLOW}"
+            )
+
         # Set websocket variables
         self.host = host
         self.conn_para = conn if conn is not None else {}
         self.subs_data = subs if subs is not None else {}
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.decode = get_decoder(decoder) if isinstance(decoder, str) else decoder
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.reconnect = reconnect
+        self.n_reconnects = 0
+        self.downtime = 0.
+
+        # Set receive queue and its counters
+        self._queue: asyncio.Queue[tuple[float, str | bytes] | None] | None = None
+        self._spill: IO[bytes] | None = None
+        self._spill_pos = 0
+        self._n_spill = 0
+        self._lag = 0.
+        self._dropped = 0
+        self._spilled = 0
 
         # Set logger
         self.logger = logging.getLogger(__name__)
         self.logger.info('Init websocket object.')
 
     async def _connect(self, **kwargs: Any) -> None:
-        """ Connect to websocket. """
+        """ Connect to websocket, and reconnect until stopped. """
+        attempt = 0
+        while True:
+            lost = None
+            try:
+                await self._session(**kwargs)
+
+            except (OSError, websockets.exceptions.WebSocketException) as e:
+                if not (self.reconnect and self.is_connect) or attempt >= self.max_retries:
+                    await self.on_error(type(e).__name__, str(e))
+                    if isinstance(e, websockets.exceptions.ConnectionClosed):
+
+                        return
+
+                    raise
+
+                lost = e
+
+            # Stopped by on_close, or closed by the server without reconnect
+            if not self.is_connect or not self.reconnect:
+
+                return
+
+            if self._t_lost is None:
+                self._t_lost = time.monotonic()
+                attempt = 0
+
+            delay = backoff_delay(attempt, cap=self.retry_delay)
+            self.logger.warning('Websocket lost (%r), reconnect in %.0f ms',
+                                lost, delay * 1000)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _session(self, **kwargs: Any) -> None:
+        """ Open one connection and handle its messages until it ends. """
         # Connect to host websocket
         async with websockets.connect(self.host, **self.conn_para) as self.ws:
             self.logger.info('Websocket connected to {}.'.format(self.host))
@@ -82,24 +208,154 @@ class BasisWebSocket:
             # Subscribe to a stream
             await self._subscribe(**kwargs)
             await self.wait_that('is_connect')
-
-            # Loop on received message
+            if self._t_lost is not None:
+                self.downtime = time.monotonic() - self._t_lost
+                self.n_reconnects += 1
+                self._t_lost = None
+                self.logger.info('Websocket reconnected after %.0f ms',
+                                 self.downtime * 1000)
+
+            await self.on_connect()
+
+            self._queue = asyncio.Queue(self.queue_size)
+            reader = asyncio.ensure_future(self._read())
+            parser = asyncio.ensure_future(self._parse())
             try:
-                async for msg in self.ws:
-                    message = json.loads(msg)
-                    await self.on_message(message)
+                await asyncio.wait([reader, parser],
+                                   return_when=asyncio.FIRST_COMPLETED)
+                if not parser.done():
+                    # Connection closed, parse the messages left then stop
+                    if self._n_spill:
+                        self._write_spill(None)
+                    else:
+                        await self._queue.put(None)
+
+                    await parser
+                    reader.result()
 
-                    # Stop if disconnect
-                    if not self.is_connect:
-                        return
+                else:
+                    parser.result()
 
-            # Exit due to closed connection
-            except websockets.exceptions.ConnectionClosed:
-                await self.on_error(
-                    'ConnectionClosed',
-                    "Code is {}\n".format(self.ws.close_code),
-                    "Reason is '{}'".format(self.ws.close_reason)
-                )
+            finally:
+                reader.cancel()
+                parser.cancel()
+                self._close_spill()
+
+    async def _read(self) -> None:
+        """ Put each message received in the queue until disconnected. """
+        async for msg in self.ws:
+            await self._put((time.monotonic(), msg))
+
+    async def _put(self, item: tuple[float, str | bytes]) -> None:
+        """ Put a message in the queue, following the overflow policy. """
+        queue = self._queue
+        if self.overflow == 'block':
+            await queue.put(item)
+
+        elif self.overflow == 'drop_oldest':
+            if queue.full():
+                queue.get_nowait()
+                self._dropped += 1
+
+            queue.put_nowait(item)
+
+        elif self._n_spill or queue.full():
+            # Once spilling, keep the order by spilling until read back
+            self._write_spill(item)
+            self._spilled += 1
+
+        else:
+            queue.put_nowait(item)
+
+    def _write_spill(self, item: tuple[float, str | bytes] | None) -> None:
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile('w+b')
+
+        if item is not None and isinstance(item[1], bytes):
+            item = item[0], item[1].decode('utf-8')
+
+        # Messages are read back from _spill_pos, written at the end
+        self._spill.seek(0, os.SEEK_END)
+        self._spill.write(json.dumps(item).encode('utf-8') + b'\n')
+        self._n_spill += 1
+
+    def _unspill(self, n: int = _SPILL_BATCH) -> list[tuple[float, str] | None]:
+        """ Read back the `n` oldest messages of the spill file.
+
+        The file is emptied once every message is read back, or compacted
+        when the part read back is larger than the rest, so that it does not
+        grow while the parser is still behind.
+
+        """
+        spill = self._spill
+        if spill is None:
+
+            return []
+
+        spill.seek(self._spill_pos)
+        items = [json.loads(spill.readline()) for _ in range(min(n, self._n_spill))]
+        self._spill_pos = spill.tell()
+        self._n_spill -= len(items)
+        if not self._n_spill:
+            spill.seek(0)
+            spill.truncate()
+            self._spill_pos = 0
+
+        elif (self._spill_pos > _SPILL_COMPACT
+                and 2 * self._spill_pos > spill.seek(0, os.SEEK_END)):
+            # Move the messages not read back yet to a new file
+            self._spill = tempfile.TemporaryFile('w+b')
+            spill.seek(self._spill_pos)
+            shutil.copyfileobj(spill, self._spill)
+            spill.close()
+            self._spill_pos = 0
+
+        return items
+
+    def _close_spill(self) -> None:
+        if self._spill is not None:
+            self._spill.close()
+            self._spill, self._spill_pos, self._n_spill = None, 0, 0
+
+    async def _parse(self) -> None:
+        """ Decode and handle the queued messages until disconnected. """
+        while True:
+            if self._n_spill and self._queue.empty():
+                items = self._unspill()
+            else:
+                items = [await self._queue.get()]
+
+            for item in items:
+                if item is None:
+
+                    return
+
+                t, msg = item
+                self._lag = time.monotonic() - t
+                await self.on_message(self.decode(msg))
+
+                # Stop if disconnect
+                if not self.is_connect:
+
+                    return
+
+    def queue_stats(self) -> dict[str, float]:
+        """ Get the state of the receive queue.
+
+        Returns
+        -------
+        dict
+            ``'depth'`` the number of messages waiting to be parsed
+            (spilled ones included), ``'lag_ms'`` the time the last message
+            parsed waited in the queue, ``'dropped'`` and ``'spilled'`` the
+            number of messages dropped and written to disk since the object
+            was created.
+
+        """
+        depth = self._queue.qsize() if self._queue is not None else 0
+
+        return {'depth': depth + self._n_spill, 'lag_ms': self._lag * 1000,
+                'dropped': self._dropped, 'spilled': self._spilled}
 
     async def _subscribe(self, **kwargs: Any) -> None:
         """ Connect to a stream. """
@@ -152,6 +408,9 @@ class BasisWebSocket:
                     self.logger.error("Max retries reached, giving up.")
                     raise
 
+    async def on_connect(self) -> None:
+        """ On websocket connected and subscribed, at each (re)connection. """
+
     async def on_message(self, message: dict[str, Any] | list[Any]) -> None:
         """ On websocket display message. """
         self.logger.info('Message: {}'.format(message))
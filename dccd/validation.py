@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+""" Vectorized validation of OHLCV bars, trades and order book levels.
+
+Columnar counterpart of the Pydantic models of :mod:`dccd.models`: records are
+converted once to NumPy arrays and each check runs on whole columns, so that
+every invalid row is reported at once by a :class:`DataValidationError`. The
+Pydantic models remain available with ``strict=True``, they validate (and
+fail on) each record one by one before the column checks.
+
+"""
+
+from __future__ import annotations
+
+# Built-in packages
+import logging
+from collections.abc import Iterable
+from typing import Any, Literal
+
+# Third party packages
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+# Local packages
+from dccd.models import OHLCBar, OrderBookEntry, Trade
+
+__all__ = [
+    'DataValidationError', 'validate_ohlc', 'validate_orderbook',
+    'validate_trades',
+]
+
+_logger = logging.getLogger(__name__)
+
+Records = Iterable[dict[str, Any]] | pd.DataFrame
+
+
+class DataValidationError(ValueError):
+    """ Records failed the vectorized checks.
+
+    Parameters
+    ----------
+    kind : str
+        Kind of records, e.g. ``'OHLC'``.
+    errors : dict
+        Positions of the invalid rows, keyed by the name of the failed check.
+
+    Attributes
+    ----------
+    errors : dict of np.ndarray
+        Positions of the invalid rows, keyed by the name of the failed check.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> DataValidationError('OHLC', {'high < low': np.array([3, 5])})
+    DataValidationError('2 invalid OHLC row(s): high < low at rows [3, 5]')
+
+    """
+
+    def __init__(self, kind: str, errors: dict[str, np.ndarray]) -> None:
+        """ Initialize object. """
+        self.errors = errors
+        n = np.unique(np.concatenate(list(errors.values()))).size
+        detail = '; '.join(
+            f'{k} at rows {_format_rows(v)}' for k, v in errors.items()
+        )
+        super(DataValidationError, self).__init__(
+            f'{n} invalid {kind} row(s): {detail}'
+        )
+
+
+def _format_rows(rows: np.ndarray, n_max: int = 10) -> str:
+    shown = ', '.join(str(i) for i in rows[:n_max])
+
+    return f'[{shown}, ...]' if rows.size > n_max else f'[{shown}]'
+
+
+def _frame(data: Records, model: type[BaseModel]) -> pd.DataFrame:
+    """ Set the records as a dataframe with the fields of `model`. """
+    fields = list(model.model_fields)
+    if isinstance(data, pd.DataFrame):
+
+        return data.reindex(columns=fields)
+
+    return pd.DataFrame(list(data), columns=fields)
+
+
+def _strict(data: Records, model: type[BaseModel]) -> pd.DataFrame:
+    """ Validate each record with the Pydantic `model`. """
+    records = data.to_dict('records') if isinstance(data, pd.DataFrame) else data
+
+    return pd.DataFrame([model.model_validate(d).model_dump() for d in records],
+                        columns=list(model.model_fields))
+
+
+def _to_float(df: pd.DataFrame, col: str, checks: dict[str, np.ndarray], required: bool = True) -> None:
+    """ Convert `col` to float64 and flag non numeric (or missing) values. """
+    raw = df[col]
+    values = pd.to_numeric(raw, errors='coerce').to_numpy(dtype=np.float64)
+    if required:
+        checks[f'invalid {col!r}'] = ~np.isfinite(values)
+    else:
+        checks[f'invalid {col!r}'] = raw.notna().to_numpy() & ~np.isfinite(values)
+
+    df[col] = values
+
+
+def _to_int(df: pd.DataFrame, col: str, checks: dict[str, np.ndarray]) -> None:
+    """ Convert the optional `col` to nullable integers and flag the others.
+    """
+    raw = df[col]
+    values = pd.to_numeric(raw, errors='coerce').to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        checks[f'invalid {col!r}'] = raw.notna().to_numpy() & (
+            ~np.isfinite(values) | (values != np.round(values))
+        )
+
+    mask = ~np.isfinite(values)
+    df[col] = pd.arrays.IntegerArray(
+        np.where(mask, 0, values).astype(np.int64), mask
+    )
+
+
+def _finish(df: pd.DataFrame, checks: dict[str, np.ndarray], kind: str, errors: Literal['raise', 'drop']) -> pd.DataFrame:
+    """ Raise or drop the rows failing `checks`. """
+    failed = {k: np.flatnonzero(v) for k, v in checks.items() if v.any()}
+    if not failed:
+
+        return df
+
+    exc = DataValidationError(kind, failed)
+    if errors == 'raise':
+
+        raise exc
+
+    _logger.warning('%s, rows dropped', exc)
+    bad = np.logical_or.reduce(list(checks.values()))
+
+    return df.loc[~bad].reset_index(drop=True)
+
+
+def validate_ohlc(data: Records, strict: bool = False, errors: Literal['raise', 'drop'] = 'raise') -> pd.DataFrame:
+    """ Validate OHLCV bars in a vectorized way.
+
+    Checks that prices and volumes are finite numbers, that ``high >= low``
+    and that timestamps are strictly increasing.
+
+    Parameters
+    ----------
+    data : list of dict or pd.DataFrame
+        Records with the fields of :class:`~dccd.models.OHLCBar`.
+    strict : bool, optional
+        If True, first validate each record with
+        :class:`~dccd.models.OHLCBar` (slower, raises at the first invalid
+        record).
+    errors : {'raise', 'drop'}, optional
+        Raise a :class:`DataValidationError` listing all the invalid rows
+        (default), or drop them with a warning.
+
+    Returns
+    -------
+    pd.DataFrame
+        Bars with one float64 column per field of
+        :class:`~dccd.models.OHLCBar`.
+
+    Examples
+    --------
+    >>> bars = [
+    ...     {'date': 0, 'open': '2', 'high': 3, 'low': 1, 'close': 2,
+    ...      'volume': 1, 'quoteVolume': 2},
+    ...     {'date': 60, 'open': 2, 'high': 1, 'low': 3, 'close': 2,
+    ...      'volume': 1, 'quoteVolume': 2},
+    ... ]
+    >>> validate_ohlc(bars[:1]).open.tolist()
+    [2.0]
+    >>> validate_ohlc(bars)
+    Traceback (most recent call last):
+    ...
+    dccd.validation.DataValidationError: 1 invalid OHLC row(s): high < low at rows [1]
+
+    """
+    if strict:
+        data = _strict(data, OHLCBar)
+
+    df = _frame(data, OHLCBar)
+    checks: dict[str, np.ndarray] = {}
+    for col, field in OHLCBar.model_fields.items():
+        _to_float(df, col, checks, required=field.is_required())
+
+    date = df['date'].to_numpy()
+    checks['high < low'] = df['high'].to_numpy() < df['low'].to_numpy()
+    checks['date not increasing'] = np.r_[False, date[1:] <= date[:-1]]
+
+    return _finish(df, checks, 'OHLC', errors)
+
+
+def validate_trades(data: Records, strict: bool = False, errors: Literal['raise', 'drop'] = 'raise') -> pd.DataFrame:
+    """ Validate trades in a vectorized way.
+
+    Checks that timestamps, prices and amounts are finite numbers and that
+    trade ids are integers or missing.
+
+    Parameters
+    ----------
+    data : list of dict or pd.DataFrame
+        Records with the fields of :class:`~dccd.models.Trade`.
+    strict : bool, optional
+        If True, first validate each record with
+        :class:`~dccd.models.Trade` (slower, raises at the first invalid
+        record).
+    errors : {'raise', 'drop'}, optional
+        Raise a :class:`DataValidationError` listing all the invalid rows
+        (default), or drop them with a warning.
+
+    Returns
+    -------
+    pd.DataFrame
+        Trades with nullable integer ``tid``, float64 ``timestamp``,
+        ``price`` and ``amount``, and ``type`` columns.
+
+    Examples
+    --------
+    >>> trades = [{'tid': 1, 'timestamp': 0, 'price': 2, 'amount': 1},
+    ...           {'tid': None, 'timestamp': 1, 'price': 2, 'amount': 'x'}]
+    >>> validate_trades(trades, errors='drop').tid.tolist()
+    [1]
+
+    """
+    if strict:
+        data = _strict(data, Trade)
+
+    df = _frame(data, Trade)
+    checks: dict[str, np.ndarray] = {}
+    _to_int(df, 'tid', checks)
+    for col in ('timestamp', 'price', 'amount'):
+        _to_float(df, col, checks)
+
+    return _finish(df, checks, 'trade', errors)
+
+
+def validate_orderbook(data: Records, strict: bool = False, errors: Literal['raise', 'drop'] = 'raise') -> pd.DataFrame:
+    """ Validate order book levels in a vectorized way.
+
+    Checks that sides are ``'bid'`` or ``'ask'``, that prices are positive
+    numbers, that amounts are finite and non negative and that order counts
+    are integers or missing.
+
+    Parameters
+    ----------
+    data : list of dict or pd.DataFrame
+        Records with the fields of :class:`~dccd.models.OrderBookEntry`.
+    strict : bool, optional
+        If True, first validate each record with
+        :class:`~dccd.models.OrderBookEntry` (slower, raises at the first
+        invalid record).
+    errors : {'raise', 'drop'}, optional
+        Raise a :class:`DataValidationError` listing all the invalid rows
+        (default), or drop them with a warning.
+
+    Returns
+    -------
+    pd.DataFrame
+        Levels with ``side``, ``price`` (as string, to keep the precision),
+        float64 ``amount`` and nullable integer ``count`` columns.
+
+    Examples
+    --------
+    >>> levels = [{'side': 'bid', 'price': '10.5', 'amount': 1},
+    ...           {'side': 'ask', 'price': 'x', 'amount': 1}]
+    >>> validate_orderbook(levels, errors='drop').price.tolist()
+    ['10.5']
+
+    """
+    if strict:
+        data = _strict(data, OrderBookEntry)
+
+    df = _frame(data, OrderBookEntry)
+    checks: dict[str, np.ndarray] = {}
+    checks["side not 'bid' or 'ask'"] = ~df['side'].isin(['bid', 'ask']).to_numpy()
+    price = pd.to_numeric(df['price'], errors='coerce').to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        checks["invalid 'price'"] = ~(np.isfinite(price) & (price > 0))
+
+    df['price'] = df['price'].astype(str)
+    _to_float(df, 'amount', checks)
+    checks['amount < 0'] = df['amount'].to_numpy() < 0
+    _to_int(df, 'count', checks)
+
+    return _finish(df, checks, 'order book', errors)